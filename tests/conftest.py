@@ -0,0 +1,45 @@
+import tkinter
+
+import pytest
+
+from tksimple.event import _EventRegistry
+
+
+# Minimal replacement of the Tk 'bind' command. There is no display to create a real Tk here.
+_BIND_PROC = r"""
+proc bind {w seq args} {
+    global _binds
+    set key "$w $seq"
+    if {[llength $args] == 0} {
+        if {[info exists _binds($key)]} {return $_binds($key)}
+        return ""
+    }
+    set script [lindex $args 0]
+    if {[string index $script 0] eq "+"} {
+        set script [string range $script 1 end]
+        if {[info exists _binds($key)] && $_binds($key) ne ""} {set script "$_binds($key)\n$script"}
+    }
+    if {$script eq ""} {unset -nocomplain _binds($key)} else {set _binds($key) $script}
+    return ""
+}
+"""
+
+class FakeWidget:
+    """
+    Stands in for a tksimple widget: owns an event registry and wraps a tkinter 'Tcl' instance.
+    """
+    def __init__(self, root):
+        self._root = root
+        self._eventRegistry = _EventRegistry({"event":{}, "widget":self})
+    def _get(self):
+        return self._root
+
+@pytest.fixture
+def tcl():
+    root = tkinter.Tcl()
+    root.eval(_BIND_PROC)
+    return root
+
+@pytest.fixture
+def widget(tcl):
+    return FakeWidget(tcl)
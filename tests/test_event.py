@@ -0,0 +1,161 @@
+import _tkinter
+import tkinter
+import tracemalloc
+
+from tksimple.event import Event, _EventHandler, _EventRegistry
+from tksimple.widget import _Widget
+from tksimple.window import Tk
+
+
+class _DictEvent:
+    # dict backed layout of 'Event' before the values moved into slots
+    def __init__(self):
+        self._data = {"afterTriggered":None, "setCanceled":False, "widget":None, "args":[], "priority":0,
+                      "tkArgs":None, "func":None, "value":None, "eventType":None, "defaultArgs":False,
+                      "disableArgs":True, "decryptValueFunc":None, "forceReturn":None, "handler":None, "pos":None}
+    def __del__(self):
+        if hasattr(self, "_data"):
+            self._data.clear()
+
+def _bytesPerEvent(cls, n):
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    events = [cls() for _ in range(n)]
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del events
+    return size / n
+
+def test_eventMemory():
+    # 10k widgets with 5 binds each. Widgets need a display, so only the Events are built here.
+    n = 10_000 * 5
+    before = _bytesPerEvent(_DictEvent, n)
+    after = _bytesPerEvent(Event, n)
+    print(f"\nEvent memory: dict {before:.0f} B/Event, slots {after:.0f} B/Event")
+    assert after < before
+    assert not hasattr(Event(), "__dict__")
+
+def test_eventItemAccess():
+    event = Event(priority=3)
+    event["value"] = "x"
+    event["custom"] = 1
+    assert event["priority"] == 3
+    assert event.getValue() == "x"
+    assert event["custom"] == 1
+    assert "custom" in event and "widget" in event and "missing" not in event
+
+def test_unbindKeepsForeignBindings(tcl, widget):
+    event = _EventHandler._registerNewEvent(widget, lambda: None, "<Motion>", [], 0)
+    foreignId = tcl.bind("<Motion>", lambda e: None, add="+")
+    assert len([line for line in tcl.bind("<Motion>").splitlines() if line.strip()]) == 2
+    event.unbind()
+    lines = [line for line in tcl.bind("<Motion>").splitlines() if line.strip()]
+    assert len(lines) == 1 and foreignId in lines[0]
+
+class _FakeTkWidget(tkinter.Misc):
+    # tkinter widget without Tk: 'bind' and 'destroy' of 'Misc' on the emulated Tcl 'bind'.
+    def __init__(self, tcl, path):
+        self.tk = tcl.tk
+        self.master = tcl
+        self.children = {}
+        self._w = path
+        self._tclCommands = None
+    def destroy(self):
+        super().destroy()
+        self.tk.eval("array unset _binds {"+self._w+" *}") # Tk drops the bindings of destroyed widgets
+
+def _window(tcl):
+    window = Tk.__new__(Tk)
+    window._master = tcl
+    window._eventRegistry = _EventRegistry(window)
+    window._childWidgets = []
+    window._batch = None
+    window._destroyed = False
+    return window
+
+def _bindScripts(tcl):
+    pairs = tcl.splitlist(tcl.eval("array get _binds"))
+    return dict(zip(pairs[::2], pairs[1::2]))
+
+def test_toolTipUnbindLeak(tcl):
+    # tooltips bind <Enter>/<Leave>/<ButtonPress> on their widget and the shift keys on the window
+    window = _window(tcl)
+    keep = window.bindEvent(lambda: None, "<KeyPress-Shift_L>")
+    scripts = _bindScripts(tcl)
+    commands = len(tcl._tclCommands or ())
+    widget = _Widget(None, _FakeTkWidget(tcl, ".keep"), window, None)
+    for i in range(500): # attaching again destroys the old tooltip
+        widget.attachToolTip("text", "more")
+    widget._toolTip.destroy()
+    assert widget._eventRegistry["event"] == {}
+    for i in range(500):
+        _Widget(None, _FakeTkWidget(tcl, ".w"+str(i)), window, None).attachToolTip("text", "more")._master.destroy()
+    assert _bindScripts(tcl) == scripts
+    assert len(tcl._tclCommands or ()) == commands
+    assert list(window._eventRegistry["event"].keys()) == ["<KeyPress-Shift_L>"]
+    assert window._eventRegistry.getCallables("<KeyPress-Shift_L>") == [keep]
+    assert window._childWidgets == [widget]
+
+def test_unregisterAllLeak(tcl, widget):
+    commands = len(tcl._tclCommands or ())
+    for _ in range(1000):
+        for seq in ("<Motion>", "<Configure>"):
+            _EventHandler._registerNewEvent(widget, lambda: None, seq, [], 0)
+            _EventHandler._registerNewEvent(widget, lambda e: None, seq, [], 1)
+        widget._eventRegistry.unregisterAll() # called by 'destroy'
+    assert len(tcl._tclCommands or ()) == commands
+    assert widget._eventRegistry["event"] == {}
+    assert tcl.bind("<Motion>") == "" and tcl.bind("<Configure>") == ""
+
+def test_tracerUnbind(tcl, widget):
+    calls = []
+    var = tkinter.StringVar(tcl)
+    event = _EventHandler._registerNewTracer(widget, var, lambda: calls.append(var.get()), [], 0)
+    var.set("a")
+    assert calls == ["a"]
+    event.unbind()
+    var.set("b")
+    assert calls == ["a"]
+    assert var.trace_info() == []
+
+def _processIdle(tcl):
+    while tcl.dooneevent(_tkinter.ALL_EVENTS | _tkinter.DONT_WAIT): pass
+
+def test_coalesceMotionBursts(tcl, widget):
+    # 'event_generate' needs a display. The burst is delivered by calling the tkinter callback directly.
+    received = []
+    _EventHandler._registerNewEvent(widget, lambda args: received.append(args), "<Motion>", [], 0, defaultArgs=True, coalesce=True)
+    handler = widget._eventRegistry.getHandler("<Motion>")
+    delivered = 0
+    for burst in range(10):
+        for i in range(1000):
+            handler((burst, i))
+            delivered += 1
+        _processIdle(tcl)
+    print(f"\nCoalesce: {delivered} events delivered, {len(received)} handler calls")
+    assert received == [(burst, 999) for burst in range(10)]
+
+def test_coalesceCanceledOnUnbind(tcl, widget):
+    received = []
+    commands = len(tcl._tclCommands or ())
+    event = _EventHandler._registerNewEvent(widget, lambda: received.append(1), "<Motion>", [], 0, maxRate=10)
+    handler = widget._eventRegistry.getHandler("<Motion>")
+    handler(None)
+    assert event._pending is not None
+    event.unbind()
+    assert event._pending is None
+    assert tcl.call("after", "info") == ""
+    _processIdle(tcl)
+    assert received == []
+    assert len(tcl._tclCommands or ()) == commands
+
+def test_coalesceCustomEvent(tcl, widget):
+    received = []
+    _EventHandler._registerNewCustomEvent(widget, lambda e: received.append(e.getValue()), "[custom]", [], 0, coalesce=True)
+    for event in widget._eventRegistry.getCallables("[custom]"):
+        for i in range(100):
+            event["value"] = i
+            widget._eventRegistry.getHandler("[custom]")()
+    _processIdle(tcl)
+    assert received == [99]
+    widget._eventRegistry.unregisterAll()
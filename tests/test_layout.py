@@ -0,0 +1,160 @@
+import _tkinter
+import tkinter
+
+from tksimple.event import Event
+from tksimple.window import Tk
+
+
+class _FakeTkWidget:
+    # tkinter widget stand-in. Real widgets need a display.
+    def __init__(self):
+        self.placed = []
+    def place(self, **kwargs):
+        self.placed.append(kwargs)
+
+class _FakeMaster:
+    # tkinter.Tk stand-in: timers run on a 'Tcl' interpreter, geometry calls are recorded.
+    def __init__(self):
+        self.tcl = tkinter.Tcl()
+        self.geometries = []
+    def after_idle(self, func):
+        return self.tcl.after_idle(func)
+    def geometry(self, value):
+        self.geometries.append(value)
+    def processIdle(self):
+        while self.tcl.dooneevent(_tkinter.ALL_EVENTS | _tkinter.DONT_WAIT): pass
+
+class _FakeWindow(Tk):
+    def __init__(self, size):
+        self._master = _FakeMaster()
+        self._internWindowSize = None
+        self._destroyed = False
+        self._childWidgets = []
+        self._layoutChildSize = None
+        self._layoutDirty = True
+        self._layoutSizeCache = None
+        self._layoutWindowSize = None
+        self._layoutStats = {"visited":0, "placed":0, "sizeQueries":0}
+        self._batch = None
+        self.size = size
+        self.queries = 0
+    def getWidth(self):
+        self.queries += 1
+        return self.size[0]
+    def getHeight(self):
+        self.queries += 1
+        return self.size[1]
+
+class _FakeWidget:
+    def __init__(self, master, window, container=False, **place):
+        self._master = master
+        self._window = window
+        self._destroyed = False
+        self._placed = True
+        self._xScrollbar = None
+        self._yScrollbar = None
+        self._layoutGeometry = None
+        self._widget = _FakeTkWidget()
+        self._relativePlaceData = {"handler":None, "xOffset":0, "xOffsetLeft":0, "xOffsetRight":0, "yOffset":0, "yOffsetUp":0, "yOffsetDown":0,
+                                   "fixX":None, "fixY":None, "fixWidth":None, "fixHeight":None, "stickRight":False, "stickDown":False,
+                                   "centerX":False, "centerY":False, "center":False, "changeX":0, "changeY":0, "changeWidth":0, "changeHeight":0}
+        self._relativePlaceData.update(place)
+        if container:
+            self._childWidgets = []
+            self._layoutChildSize = None
+            self._layoutDirty = True
+        master._childWidgets.append(self)
+    def _get(self):
+        return self._widget
+    def getWidth(self):
+        self._window.queries += 1
+        return 1 # Tk has not recomputed the geometry yet
+    def getHeight(self):
+        self._window.queries += 1
+        return 1
+
+def _buildForm(containers=10, children=20):
+    window = _FakeWindow((800, 600))
+    frames = []
+    for i in range(containers):
+        frame = _FakeWidget(window, window, container=True, xOffsetRight=50)
+        for _ in range(children):
+            _FakeWidget(frame, window, yOffsetDown=50)
+        frames.append(frame)
+    return window, frames
+
+def test_containerUsesComputedSize():
+    window, frames = _buildForm()
+    window.updateDynamicWidgets()
+    child = frames[0]._childWidgets[0]
+    assert frames[0]._widget.placed[-1]["width"] == 400
+    assert child._widget.placed[-1]["width"] == 400 and child._widget.placed[-1]["height"] == 300
+    assert window.queries == 2 # only the window size
+
+def test_unchangedGeometryIsNotPlacedAgain():
+    window, frames = _buildForm()
+    window.updateDynamicWidgets()
+    assert window.getLayoutStats()["placed"] == 10 + 10 * 20
+    window.updateDynamicWidgets()
+    assert window.getLayoutStats()["placed"] == 0
+    window.size = (1000, 600)
+    window.updateDynamicWidgets()
+    stats = window.getLayoutStats()
+    print(f"\nLayout after resize: {stats}")
+    assert stats["visited"] == 10 + 10 * 20 and stats["placed"] == 10 + 10 * 20
+    assert frames[0]._childWidgets[0]._widget.placed[-1]["width"] == 500
+
+def test_sizeQueriesPerPass():
+    window, frames = _buildForm(containers=50, children=40)
+    window.updateDynamicWidgets()
+    stats = window.getLayoutStats()
+    print(f"\nLayout of {stats['visited']} widgets: {window.queries} winfo round-trips")
+    assert window.queries == 2 and stats["sizeQueries"] == 1
+
+def test_configureSizeOnlyUsedInItsPass():
+    window, frames = _buildForm()
+    window._customUpdateDynamicWidgetsHandler(Event(value=(1000, 600)))
+    window._master.processIdle()
+    assert window.queries == 0
+    assert frames[0]._childWidgets[0]._widget.placed[-1]["width"] == 500
+    assert window._layoutWindowSize is None
+    window.size = (600, 600)
+    window.updateDynamicWidgets()
+    assert window.queries == 2
+    assert frames[0]._childWidgets[0]._widget.placed[-1]["width"] == 300
+
+def test_setWindowSizeInvalidatesPassSize():
+    window, frames = _buildForm()
+    window._layoutWindowSize = (1000, 600)
+    window._layoutSizeCache = {id(window):(1000, 600)}
+    window.setWindowSize(600, 600)
+    assert window._layoutWindowSize is None and id(window) not in window._layoutSizeCache
+    assert window._master.geometries == ["600x600"]
+
+class _FakeRegistry:
+    def __init__(self):
+        self.events = {"[relative_update]":[Event()], "[relative_update_after]":[Event()]}
+    def getCallables(self, eventType):
+        return self.events[eventType]
+
+def test_handlersRunForUnchangedGeometry():
+    window, frames = _buildForm(containers=1, children=1)
+    child = frames[0]._childWidgets[0]
+    calls = []
+    child._eventRegistry = _FakeRegistry()
+    child._relativePlaceData["handler"] = lambda: calls.append(child._eventRegistry.events["[relative_update_after]"][0]["value"])
+    window.updateDynamicWidgets()
+    window._layoutDirty = frames[0]._layoutDirty = True # e.g. a new sibling was placed
+    window.updateDynamicWidgets()
+    assert window.getLayoutStats()["placed"] == 0
+    assert len(child._widget.placed) == 1
+    assert calls == [None, [0, 0, 400, 300], [0, 0, 400, 300], [0, 0, 400, 300]] # before and after each placement
+
+def test_statsOnlyCountedInPass():
+    window, frames = _buildForm(containers=1, children=1)
+    window.updateDynamicWidgets()
+    stats = window.getLayoutStats()
+    window.size = (1000, 600)
+    window._updateDynamicSize(frames[0]) # 'placeRelative' of a single widget
+    assert window.getLayoutStats() == stats
+    assert frames[0]._widget.placed[-1]["width"] == 500
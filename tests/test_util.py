@@ -0,0 +1,477 @@
+import asyncio
+import gc
+import tkinter
+import _tkinter
+from concurrent.futures import CancelledError, Future
+from socket import socketpair
+from threading import Thread
+from time import perf_counter, process_time, sleep
+
+import pytest
+
+from tksimple.const import Color, TKExceptions
+import tksimple.util
+from tksimple.util import _AnimationClock, _TclBatch, _Dispatcher, _TclSelector, _TaskScheduler, _TimerHeap, _RunWatcher, _itemconfigureAll, _runCoroutine, runWatcherDec
+
+
+class _FakeTkWidget:
+    def __init__(self, tcl, path):
+        self._w = path
+        self.tk = tcl.tk
+        tcl.eval("proc "+path+" {cmd args} {lappend ::applied [list "+path+" $cmd {*}$args]; return}")
+
+class _FakeWindow:
+    def __init__(self, tcl):
+        self._tcl = tcl
+        self._destroyed = False
+        self._batch = None
+    def _get(self):
+        return self._tcl
+
+class _FakeRoot:
+    # 'Tcl' has no 'wm state'
+    def __init__(self):
+        self.tcl = tkinter.Tcl()
+        self.windowState = "normal"
+    def after(self, ms, func):
+        return self.tcl.after(ms, func)
+    def after_cancel(self, id_):
+        self.tcl.after_cancel(id_)
+    def state(self):
+        return self.windowState
+
+def test_batchOverridesAndFlushes():
+    tcl = tkinter.Tcl()
+    tcl.eval("proc place {args} {lappend ::applied [list place {*}$args]; return}")
+    a = _FakeTkWidget(tcl, ".a")
+    window = _FakeWindow(tcl)
+    with _TclBatch(window) as batch:
+        assert window._batch is batch
+        batch.configure(a, "text", "first")
+        batch.configure(a, "text", "hello world")
+        batch.place(a, x=1, y=2)
+    assert window._batch is None
+    assert tcl.splitlist(tcl.eval("set ::applied")) == (".a configure -text {hello world}", "place configure .a -x 1 -y 2")
+
+def test_batchKeepsApplyingAfterError():
+    tcl = tkinter.Tcl()
+    widgets = [_FakeTkWidget(tcl, ".w"+str(i)) for i in range(5)]
+    tcl.eval("rename .w2 {}") # destroyed in Tcl
+    batch = _TclBatch(_FakeWindow(tcl))
+    for widget in widgets:
+        batch.configure(widget, "text", widget._w)
+    with pytest.raises(AttributeError) as info:
+        batch.flush()
+    assert ".w2 configure -text .w2" in str(info.value)
+    assert "invalid command name" in str(info.value)
+    assert len(tcl.splitlist(tcl.eval("set ::applied"))) == 4
+
+def test_batchBenchmark():
+    # Construction needs a display. Theming 1,000 widgets is compared on Tcl procs standing in for the widgets.
+    tcl = tkinter.Tcl()
+    widgets = [_FakeTkWidget(tcl, ".w"+str(i)) for i in range(1000)]
+    start = perf_counter()
+    for widget in widgets:
+        for name, value in (("bg", "black"), ("fg", "white"), ("text", "a b")):
+            tcl.call(widget._w, "configure", "-"+name, value)
+    direct = perf_counter() - start
+    tcl.eval("set ::applied {}")
+    start = perf_counter()
+    with _TclBatch(_FakeWindow(tcl)) as batch:
+        for widget in widgets:
+            for name, value in (("bg", "black"), ("fg", "white"), ("text", "a b")):
+                batch.configure(widget, name, value)
+    batched = perf_counter() - start
+    print(f"\nTheming 1000 widgets: direct {direct*1000:.1f} ms, batched {batched*1000:.1f} ms")
+    assert len(tcl.splitlist(tcl.eval("set ::applied"))) == 1000
+
+def test_itemconfigureAll():
+    tcl = tkinter.Tcl()
+    listbox = _FakeTkWidget(tcl, ".list")
+    _itemconfigureAll(listbox, enumerate(["red", None, Color.BLACK, "light blue"]))
+    assert tcl.splitlist(tcl.eval("set ::applied")) == (".list itemconfigure 0 -background red",
+                                                       ".list itemconfigure 2 -background black",
+                                                       ".list itemconfigure 3 -background {light blue}")
+
+def test_dispatcherIdleHasNoTimer():
+    tcl = tkinter.Tcl()
+    dispatcher = _Dispatcher(_FakeWindow(tcl)).start()
+    assert tcl.splitlist(tcl.call("after", "info")) == ()
+    calls = []
+    dispatcher.put(calls.append, (1,))
+    assert len(tcl.splitlist(tcl.call("after", "info"))) == 1
+    while not calls: tcl.dooneevent(_tkinter.ALL_EVENTS)
+    assert tcl.splitlist(tcl.call("after", "info")) == () # disarmed once the queue is empty
+    dispatcher.cancel()
+
+def test_dispatcherCancelFailsPendingFutures():
+    tcl = tkinter.Tcl()
+    dispatcher = _Dispatcher(_FakeWindow(tcl)).start()
+    futures = [Future() for i in range(3)]
+    for future in futures: dispatcher.put(print, (), future=future)
+    dispatcher.put(print, (), key="merged")
+    dispatcher.cancel()
+    assert not dispatcher._queue and not dispatcher._latest
+    for future in futures:
+        with pytest.raises(CancelledError): future.result(timeout=0)
+    with pytest.raises(TKExceptions.InvalidUsageException):
+        dispatcher.put(print, ())
+    assert tcl.splitlist(tcl.call("after", "info")) == ()
+
+def test_dispatcherStress():
+    # 8 producer threads against one window, the main thread runs the Tcl event loop
+    tcl = tkinter.Tcl()
+    dispatcher = _Dispatcher(_FakeWindow(tcl)).start()
+    results = []
+    futures = []
+    def produce(n):
+        for i in range(5000):
+            if i % 100 == 0:
+                future = Future()
+                dispatcher.put(lambda n=n, i=i: (n, i), (), future=future)
+                futures.append(future)
+            else:
+                dispatcher.put(results.append, ((n, i),))
+            dispatcher.put(lambda: None, (), key=n) # merged per producer
+    producers = [Thread(target=produce, args=(n,)) for n in range(8)]
+    gc.collect() # Tcl interpreters of earlier tests must not be collected by the producer threads
+    start = perf_counter()
+    for producer in producers: producer.start()
+    while any(p.is_alive() for p in producers) or dispatcher._queue:
+        tcl.dooneevent(_tkinter.ALL_EVENTS | _tkinter.DONT_WAIT) or sleep(.001)
+    elapsed = perf_counter() - start
+    dispatcher.cancel()
+    print(f"\nDispatcher 8 producers: {8*5000/elapsed:.0f} calls/s")
+    assert len(results) == 8*(5000-50)
+    for n in range(8): # per producer order is kept
+        assert [i for m, i in results if m == n] == [i for i in range(5000) if i % 100]
+    assert sorted(f.result(timeout=0) for f in futures) == sorted((n, i) for n in range(8) for i in range(0, 5000, 100))
+
+def _runSelectorLoop(tcl, coro):
+    loop = _TclSelector.createLoop(_FakeWindow(tcl))
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+def test_selectorIdleUsesNoCpu():
+    tcl = tkinter.Tcl()
+    fired = []
+    tcl.after(20, fired.append, perf_counter())
+    async def main():
+        start = perf_counter()
+        cpu = process_time()
+        await asyncio.sleep(.3)
+        return perf_counter()-start, process_time()-cpu
+    elapsed, cpu = _runSelectorLoop(tcl, main())
+    print(f"\nrunAsync idle .3 s: {cpu*1000:.1f} ms CPU")
+    assert fired # Tk timers run while asyncio sleeps
+    assert elapsed >= .3
+    assert cpu < .05
+
+def test_selectorWokenByThread():
+    tcl = tkinter.Tcl()
+    async def main():
+        loop = asyncio.get_running_loop()
+        done = loop.create_future()
+        thread = Thread(target=lambda: (sleep(.05), loop.call_soon_threadsafe(done.set_result, perf_counter())))
+        thread.start()
+        woken = await done
+        thread.join()
+        return perf_counter()-woken
+    gc.collect() # Tcl interpreters of earlier tests must not be collected by the thread
+    assert _runSelectorLoop(tcl, main()) < .02
+
+def test_selectorRunsHandlerTaskWithoutDelay():
+    # an 'async def' handler started by a Tk event must not wait for the next asyncio timer
+    tcl = tkinter.Tcl()
+    async def main():
+        loop = asyncio.get_running_loop()
+        started = loop.create_future()
+        async def handler(fired):
+            started.set_result(perf_counter()-fired)
+        tcl.after(20, lambda: _runCoroutine(handler(perf_counter())))
+        return await asyncio.wait_for(started, 1)
+    delay = _runSelectorLoop(tcl, main())
+    print(f"\nasync handler started {delay*1000:.1f} ms after its Tk event")
+    assert delay < .02
+
+def test_selectorDrainIsBounded():
+    # 50 pending Tk events of 2 ms each must not delay ready asyncio callbacks by 100 ms
+    tcl = tkinter.Tcl()
+    handled = []
+    pairs = [socketpair() for i in range(50)]
+    def onReadable(file, mask):
+        sleep(.002)
+        tcl.deletefilehandler(file)
+        handled.append(file)
+    for read, write in pairs:
+        write.send(b"x")
+        tcl.createfilehandler(read, tkinter.READABLE, onReadable)
+    async def main():
+        delays = []
+        for i in range(3):
+            start = perf_counter()
+            await asyncio.sleep(0)
+            delays.append(perf_counter()-start)
+        return delays
+    delays = _runSelectorLoop(tcl, main())
+    for read, write in pairs:
+        tcl.deletefilehandler(read) # the notifier is shared by all interpreters of this thread
+        read.close()
+        write.close()
+    print(f"\nrunAsync longest turn with 50 pending events: {max(delays)*1000:.1f} ms")
+    assert max(delays) < _TclSelector.BUDGET+.02
+    assert 0 < len(handled) < 50 # left over events run in later turns
+
+class _FakeToplevel:
+    # shares the timer heap of its master like 'Toplevel'
+    def __init__(self, master):
+        self._master = master
+        self._destroyed = False
+        self._timerHeap = _TimerHeap.get(master)
+    def _get(self):
+        return self._master._get()
+    def _getTkMaster(self):
+        return self
+
+def _fire(heap):
+    # runs the heap as if its Tcl timer fired now
+    heap.cancel()
+    heap._run()
+
+def test_timerHeapRescheduledTaskRunsOncePerDrain():
+    heap = _TimerHeap.get(_FakeWindow(tkinter.Tcl()))
+    calls = []
+    _TaskScheduler(heap._master, 0, lambda: calls.append("idle"), repete=True).start()
+    dynamic = _TaskScheduler(heap._master, 0, lambda: calls.append("dynamic"), repete=True, dynamic=True).start()
+    dynamic._timers.discard()
+    dynamic._timers.push(dynamic, dynamic._deadline-10) # far behind its grid
+    def restart():
+        calls.append("restart")
+        if len(calls) < 10: heap.push(restarted, 0) # already due
+    restarted = _TaskScheduler(heap._master, 0, restart).start()
+    _fire(heap)
+    assert sorted(calls) == ["dynamic", "idle", "restart"]
+    assert len(heap._heap) == 3
+    heap.cancel() # the Tcl notifier is shared by all interpreters of this thread
+
+def test_timerHeapDropsTasksOfDestroyedToplevel():
+    tcl = tkinter.Tcl()
+    window = _FakeWindow(tcl)
+    toplevel = _FakeToplevel(window)
+    calls = []
+    _TaskScheduler(window, 0, lambda: calls.append("window"), repete=True).start()
+    loop = _TaskScheduler(toplevel, 0, lambda: calls.append("toplevel"), repete=True).start()
+    _TaskScheduler(toplevel, 10, lambda: calls.append("later")).start()
+    heap = window._timerHeap
+    _fire(heap)
+    assert sorted(calls) == ["toplevel", "window"]
+    toplevel._destroyed = True
+    heap.dropOwner(toplevel)
+    assert not loop._active
+    calls.clear()
+    _fire(heap)
+    assert calls == ["window"]
+    assert [task._owner for deadline, sequence, task in heap._heap if task._sequence == sequence] == [window]
+    heap.cancel()
+
+def test_timerHeapDestroyedToplevelInsideTask():
+    window = _FakeWindow(tkinter.Tcl())
+    toplevel = _FakeToplevel(window)
+    def close():
+        toplevel._destroyed = True
+        window._timerHeap.dropOwner(toplevel)
+    task = _TaskScheduler(toplevel, 0, close, repete=True).start()
+    _fire(window._timerHeap)
+    assert not task._active and task._sequence is None
+    window._timerHeap.cancel()
+
+class _CountingRoot(_FakeRoot):
+    def __init__(self):
+        super().__init__()
+        self.afterCalls = 0
+    def after(self, ms, func):
+        self.afterCalls += 1
+        return super().after(ms, func)
+
+def test_timerHeapArmsOncePerDrain():
+    root = _CountingRoot()
+    window = _FakeWindow(root)
+    tasks = [_TaskScheduler(window, 0, print, repete=True).start() for i in range(100)]
+    heap = window._timerHeap
+    root.afterCalls = 0
+    heap.cancel()
+    heap._run() # every task schedules itself again
+    assert root.afterCalls == 1
+    assert len(root.tcl.splitlist(root.tcl.call("after", "info"))) == 1
+    heap.cancel()
+
+def test_timerHeapStaleCountDuringDrain():
+    # the first due task cancels all others, enough to hit the compaction threshold inside the drain
+    window = _FakeWindow(tkinter.Tcl())
+    tasks = []
+    def cancelOthers():
+        for task in tasks[1:]: task.cancel()
+    tasks.append(_TaskScheduler(window, 0, cancelOthers).start())
+    tasks.extend(_TaskScheduler(window, 0, print).start() for i in range(2000))
+    tasks.append(_TaskScheduler(window, 60, print).start()) # not due, cancelled too
+    heap = window._timerHeap
+    _fire(heap)
+    assert heap._stale == sum(1 for deadline, sequence, task in heap._heap if task._sequence != sequence) == 0
+    assert not any(task._active for task in tasks)
+    heap.cancel()
+
+def test_timerHeapBenchmark():
+    tcl = tkinter.Tcl()
+    window = _FakeWindow(tcl)
+    start = perf_counter()
+    tasks = [_TaskScheduler(window, 60+i/1000, print).start() for i in range(100_000)]
+    scheduled = perf_counter() - start
+    start = perf_counter()
+    for task in tasks: task.cancel()
+    cancelled = perf_counter() - start
+    heap = window._timerHeap
+    print(f"\nTimer heap 100k tasks: schedule {scheduled*1000:.0f} ms, cancel {cancelled*1000:.0f} ms")
+    assert len(heap._heap) < 2048 # stale entries were compacted
+    assert len(tcl.splitlist(tcl.call("after", "info"))) == 1
+    heap.cancel()
+
+class _Watched:
+    def __init__(self, tcl):
+        self._tcl = tcl
+        self.runs = []
+    def _get(self):
+        return self._tcl
+    @runWatcherDec
+    def throttled(self, value):
+        self.runs.append(value)
+        return value
+    @runWatcherDec(leading=False)
+    def debounced(self, value):
+        self.runs.append(value)
+
+@pytest.fixture
+def watcherTiming():
+    # 'enableRelativePlaceOptimization' can only be called once per process
+    _RunWatcher._runEverySecond, _RunWatcher._runAfterSecond = .05, .03
+    yield
+    _RunWatcher._runEverySecond = _RunWatcher._runAfterSecond = None
+
+def _processEvents(tcl, seconds):
+    end = perf_counter()+seconds
+    while perf_counter() < end:
+        tcl.dooneevent(_tkinter.ALL_EVENTS | _tkinter.DONT_WAIT) or sleep(.001)
+
+def test_watcherCoalescesPerIdle():
+    watched = _Watched(tkinter.Tcl())
+    for i in range(10): watched.throttled(i)
+    assert watched.runs == []
+    _processEvents(watched._tcl, .01)
+    assert watched.runs == [9]
+
+def test_watcherLeadingAndTrailing(watcherTiming):
+    watched = _Watched(tkinter.Tcl())
+    assert watched.throttled(1) == 1 # leading call runs at once
+    watched.throttled(2)
+    watched.throttled(3)
+    assert watched.runs == [1]
+    _processEvents(watched._tcl, .06)
+    assert watched.runs == [1, 3] # trailing call with the latest value
+
+def test_watcherDebounce(watcherTiming):
+    watched = _Watched(tkinter.Tcl())
+    for i in range(5):
+        watched.debounced(i)
+        _processEvents(watched._tcl, .01)
+    assert watched.runs == []
+    _processEvents(watched._tcl, .05)
+    assert watched.runs == [4]
+
+def test_watcherThrottlesContinuousCalls(watcherTiming):
+    # a drag: calls every 5 ms for .4 s must run about every .05 s, not only at the start and end
+    watched = _Watched(tkinter.Tcl())
+    end = perf_counter()+.4
+    i = 0
+    while perf_counter() < end:
+        watched.throttled(i)
+        i += 1
+        _processEvents(watched._tcl, .005)
+    _processEvents(watched._tcl, .05)
+    assert 6 <= len(watched.runs) <= 10
+    assert watched.runs[0] == 0 and watched.runs[-1] == i-1
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = _FakeClock()
+    monkeypatch.setattr(tksimple.util, "monotonic", fake)
+    return fake
+
+def _tick(animation):
+    # runs the next frame now instead of waiting for its Tcl timer
+    animation.cancel()
+    animation._tick()
+
+def test_animationSubscribeUnsubscribe():
+    root = _FakeRoot()
+    animation = _AnimationClock(_FakeWindow(root))
+    first = animation.subscribe(lambda delta: None)
+    second = animation.subscribe(lambda: None)
+    assert len(root.tcl.splitlist(root.tcl.call("after", "info"))) == 1 # one timer for all subscribers
+    first.cancel()
+    assert [s["calls"] for s in animation.getStats()["subscribers"]] == [0]
+    assert len(root.tcl.splitlist(root.tcl.call("after", "info"))) == 1
+    second.cancel()
+    second.cancel()
+    assert animation.getStats()["subscribers"] == []
+    assert root.tcl.splitlist(root.tcl.call("after", "info")) == () # stopped without subscribers
+
+def test_animationSkipsLateFrames(clock):
+    root = _FakeRoot()
+    animation = _AnimationClock(_FakeWindow(root), fps=64)
+    deltas = []
+    def slow(delta):
+        deltas.append(delta)
+        if len(deltas) == 1: clock.now += 3.5/64 # the first frame takes 3.5 frame times
+    animation.subscribe(slow)
+    _tick(animation)
+    assert animation._skipped == 3 and animation._nextFrame == 4/64
+    clock.now = 4/64
+    _tick(animation)
+    assert deltas == [1/64, 4/64]
+    assert animation.getStats()["frames"] == 2
+    animation.cancel()
+
+def test_animationSubscriberStats(clock):
+    animation = _AnimationClock(_FakeWindow(_FakeRoot()))
+    def work(seconds):
+        def func():
+            clock.now += seconds
+        return func
+    fast = animation.subscribe(work(.002))
+    slow = animation.subscribe(work(.005))
+    for i in range(4): _tick(animation)
+    animation.cancel()
+    assert fast.getStats() == pytest.approx({"calls":4, "totalMillis":8., "avgMillis":2., "lastMillis":2.})
+    assert slow.getStats() == pytest.approx({"calls":4, "totalMillis":20., "avgMillis":5., "lastMillis":5.})
+    assert [s["name"] for s in animation.getStats()["subscribers"]] == ["test_animationSubscriberStats.<locals>.work.<locals>.func"]*2
+
+def test_animationPausesWhileHidden(clock):
+    root = _FakeRoot()
+    animation = _AnimationClock(_FakeWindow(root))
+    calls = []
+    animation.subscribe(lambda delta: calls.append(delta))
+    root.windowState = "iconic"
+    _tick(animation)
+    assert calls == [] and animation._id is not None
+    clock.now = 10.
+    root.windowState = "normal"
+    _tick(animation)
+    assert calls == [animation._frameTime] # no time jump after showing again
+    animation.cancel()
@@ -0,0 +1,416 @@
+import _tkinter
+import gc
+import tkinter
+import tracemalloc
+from threading import Thread
+from time import perf_counter
+
+import pytest
+
+from tksimple.const import Color
+from tksimple.event import _EventRegistry
+from tksimple.widget import Listbox, Text, TreeView, VirtualTreeView, _TextFilter, _Widget
+from tksimple.window import Tk
+
+
+class _FakeTkListbox:
+    # tkinter.Listbox stand-in. Real widgets need a display. Tcl only answers 'size' and 'itemcget' (no colors).
+    def __init__(self):
+        self._w = ".list"
+        self.tk = tkinter.Tcl().tk
+        self.tk.eval("set ::size 0; proc .list {cmd args} {if {$cmd eq {size}} {return $::size}; return {}}")
+        self.items = []
+        self.calls = 0
+    def insert(self, index, *entries):
+        self.calls += 1
+        index = len(self.items) if index == "end" else index
+        self.items[index:index] = entries
+        self.tk.call("set", "::size", len(self.items))
+    def delete(self, first, last=None):
+        self.calls += 1
+        last = len(self.items)-1 if last == "end" else (first if last is None else last)
+        del self.items[first:last+1]
+        self.tk.call("set", "::size", len(self.items))
+    def itemconfig(self, index, **kwargs):
+        self.calls += 1
+    def get(self, index):
+        self.calls += 1
+        return self.items[index]
+
+def _listbox(entries=()):
+    listbox = Listbox.__new__(Listbox)
+    listbox._group = None
+    listbox._widget = _FakeTkListbox()
+    listbox._defaultColor = Color.DEFAULT.value
+    listbox._slots = []
+    listbox._nameIndex = {}
+    listbox._filter = listbox._filterRows = listbox._filterColors = None
+    listbox._filterKey = 0
+    if entries: listbox.addAll(entries)
+    return listbox
+
+def test_listboxNegativeIndex():
+    listbox = _listbox(["a", "b", "c"])
+    listbox.deleteItemByIndex(-1)
+    assert listbox.getAllSlots() == ["a", "b"] == listbox._widget.items
+    with pytest.raises(IndexError):
+        listbox.deleteItemByIndex(2)
+    with pytest.raises(IndexError):
+        listbox.deleteItemByIndex(-3)
+    assert listbox.getAllSlots() == ["a", "b"]
+    listbox.add("x", index=-1)
+    assert listbox.getAllSlots() == ["a", "x", "b"] == listbox._widget.items
+
+def test_listboxNameIndexOnDelete():
+    listbox = _listbox(["a", "b", "a", "c", "b", "a"])
+    listbox._getNameIndex()
+    for index in (1, 0, -1, 1):
+        listbox.deleteItemByIndex(index)
+        expected = {}
+        for i, entry in enumerate(listbox._slots):
+            expected.setdefault(entry, []).append(i)
+        assert listbox._nameIndex == expected
+    assert listbox.getAllSlots() == ["a", "b"]
+    assert listbox.getIndexByName("b") == 1
+
+def test_textFilter():
+    filter_ = _TextFilter([0, 1, 2, 3], {0:"apple", 1:"banana", 2:"cherry", 3:"grape"})
+    assert filter_.setQuery("A") == ([2], [])
+    assert filter_.setQuery("ap") == ([1], [])
+    assert filter_.visible == [0, 3]
+    assert filter_.setQuery("") == ([], [1, 2])
+    assert filter_.append([4], ["Apricot"]) == [True]
+    filter_.remove(1)
+    assert filter_.visible == filter_.order == [0, 2, 3, 4]
+    assert _TextFilter.getRanges([0, 1, 2, 5, 7, 8]) == [(0, 2), (5, 5), (7, 8)]
+
+def test_listboxFilterBenchmark():
+    entries = ["item "+str(i) for i in range(100_000)]
+    listbox = _listbox(entries)
+    for query in ("1", "12", "123", "1234", "12", "", "9"):
+        start = perf_counter()
+        listbox.setFilter(query)
+        elapsed = perf_counter() - start
+        print(f"\nListbox filter 100k rows {query!r}: {elapsed*1000:.1f} ms"+(" (builds the index)" if query == "1" else ""), end="")
+        expected = [entry for entry in entries if query in entry]
+        assert listbox.getAllSlots() == expected == listbox._widget.items
+    listbox.clearFilter()
+    assert listbox._widget.items == entries
+
+@pytest.mark.parametrize("rows", [10_000, 100_000])
+def test_listboxBenchmark(rows):
+    listbox = _listbox([str(i % 1000) for i in range(rows)])
+    listbox._widget.calls = 0
+    start = perf_counter()
+    for i in range(1000):
+        listbox.getIndexByName(str(i))
+    lookup = perf_counter() - start
+    start = perf_counter()
+    for i in range(1000):
+        listbox.deleteItemByIndex(-1)
+        listbox.getIndexByName(str(i))
+    delete = perf_counter() - start
+    print(f"\nListbox {rows} rows: 1000 name lookups {lookup*1000:.1f} ms, 1000 deletes + lookups {delete*1000:.1f} ms, {listbox._widget.calls} Tcl calls")
+    assert listbox._widget.calls == 1000 # only the deletes
+    assert len(listbox.getAllSlots()) == rows-1000
+
+
+class _FakeTkTreeview:
+    # ttk.Treeview stand-in with top level items only. Bulk inserts are evaluated against an empty proc.
+    def __init__(self):
+        self._w = ".tree"
+        self.tk = tkinter.Tcl().tk
+        self.tk.eval("proc .tree {args} {return}")
+        self.items = {}
+        self.selected = ()
+        self.counter = 0
+    def insert(self, parent, index, **kwargs):
+        self.counter += 1
+        id_ = "I"+str(self.counter)
+        self.items[id_] = kwargs
+        return id_
+    def delete(self, *ids):
+        for id_ in ids: del self.items[id_]
+        self.selected = tuple(id_ for id_ in self.selected if id_ in self.items)
+    def selection(self):
+        return self.selected
+    def focus(self):
+        return self.focused
+    def set_children(self, parent, *ids):
+        self.order = ids
+    def heading(self, column, **kwargs):
+        pass
+
+def _treeView(rows):
+    treeView = TreeView.__new__(TreeView)
+    treeView._group = None
+    treeView._widget = _FakeTkTreeview()
+    treeView._headers = ["name", "value"]
+    treeView._selectMode = "multiple"
+    treeView._ids = []
+    treeView._idIndex = {}
+    treeView._lazyFolders = None
+    treeView._rowCounter = 0
+    treeView._rowValues = {}
+    treeView._dataVersion = 0
+    treeView._sortKeys = {}
+    treeView._sortOrder = None
+    treeView._sortColumn = None
+    treeView._columnSortTypes = {}
+    treeView._filter = None
+    for i in range(rows):
+        treeView.addEntry("row"+str(i), i)
+    return treeView
+
+def test_treeViewSelectedIndex():
+    treeView = _treeView(3)
+    treeView._widget.selected = (treeView._ids[2],)
+    assert treeView.getSelectedIndex() == [2]
+
+def test_treeViewClearDropsLazyFolders():
+    treeView = _treeView(3)
+    treeView._lazyFolders = {treeView._ids[0]:(lambda folder: [("child", 0)], "placeholder", None)}
+    treeView.clear()
+    treeView._widget.focused = "I1"
+    treeView._onFolderOpen() # loader of the deleted folder must not run
+    assert treeView._lazyFolders == {} and treeView._widget.items == {}
+
+@pytest.mark.parametrize("value, number", [("1,000", 1000), ("1,000,000", 1e6), ("1.000.000", 1e6), ("1,000.5", 1000.5),
+                                           ("1.000,5", 1000.5), ("3,5", 3.5), ("12.500", 12.5), ("-2,500", -2500), (7, 7)])
+def test_treeViewParseNumber(value, number):
+    assert TreeView._parseNumber(value) == number
+
+def test_treeViewParseNumberInvalid():
+    with pytest.raises(ValueError):
+        TreeView._parseNumber("1,5,3")
+
+def test_treeViewSortBenchmark():
+    treeView = _treeView(0)
+    values = [str((i * 7919) % 100_000) for i in range(100_000)]
+    treeView.addEntries([("row"+str(i), value) for i, value in enumerate(values)])
+    start = perf_counter()
+    treeView.sortByColumn(1)
+    first = perf_counter() - start
+    start = perf_counter()
+    treeView.sortByColumn(1, descending=True)
+    toggle = perf_counter() - start
+    print(f"\nTreeView sort 100k rows by number: {first*1000:.1f} ms, toggle direction {toggle*1000:.1f} ms")
+    assert [treeView._rowValues[i][1] for i in treeView._widget.order[:3]] == ["99999", "99998", "99997"]
+
+def test_treeViewBenchmark():
+    treeView = _treeView(100_000)
+    ids = treeView._ids
+    treeView._widget.selected = tuple(ids[i] for i in range(0, 100_000, 1000))
+    start = perf_counter()
+    for _ in range(100):
+        selected = treeView.getSelectedIndex()
+    select = perf_counter() - start
+    assert selected == list(range(0, 100_000, 1000))
+    start = perf_counter()
+    for _ in range(1000):
+        treeView.deleteItemByIndex(-1)
+        treeView.getSelectedIndex()
+    delete = perf_counter() - start
+    print(f"\nTreeView 100k rows: 100 selections of 100 rows {select*1000:.1f} ms, 1000 deletes + selection {delete*1000:.1f} ms")
+    assert treeView.length() == 99_000
+
+
+class _FakeTkVirtualTreeview:
+    # ttk.Treeview stand-in: the rendered Tcl script is evaluated against an empty proc.
+    def __init__(self):
+        self._w = ".table"
+        self.tk = tkinter.Tcl().tk
+        self.tk.eval("proc .table {args} {return}")
+
+def _virtualTreeView(source, rows=40):
+    table = VirtualTreeView.__new__(VirtualTreeView)
+    table._group = None
+    table._widget = _FakeTkVirtualTreeview()
+    table._headers = ["name", "value", "flag"]
+    table._source = ()
+    table._length = 0
+    table._rowTags = None
+    table._offset = 0
+    table._slots = []
+    table._detached = set()
+    table._rowsPartial = False
+    table._selected = set()
+    table._anchor = None
+    table._selectMode = "single"
+    table._yScrollbar = None
+    table._createSlots(rows)
+    return table.setRowSource(source)
+
+def test_virtualTreeViewSee():
+    table = _virtualTreeView([("row"+str(i), i, i % 2) for i in range(1000)])
+    table.see(999)
+    assert table._offset == 1000-40
+    table.see(5)
+    assert table._offset == 5
+    table.setItemSelectedByIndex(7)
+    assert table.getSelectedItem() == {"name":"row7", "value":7, "flag":1}
+
+def test_virtualTreeViewBenchmark():
+    source = [("row"+str(i), i, i % 2) for i in range(1_000_000)]
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    table = _virtualTreeView(source)
+    frames = 0
+    begin = perf_counter()
+    for offset in range(0, 1_000_000, 997):
+        table.scrollTo(offset)
+        frames += 1
+    elapsed = perf_counter() - begin
+    size = tracemalloc.get_traced_memory()[1] - start
+    tracemalloc.stop()
+    print(f"\nVirtualTreeView 1M rows: {frames/elapsed:.0f} scroll renders/s, {size/1024:.0f} KiB allocated by the table")
+    assert table._offset == min(997*(frames-1), 1_000_000-40)
+    assert size < 1024*1024 # independent of the row count
+
+
+class _FakeTkText:
+    # tkinter.Text stand-in which only keeps whole lines. Timers run on a 'Tcl' interpreter.
+    def __init__(self):
+        self.tcl = tkinter.Tcl()
+        self.tk = self # 'tk.call(path, "insert", "end", text, tags, ...)' lands in 'call'
+        self._w = ".text"
+        self.lines = []
+        self.seen = 0
+        self.evals = 0
+        self.cursor = 1
+        self.tags = {}
+    def call(self, path, command, index, *args):
+        for text in args[::2]: self.lines.extend(text.splitlines())
+    def index(self, index):
+        if index == "insert": return str(self.cursor)+".0"
+        return str(len(self.lines)+1)+".0" # 'end-1c'
+    def delete(self, first, last):
+        del self.lines[:int(last.split(".")[0])-1]
+    def see(self, index):
+        self.seen += 1
+    def get(self, first, last):
+        return "\n".join(self.lines[int(first.split(".")[0])-1:int(last.split(".")[0])])
+    def eval(self, script):
+        self.evals += 1
+    def tag_configure(self, tag, **kwargs):
+        self.tags.setdefault(tag, {}).update(kwargs)
+    def tag_delete(self, *tags):
+        for tag in tags: self.tags.pop(tag, None)
+    def tag_remove(self, tag, first, last):
+        pass
+    def bind(self, sequence, func):
+        return "funcid"
+    def after(self, ms, func):
+        return self.tcl.after(ms, func)
+    def after_cancel(self, id_):
+        self.tcl.after_cancel(id_)
+    def destroy(self):
+        pass
+
+class _FakeTkMaster:
+    _batch = None
+
+def _text():
+    text = Text.__new__(Text)
+    text._group = None
+    text._widget = _FakeTkText()
+    text._master = text._tkMaster = _FakeTkMaster()
+    text._eventRegistry = _EventRegistry({"event":{}, "widget":text})
+    text._toolTip = None
+    text._destroyed = False
+    text._lockVal = 0
+    text._isDisabled = text._isReadOnly = text._forceDisabled = False
+    text._autoScroll = True
+    text._logQueue = None
+    text._logMaxLines = None
+    text._logFlushId = None
+    text._highlightRules = []
+    text._highlightTags = set()
+    text._highlightBound = False
+    text._highlightLookahead = 1
+    text._highlightLineCount = 1
+    return text
+
+def test_textDestroyCancelsLogFlush():
+    text = _text().setLogMode()
+    assert text._widget.tcl.call("after", "info") != ""
+    text.log("line")
+    text.destroy()
+    assert text._widget.tcl.call("after", "info") == ""
+    text = _text().setLogMode()
+    text.log("line")
+    text.setNormalMode()
+    assert text._widget.lines == ["line"]
+    assert text._widget.tcl.call("after", "info") == ""
+
+def test_textLogBenchmark():
+    # a producer thread pushes 100k lines as fast as it can, the Tcl loop flushes them once per frame
+    text = _text().setLogMode(maxLines=10_000)
+    widget = text._widget
+    producer = Thread(target=lambda: [text.log("line "+str(i)) for i in range(100_000)])
+    gc.collect() # Tcl interpreters of earlier tests must not be collected by the producer thread
+    start = perf_counter()
+    producer.start()
+    latency = 0
+    while producer.is_alive() or text._logQueue:
+        begin = perf_counter()
+        widget.tcl.dooneevent(_tkinter.ALL_EVENTS)
+        latency = max(latency, perf_counter()-begin)
+    elapsed = perf_counter() - start
+    text.destroy()
+    print(f"\nText log 100k lines: {100_000/elapsed:.0f} lines/s, longest flush {latency*1000:.1f} ms, {widget.seen} scrolls")
+    assert len(widget.lines) == 10_000 and widget.lines[-1] == "line 99999"
+    assert widget.seen < 1000 # scrolled once per flush, not per line
+
+def test_textHighlightTagsNotReused():
+    text = _text()
+    text.addHighlightRule("a", fg="red")
+    assert text._widget.tags == {"hl_0":{"foreground":"red"}}
+    text.addHighlightRule("b", tag="keyword")
+    text.clearHighlightRules()
+    assert "hl_0" not in text._widget.tags
+    text.addHighlightRule("c", bg="blue")
+    assert text._widget.tags["hl_0"] == {"background":"blue"}
+
+def test_textHighlightBenchmark():
+    text = _text()
+    widget = text._widget
+    widget.lines = ["def func"+str(i)+"(value): return value * "+str(i) for i in range(50_000)]
+    start = perf_counter()
+    text.addHighlightRule(r"\bdef\b", fg="blue").addHighlightRule(r"\d+", fg="red")
+    full = perf_counter() - start
+    widget.evals = 0
+    start = perf_counter()
+    for line in range(1, 50_000, 50):
+        widget.cursor = line
+        text._onHighlightEdit()
+    keystroke = (perf_counter() - start) / 1000
+    print(f"\nText highlight 50k lines: full pass {full*1000:.1f} ms, per keystroke {keystroke*1000:.3f} ms")
+    assert widget.evals == 1000 # one Tcl call per keystroke
+
+class _FakeTkPlaced(tkinter.Misc, tkinter.Place):
+    # tkinter widget without Tk, 'place' is a Tcl proc recording the calls
+    def __init__(self, tcl, path):
+        self.tk = tcl.tk
+        self._w = path
+        self._tclCommands = None
+
+def test_placeForgetInBatch():
+    tcl = tkinter.Tcl()
+    tcl.eval("proc place {args} {lappend ::placed $args; return}")
+    window = Tk.__new__(Tk)
+    window._master = tcl
+    window._batch = None
+    window._childWidgets = []
+    window._destroyed = False
+    widget = _Widget(None, _FakeTkPlaced(tcl, ".w"), window, None)
+    other = _Widget(None, _FakeTkPlaced(tcl, ".o"), window, None)
+    with window.batch():
+        widget.place(1, 2, 30, 40)
+        other.place(5, 6, 70, 80)
+        widget.placeForget()
+    assert tcl.splitlist(tcl.eval("set ::placed")) == ("forget .w", "configure .o -x 5 -y 6 -width 70 -height 80 -anchor nw")
+    with window.batch():
+        widget.placeForget()
+        widget.place(3, 4)
+    assert tcl.splitlist(tcl.eval("set ::placed"))[-1] == "configure .w -x 3 -y 4 -anchor nw"
@@ -0,0 +1,79 @@
+import tkinter
+from socket import socketpair
+from time import perf_counter, process_time, sleep
+
+from tksimple.window import Tk
+
+
+class _FakeWindow(Tk):
+    # 'Tcl' has no Tk, so 'tkwait' is replaced by the Tcl 'vwait' it is built on.
+    def __init__(self):
+        self._master = tkinter.Tcl()
+        self._master.eval("proc tkwait {type name} {vwait ::$name}")
+        self._destroyed = False
+
+def _busySleep(window, s):
+    # 'Tk.sleep' before it waited in the event loop
+    start = perf_counter()
+    while perf_counter()-start < s:
+        window._master.update()
+
+def test_sleepBenchmark():
+    window = _FakeWindow()
+    fired = []
+    window._master.after(50, fired.append, True)
+    cpu = process_time()
+    _busySleep(window, .3)
+    busy = process_time()-cpu
+    window._master.after(50, fired.append, True)
+    start = perf_counter()
+    cpu = process_time()
+    window.sleep(.3)
+    waiting = process_time()-cpu
+    print(f"\nsleep(.3) CPU: update loop {busy*1000:.1f} ms, event loop {waiting*1000:.1f} ms")
+    assert perf_counter()-start >= .29
+    assert fired == [True, True] # events run while sleeping
+    assert waiting < .05 and waiting < busy
+
+def test_sleepDestroyedWindow():
+    window = _FakeWindow()
+    window._destroyed = True
+    start = perf_counter()
+    assert window.sleep(.05) is window
+    assert perf_counter()-start >= .05
+
+def test_pump():
+    window = _FakeWindow()
+    assert window.pump() == 0
+    fired = []
+    window._master.after(0, fired.append, True)
+    assert window.pump() >= 1
+    assert fired == [True]
+    window._destroyed = True
+    window._master.after(0, fired.append, True)
+    assert window.pump() == 0
+
+def test_pumpBudget():
+    # 50 pending events of 2 ms each, pump(10) stops after about 10 ms
+    window = _FakeWindow()
+    tcl = window._master
+    handled = []
+    pairs = [socketpair() for i in range(50)]
+    def onReadable(file, mask):
+        sleep(.002)
+        tcl.deletefilehandler(file)
+        handled.append(file)
+    for read, write in pairs:
+        write.send(b"x")
+        tcl.createfilehandler(read, tkinter.READABLE, onReadable)
+    start = perf_counter()
+    count = window.pump(10)
+    elapsed = perf_counter()-start
+    while window.pump(10): pass
+    for read, write in pairs:
+        tcl.deletefilehandler(read) # the notifier is shared by all interpreters of this thread
+        read.close()
+        write.close()
+    assert 0 < count < 50
+    assert elapsed < .03
+    assert len(handled) == 50
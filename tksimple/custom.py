@@ -845,8 +845,10 @@ class ScrollableFrame(Frame):
         self._outerFrame = Frame(_master, group)
         super().__init__(self._outerFrame, group)
         self._shiftState = State()
-        self._getTkMaster().bind(self._shiftState.set, EventType.SHIFT_LEFT_DOWN)
-        self._getTkMaster().bind(self._shiftState.unset, EventType.SHIFT_LEFT_UP)
+        self._masterEvents = [
+            self._getTkMaster().bindEvent(self._shiftState.set, EventType.SHIFT_LEFT_DOWN),
+            self._getTkMaster().bindEvent(self._shiftState.unset, EventType.SHIFT_LEFT_UP)
+        ]
         self._enterState = State()
         self._outerFrame.bind(self._enterState.set, EventType.ENTER)
         self._outerFrame.bind(self._enterState.unset, EventType.LEAVE)
@@ -854,7 +856,7 @@ class ScrollableFrame(Frame):
         self._scrollBarY = ScrollBar(self._outerFrame, False, group)
         self._scrollBarX = ScrollBar(self._outerFrame, False, group).setOrientation(Orient.HORIZONTAL)
         self._square = Label(self._outerFrame, group)
-        self._getTkMaster().bind(self._onScroll, EventType.WHEEL_MOTION)
+        self._masterEvents.append(self._getTkMaster().bindEvent(self._onScroll, EventType.WHEEL_MOTION))
         self._innerFrameHeight = innerFrameHeight
         self._innerFrameWidth = innerFrameWidth
         self._currentYPos = 0
@@ -870,6 +872,18 @@ class ScrollableFrame(Frame):
         return self
     def getOuterFrame(self)->Frame:
         return self._outerFrame
+    def destroy(self):
+        """
+        Destroys the ScrollableFrame and removes its events from the Tk master.
+        @return:
+        """
+        for event in self._masterEvents:
+            event.unbind()
+        self._masterEvents.clear()
+        super().destroy()
+        if not self._outerFrame._destroyed:
+            self._outerFrame.destroy()
+        return self
     def place(self, x=None, y=None, width=None, height=None, anchor:Anchor=Anchor.UP_LEFT):
         assert width > 25, f"This size is too small for inner Frame! width:{width}"
         self._currentSize = [width, height, (width if self._innerFrameWidth is None else self._innerFrameWidth), self._innerFrameHeight]
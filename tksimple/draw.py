@@ -45,8 +45,15 @@ class CanvasObject:
 
         self._master._canvasObjects.append(self)
     def bind(self, func, event: Union[EventType, Key, Mouse], args:list=None, priority:int=0, defaultArgs=False, disableArgs=False):
+        self.bindEvent(func, event, args, priority, defaultArgs, disableArgs)
+        return self
+    def bindEvent(self, func, event: Union[EventType, Key, Mouse], args:list=None, priority:int=0, defaultArgs=False, disableArgs=False):
+        """
+        Same as 'bind' but returns the Event instance.
+        Use 'Event.unbind' to remove only this bound function.
+        """
         assert self._canvasObjectID is not None, "Render canvasObj before binding!"
-        _EventHandler._registerNewTagBind(self, self._canvasObjectID, func, event, args, priority, defaultArgs=defaultArgs, disableArgs=disableArgs)
+        return _EventHandler._registerNewTagBind(self, self._canvasObjectID, func, event, args, priority, defaultArgs=defaultArgs, disableArgs=disableArgs)
     def render(self):
         assert self._loc1 is not None, "Location must be defined use .setLocation()!"
         assert self._loc2 is not None or (self._width is not None and self._height is not None), "Location2 or width and height must be defined!"
@@ -1,65 +1,114 @@
 from typing import Union, Callable
+from bisect import bisect_right
+from itertools import count
+from time import monotonic
+from inspect import iscoroutinefunction, iscoroutine
 
 from .tkmath import Location2D
-from .util import _isinstance, _checkMethod
+from .util import _isinstance, _checkMethod, _runCoroutine
 from .const import TKExceptions, Key, EventType, Mouse
 
 
 
+def _unbindFunc(widget, what:tuple, funcId:str):
+    """
+    Removes only the tkinter binding 'funcId' from the bind script.
+    tkinter < 3.13 'unbind(sequence, funcid)' removes all bindings of the sequence.
+
+    @param widget: tkinter widget
+    @param what: bind command without script. ("bind", <path>, <sequence>) or (<path>, "bind", <tag>, <sequence>)
+    @param funcId: id returned by tkinter 'bind'
+    """
+    prefix = f'if {{"[{funcId} '
+    lines = widget.tk.call(*what).split("\n")
+    script = "\n".join(line for line in lines if not line.startswith(prefix))
+    widget.tk.call(*what, script if script.strip() else "")
+    widget.deletecommand(funcId)
+_EVENT_KEYS = {"afterTriggered":"_afterTriggered",
+               "setCanceled":"_setCanceled",
+               "widget":"_widget",
+               "args":"_args",
+               "priority":"_priority",
+               "tkArgs":"_tkArgs",
+               "func":"_func",
+               "value":"_value",
+               "eventType":"_eventType",
+               "defaultArgs":"_defaultArgs",
+               "disableArgs":"_disableArgs",
+               "decryptValueFunc":"_decryptValueFunc",
+               "forceReturn":"_forceReturn",
+               "handler":"_handler",
+               "pos":"_pos"}
 class Event:
     """
     Event class.
     Do not instantiate this class by yourself.
     The instance is passed by every bound function.
     It provides all nessesary values and information.
+
+    The values are stored in slots.
+    'event["key"]' is still supported. Unknown keys are stored in an extra dict.
     """
+    __slots__ = ("_afterTriggered", "_setCanceled", "_widget", "_args", "_priority", "_tkArgs", "_func", "_value", "_eventType",
+                 "_defaultArgs", "_disableArgs", "_decryptValueFunc", "_forceReturn", "_handler", "_pos", "_extra",
+                 "_coalesceDelay", "_pending", "_lastRun")
     def __init__(self, dic=None, **kwargs):
         # feature deprecated
         assert dic is None, "Event cannot be casted!"
-        if dic is None:
-            self._data = {"afterTriggered":None,
-                          "setCanceled": False,
-                          "widget": None,
-                          "args":[],
-                          "priority":0,
-                          "tkArgs":None,
-                          "func":None,
-                          "value":None,
-                          "eventType":None,
-                          "defaultArgs":False,
-                          "disableArgs":True,
-                          "decryptValueFunc":None,
-                          "forceReturn":None,
-                          "handler":None,
-                          "pos":None
-                          }
-        else:
-            self._data = dic._data
+        self._afterTriggered = None
+        self._setCanceled = False
+        self._widget = None
+        self._args = []
+        self._priority = 0
+        self._tkArgs = None
+        self._func = None
+        self._value = None
+        self._eventType = None
+        self._defaultArgs = False
+        self._disableArgs = True
+        self._decryptValueFunc = None
+        self._forceReturn = None
+        self._handler = None
+        self._pos = None
+        self._extra = None
+        self._coalesceDelay = None # None: call on every event | 0: once per idle cycle | >0: min milliseconds between calls
+        self._pending = None # after id of the scheduled coalesced call
+        self._lastRun = 0.0
 
-        for k, v in zip(kwargs.keys(), kwargs.items()):
-            self._data[k] = v
+        for k, v in kwargs.items():
+            self[k] = v
     def __repr__(self):
-        func = f"'{'' if not hasattr(self._data['func'], '__self__') else self._data['func'].__self__.__class__.__name__ + '.'}{self._data['func'] if not hasattr(self._data['func'], '__name__') else self._data['func'].__name__}'"
-        return f"Event({{func: {func}, args:"+str(self["args"])+", priority:"+str(self["priority"])+", setCanceled:"+str(self["setCanceled"])+"})"
-    def __del__(self):
-        if hasattr(self, "_data"):
-            self._data.clear()
+        func = f"'{'' if not hasattr(self._func, '__self__') else self._func.__self__.__class__.__name__ + '.'}{self._func if not hasattr(self._func, '__name__') else self._func.__name__}'"
+        return f"Event({{func: {func}, args:"+str(self._args)+", priority:"+str(self._priority)+", setCanceled:"+str(self._setCanceled)+"})"
     def __call__(self):
-        if self["handler"] is None:
+        if self._handler is None:
             return
-        return self["handler"]()
+        return self._handler()
     def __getitem__(self, item):
-        return self._data[item]
+        name = _EVENT_KEYS.get(item)
+        if name is not None:
+            return getattr(self, name)
+        if self._extra is None:
+            raise KeyError(item)
+        return self._extra[item]
     def __setitem__(self, key, value):
-        self._data[key] = value
+        name = _EVENT_KEYS.get(key)
+        if name is not None:
+            setattr(self, name, value)
+            return
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+    def __contains__(self, item):
+        return item in _EVENT_KEYS or (self._extra is not None and item in self._extra)
     def __lt__(self, other):
-        return self["priority"] < other["priority"]
+        return self._priority < other._priority
     def getTkArgs(self):
         """
         Returns the default tkinter event class.
         @return:
         """
-        return self["tkArgs"]
+        return self._tkArgs
     def setCanceled(self, b:bool=True):
         """
         Cancels the event.
@@ -67,32 +116,35 @@ class Event:
         @param b:
         @return:
         """
-        self["setCanceled"] = b
+        self._setCanceled = b
     def getWidget(self):
         """
         Returns the widget which called the event.
         @return:
         """
-        return self["widget"]
+        return self._widget
     def getValue(self):
         """
         Returns the selected Item or None.
         This works NOT for all events.
         @return:
         """
-        return self["value"]
+        return self._value
     def getPos(self)->Location2D:
         """
         Returns the mouse posistion when available through tkinter event.
         @return:
         """
-        return self["pos"]
+        tkArgs = self._tkArgs
+        if hasattr(tkArgs, "x") and hasattr(tkArgs, "y"):
+            return Location2D(tkArgs.x, tkArgs.y)
+        return self._pos
     def getScrollDelta(self)->Union[float, None]:
         """
        Returns the mouse scroll delta posistion when available through tkinter event.
        @return:
        """
-        return self["tkArgs"].delta if hasattr(self["tkArgs"], "delta") else None
+        return self._tkArgs.delta if hasattr(self._tkArgs, "delta") else None
     def getArgs(self, i=None):
         """
         Returns the on bound specifyed Args.
@@ -100,15 +152,15 @@ class Event:
         @param i: If args is a list returns the index i from that list.
         @return:
         """
-        if self["args"] is None: return None
-        if type(i) is int: return self["args"][i]
-        return self["args"]
+        if self._args is None: return None
+        if type(i) is int: return self._args[i]
+        return self._args
     def getEventType(self):
         """
         Returns bound EventType.
         @return:
         """
-        return self["eventType"]
+        return self._eventType
     def getKey(self):
         """
         If event type is any kind of keyboard event, this method returns the pressed key which triggered the event.
@@ -125,12 +177,21 @@ class Event:
         k = k.replace("<", "").replace(">", "")
         if not hasattr(self.getTkArgs(), "keysym"): return False
         return k == self.getTkArgs().keysym
+    def unbind(self)->bool:
+        """
+        Removes only this bound function from the widget.
+        The tkinter binding is removed if no other function is bound to this event type.
+        Returns False if this event was already unbound.
+        @return:
+        """
+        if self._widget is None: return False
+        return self._widget._eventRegistry.removeEvent(self)
     def printEventInfo(self):
         """
         Returns info about current event.
         @return:
         """
-        print("This Event[type: "+self["eventType"]+"] was triggered by "+str(type(self["widget"]))+"! | Args:"+str(self["args"]))
+        print("This Event[type: "+self._eventType+"] was triggered by "+str(type(self._widget))+"! | Args:"+str(self._args))
 class _EventRegistry:
     """
     Private event implementation.
@@ -139,7 +200,7 @@ class _EventRegistry:
     """
     def __init__(self, ins):
         if _isinstance(ins, "_Widget") or _isinstance(ins, "Tk") or _isinstance(ins, "CanvasObject"):
-            self._data = {"event":{}, "widget":ins} # event : { type_ : ( <type:_EventHandler>, [<type:Event>, ...] ) }
+            self._data = {"event":{}, "widget":ins} # event : { type_ : <type:_EventChain> }
         elif isinstance(ins, dict):
             self._data = ins
         elif isinstance(ins, _EventRegistry):
@@ -158,113 +219,259 @@ class _EventRegistry:
         print("Widget: "+self["widget"].__class__.__name__)
         for k, v in zip(self["event"].keys(), self["event"].values()):
             print("-EventType: "+k+":")
-            for event in v[1]:
+            for event in v.events:
                 print(" -bind to: "+event["func"].__name__)
     def addEvent(self, event, type_):
         handler = None
         if type_ in self["event"].keys(): # add Event
-            self["event"][type_][1].append(event)
-            self["event"][type_][1].sort()
-            self["event"][type_][1].reverse()
+            chain = self["event"][type_]
+            chain.add(event)
         else:                             # new event type
-            handler = _EventHandler(event)
-            self["event"][type_] = (handler, [event])
+            chain = _EventChain(event)
+            self["event"][type_] = chain
+            handler = _EventHandler(event, chain)
+            chain.handler = handler
         if _EventHandler.DEBUG:
-            print(self["event"][type_][0])
+            print(chain.handler)
         return handler
     def getRegisteredEvents(self, type_):
-        return self["event"][type_][1]
+        return self["event"][type_].events
     def getCallables(self, type_)->Union[Event, list]:
         if type_ in self["event"].keys():
-            return self["event"][type_][1]
+            return self["event"][type_].events
         return []
     def getHandler(self, type_):
         if type_ in self["event"].keys():
-            return self["event"][type_][0]
+            return self["event"][type_].handler
         return None
+    def getChain(self, type_):
+        return self["event"].get(type_, None)
+    def removeEvent(self, event)->bool:
+        """
+        Removes a single event in O(1).
+        The tkinter binding is dropped if the chain becomes empty.
+        Returns False if the event was not bound (anymore).
+        """
+        chain = self["event"].get(event._eventType, None)
+        if chain is None or not chain.remove(event): return False
+        if not len(chain):
+            self.unregisterType(event._eventType)
+        return True
     def unregisterType(self, type_):
         if type_ in self["event"].keys():
-            _event = self["event"][type_][0].event
-            _event.getWidget()._get().unbind(_event.getEventType())
-            self["event"].pop(type_)
+            self["event"].pop(type_).release()
     def unregisterAll(self):
-        for i in self["event"].values():
-            _event = i[0].event
+        for chain in self["event"].values():
             try:
-                _event.getWidget()._get().unbind(_event.getEventType())
+                chain.release()
             except:
 
                 pass
+            chain.clear()
         self["event"] = {}
+class _EventChain:
+    """
+    Private implementation.
+    Holds all events bound to one event type of a widget.
+
+    Events are inserted ordered by priority (highest first) using bisect.
+    Events with equal priority are called in the order they were bound.
+    Removing an event only marks it as removed (O(1)).
+    The list is cleaned up the next time it is read.
+
+    The events are compiled into a flat tuple of records:
+        (<type:Event>, func, flags, decryptValueFunc, afterTriggered)
+    The tuple is only rebuilt after the chain has changed (bind/unbind).
+    Dispatching a tkinter event only iterates over this tuple.
+    """
+    DEFAULT_ARGS = 1
+    DISABLE_ARGS = 2
+    COALESCE = 4
+    ASYNC = 8
+    _SEQUENCE = count()
+    def __init__(self, event):
+        self.handler = None
+        self.compiled = None
+        self.forceReturn = event._forceReturn
+        self.releaseFunc = None # removes the tkinter binding
+        self._events = []
+        self._keys = [] # (-priority, sequence) sorted ascending
+        self._members = set()
+        self._dirty = False
+        self.add(event)
+    def __len__(self):
+        return len(self._members)
+    @property
+    def events(self)->list:
+        if self._dirty:
+            keys = []
+            events = []
+            for key, event in zip(self._keys, self._events):
+                if event in self._members:
+                    keys.append(key)
+                    events.append(event)
+            self._keys = keys
+            self._events = events
+            self._dirty = False
+        return self._events
+    def add(self, event):
+        key = (-event._priority, next(_EventChain._SEQUENCE))
+        index = bisect_right(self._keys, key)
+        self._keys.insert(index, key)
+        self._events.insert(index, event)
+        self._members.add(event)
+        self.compiled = None
+    def remove(self, event)->bool:
+        if event not in self._members: return False
+        _EventChain._cancelPending(event)
+        self._members.discard(event)
+        self._dirty = True
+        self.compiled = None
+        return True
+    def release(self):
+        releaseFunc = self.releaseFunc
+        self.releaseFunc = None
+        self.clear()
+        if releaseFunc is not None: releaseFunc()
+    def clear(self):
+        for event in self._members:
+            _EventChain._cancelPending(event)
+        self._events = []
+        self._keys = []
+        self._members = set()
+        self._dirty = False
+        self.compiled = ()
+    @staticmethod
+    def _cancelPending(event):
+        afterId = event._pending
+        if afterId is None: return
+        event._pending = None
+        try:
+            event._widget._get().after_cancel(afterId)
+        except Exception:
+            pass # widget already destroyed
+    def compile(self)->tuple:
+        records = []
+        for event in self.events:
+            flags = 0
+            if event._defaultArgs: flags |= _EventChain.DEFAULT_ARGS
+            if event._disableArgs: flags |= _EventChain.DISABLE_ARGS
+            if event._coalesceDelay is not None: flags |= _EventChain.COALESCE
+            if iscoroutinefunction(event._func): flags |= _EventChain.ASYNC
+            records.append((event, event._func, flags, event._decryptValueFunc, event._afterTriggered))
+        self.compiled = tuple(records)
+        return self.compiled
 class _EventHandler:
     DEBUG = False
     #OLD:  _Events = {} #save in Individual instance! { <obj_id> : <type: _EventHandler> }
-    def __init__(self, event):
+    def __init__(self, event, chain=None):
         assert isinstance(event, Event), "Do not instance this class by yourself!"
         self.event = event
-        #print(self.event.getWidget()["registry"], self.event.getWidget())
+        self._chain = chain if chain is not None else event["widget"]._eventRegistry.getChain(event["eventType"])
     def __repr__(self):
-        return "EventHandler("+"{widgetType:\""+type(self.event["widget"]).__name__+"\", eventType:"+str(self.event["eventType"])+", ID:"+self.event["widget"]["id"]+"}) bind on: \n\t-"+"\n\t-".join([str(i) for i in self.event["widget"]["registry"].getRegisteredEvents(self.event["eventType"])])
+        events = self._chain.events if self._chain is not None else []
+        return "EventHandler("+"{widgetType:\""+type(self.event["widget"]).__name__+"\", eventType:"+str(self.event["eventType"])+", ID:"+str(id(self.event["widget"]))+"}) bind on: \n\t-"+"\n\t-".join([str(i) for i in events])
     def __getitem__(self, item):
         return self.event[item]
     def __setitem__(self, key, value):
         self.event[key] = value
     def __call__(self, *args):
-        if self.event is None: return
-        def raiseError(err):
-            info = f"""
-\tCould not execute bound event method!
-\t\tBoundTo:         '{"" if not hasattr(event["func"], "__self__") else event["func"].__self__.__class__.__name__ + "."}{event["func"] if not hasattr(event["func"], "__name__") else event["func"].__name__}' 
-\t\tWidget:          '{type(event["widget"]).__name__}'
-\t\tEventType:       '{event["eventType"]}'
-\t\tpriority:        {event["priority"]}
-\t\targs:            {event["args"]}
-\t\tvalue:           {event["value"]}"""
-            _max = max([len(i) for i in info.splitlines()])
-            if _max < 111: _max = 111
-            _info = ""
-            for j, i in enumerate(info.splitlines()):
-                _info += (i+ "\n")
-            if type(err) == KeyError:
-                print(_info)
-            else:
-                if len(err.args) > 0:
-                    err.args = (str(_info)+str(err.args[0]),)
-                else:
-                    err.args = (str(_info),)
-
+        chain = self._chain
+        if chain is None: return
+        records = chain.compiled
+        if records is None: records = chain.compile()
         args = args[0] if len(args) == 1 else list(args)
-        event = None
         out = None
-        if "widget" not in self.event._data.keys(): return #  event already dropped
-        for event in self.event["widget"]._eventRegistry.getCallables(self.event["eventType"]): #TODO get only the output of the last called func. problem? maybe priorities
-            func = event["func"]
-            event["tkArgs"] = args
-            if event["decryptValueFunc"] is not None:
-                event["value"] = event["decryptValueFunc"](args, event) #TODO event in 'decryptValueFunc'
-                #if event["eventType"] == "<<ListboxSelect>>":
-                #    print(event._data)
-                if event["value"] == "CANCEL":
+        for event, func, flags, decrypt, after in records: #TODO get only the output of the last called func. problem? maybe priorities
+            event._tkArgs = args
+            if flags & _EventChain.COALESCE:
+                if event._pending is None:
+                    event._handler._scheduleCoalesced()
+                continue
+            if decrypt is not None:
+                value = decrypt(args, event)
+                event._value = value
+                if value.__class__ is str and value == "CANCEL":
                     return
-            if not event["defaultArgs"]:
-                if event["value"] is None:
-                    if hasattr(args, "x") and hasattr(args, "y"):
-                        event["pos"] = Location2D(args.x, args.y)
-                args = event
             # call event
             try:
-                if event["disableArgs"]:
+                if flags & _EventChain.DISABLE_ARGS:
                     out = func()
-                else:
+                elif flags & _EventChain.DEFAULT_ARGS:
                     out = func(args)
+                else:
+                    out = func(event)
+                if flags & _EventChain.ASYNC: out = _runCoroutine(out)
             except Exception as e:
-                raiseError(e)
+                _EventHandler._extendErrorInfo(event, e)
                 raise
-            if not len(event._data): return False # destroyed
-            if event["afterTriggered"] is not None: event["afterTriggered"](event, out)
+            if chain.compiled is not records and not len(chain): return False # destroyed
+            if after is not None: after(event, out)
         # After all events are processed
-        if self.event["forceReturn"] is not None:
-            return self.event["forceReturn"]
+        return chain.forceReturn
+    def _scheduleCoalesced(self):
+        event = self.event
+        delay = event._coalesceDelay
+        if delay:
+            delay = int(delay - (monotonic() - event._lastRun) * 1000)
+        if delay > 0:
+            event._pending = event._widget._get().after(delay, self._runCoalesced)
+        else:
+            event._pending = event._widget._get().after_idle(self._runCoalesced)
+    def _runCoalesced(self):
+        """
+        Runs a coalesced event once with the latest tkinter args.
+        The return value of the bound function is ignored.
+        """
+        event = self.event
+        event._pending = None
+        chain = self._chain
+        if chain is None or event not in chain._members: return # unbound in the meantime
+        event._lastRun = monotonic()
+        args = event._tkArgs
+        if event._decryptValueFunc is not None:
+            value = event._decryptValueFunc(args, event)
+            event._value = value
+            if value.__class__ is str and value == "CANCEL":
+                return
+        try:
+            if event._disableArgs:
+                out = event._func()
+            elif event._defaultArgs:
+                out = event._func(args)
+            else:
+                out = event._func(event)
+            if iscoroutine(out): out = _runCoroutine(out)
+        except Exception as e:
+            _EventHandler._extendErrorInfo(event, e)
+            raise
+        if event._afterTriggered is not None: event._afterTriggered(event, out)
+    @staticmethod
+    def _getCoalesceDelay(coalesce:bool, maxRate:Union[int, float, None]):
+        if maxRate is not None:
+            assert maxRate > 0, "maxRate must be greater than 0!"
+            return 1000 / maxRate
+        return 0 if coalesce else None
+    @staticmethod
+    def _extendErrorInfo(event, err):
+        info = f"""
+\tCould not execute bound event method!
+\t\tBoundTo:         '{"" if not hasattr(event["func"], "__self__") else event["func"].__self__.__class__.__name__ + "."}{event["func"] if not hasattr(event["func"], "__name__") else event["func"].__name__}' 
+\t\tWidget:          '{type(event["widget"]).__name__}'
+\t\tEventType:       '{event["eventType"]}'
+\t\tpriority:        {event["priority"]}
+\t\targs:            {event["args"]}
+\t\tvalue:           {event["value"]}"""
+        _info = ""
+        for i in info.splitlines():
+            _info += (i+ "\n")
+        if type(err) == KeyError:
+            print(_info)
+        else:
+            if len(err.args) > 0:
+                err.args = (str(_info)+str(err.args[0]),)
+            else:
+                err.args = (str(_info),)
     @staticmethod
     def setEventDebug(b:bool):
         _EventHandler.DEBUG = b
@@ -272,7 +479,7 @@ class _EventHandler:
     def printAllBinds(widget):
         widget["registry"].printAllBinds()
     @staticmethod
-    def _registerNewEvent(obj, func, eventType:Union[EventType, Key, Mouse], args: list, priority:int, decryptValueFunc=None, defaultArgs=False, disableArgs=False):
+    def _registerNewEvent(obj, func, eventType:Union[EventType, Key, Mouse], args: list, priority:int, decryptValueFunc=None, defaultArgs=False, disableArgs=False, coalesce=False, maxRate=None):
         """
         This is the intern Event-Register
         @param obj: the widget
@@ -282,6 +489,8 @@ class _EventHandler:
         @param decryptValueFunc: this function gets called before the binded func was called
         @param defaultArgs: this bool decides if the 'Event' instance or the normal tkinter args are passed into the target function
         @param disableArgs: if this is True no arguments will be passed
+        @param coalesce: if this is True the function is called at most once per idle cycle with the latest event
+        @param maxRate: the function is called at most 'maxRate' times per second with the latest event
         @return: None
         """
         if hasattr(eventType, "value"):
@@ -296,11 +505,13 @@ class _EventHandler:
         event["decryptValueFunc"] = decryptValueFunc
         event["eventType"] = eventType
         event["priority"] = priority
-        handler = obj._eventRegistry.addEvent(event, eventType)
+        event._coalesceDelay = _EventHandler._getCoalesceDelay(coalesce, maxRate)
         _checkMethod(func, event)
+        handler = obj._eventRegistry.addEvent(event, eventType)
         if handler is not None:
             try:
-                obj._get().bind(eventType, handler)
+                funcId = obj._get().bind(eventType, handler)
+                handler._chain.releaseFunc = lambda w=obj._get(), t=eventType, f=funcId: _unbindFunc(w, ("bind", w._w, t), f)
             except:
                 func = f"'{'' if not hasattr(func, '__self__') else func.__self__.__class__.__name__ + '.'}{func if not hasattr(func, '__name__') else func.__name__}'"
                 raise TKExceptions.BindException(f"Could not bind event type '{eventType}' to func {func}!")
@@ -318,11 +529,12 @@ class _EventHandler:
         event["priority"] = priority
         event["decryptValueFunc"] = decryptValueFunc
         event["eventType"] = "cmd"
-        handler = obj._eventRegistry.addEvent(event, "cmd")
         _checkMethod(func, event)
+        handler = obj._eventRegistry.addEvent(event, "cmd")
         if not onlyGetRunnable:
             if handler is not None:
                 obj._get()[cmd] = handler
+                handler._chain.releaseFunc = lambda w=obj._get(), c=cmd: w.configure({c:""})
             event["handler"] = _EventHandler(event)
 
         else:
@@ -341,8 +553,8 @@ class _EventHandler:
         event["decryptValueFunc"] = decryptValueFunc
         event["forceReturn"] = True
         event["eventType"] = "vcmd"
-        handler = obj._eventRegistry.addEvent(event, "vcmd")
         _checkMethod(func, event)
+        handler = obj._eventRegistry.addEvent(event, "vcmd")
         if handler is not None:
             obj["widget"]["validate"] = type_
             obj["widget"]["validatecommand"] = (obj["master"]._get().register(handler), '%P')
@@ -359,11 +571,13 @@ class _EventHandler:
         event["priority"] = priority
         event["decryptValueFunc"] = decryptValueFunc
         event["eventType"] = "trace"
-        handler = obj._eventRegistry.addEvent(event, "trace")
         _checkMethod(func, event)
+        handler = obj._eventRegistry.addEvent(event, "trace")
         if handler is not None:
-            var.trace("w", handler)
+            cbName = var.trace_add("write", handler)
+            handler._chain.releaseFunc = lambda v=var, n=cbName: v.trace_remove("write", n)
         event["handler"] = _EventHandler(event)
+        return event
     @staticmethod
     def _getNewEventRunnable(obj, func, args, priority:int, decryptValueFunc=None, defaultArgs=False, disableArgs=False, after=None):
         assert isinstance(func, Callable), "Runnable bound Func is not callable " + str(type(func)) + " instead!"
@@ -385,7 +599,7 @@ class _EventHandler:
             event["handler"] = _EventHandler(event)
         return event["handler"]
     @staticmethod
-    def _registerNewCustomEvent(obj, func, eventType:Union[EventType, Key, Mouse], args, priority: int, decryptValueFunc=None, defaultArgs=False, disableArgs=False, after=None):
+    def _registerNewCustomEvent(obj, func, eventType:Union[EventType, Key, Mouse], args, priority: int, decryptValueFunc=None, defaultArgs=False, disableArgs=False, after=None, coalesce=False, maxRate=None):
         assert isinstance(func, Callable), "CustomEvent bound Func is not callable " + str(type(func)) + " instead!"
         if hasattr(eventType, "value"):
             eventType = eventType.value
@@ -399,15 +613,14 @@ class _EventHandler:
         event["decryptValueFunc"] = decryptValueFunc
         event["afterTriggered"] = after
         event["eventType"] = eventType
+        event._coalesceDelay = _EventHandler._getCoalesceDelay(coalesce, maxRate)
+        _checkMethod(func, event)
         handler = obj._eventRegistry.addEvent(event, eventType)
         eventType = eventType.value if hasattr(eventType, "value") else eventType
         event["handler"] = _EventHandler(event)
-        _checkMethod(func, event)
         if eventType == "[relative_update]" or eventType == "[relative_update_after]":
             obj._relativePlaceData["handler"] = _EventHandler(event)
-
-
-        return handler
+        return event
     @staticmethod
     def _registerNewTagBind(obj, id_, func, eventType: Union[EventType, Key, Mouse], args: list, priority:int, decryptValueFunc=None, defaultArgs=False, disableArgs=False):
         if hasattr(eventType, "value"):
@@ -422,8 +635,10 @@ class _EventHandler:
         event["priority"] = priority
         event["decryptValueFunc"] = decryptValueFunc
         event["eventType"] = eventType
-        handler = obj._eventRegistry.addEvent(event, eventType)
         _checkMethod(func, event)
+        handler = obj._eventRegistry.addEvent(event, eventType)
         if handler is not None:
-            obj._get().tag_bind(id_, eventType, handler)
+            funcId = obj._get().tag_bind(id_, eventType, handler)
+            handler._chain.releaseFunc = lambda w=obj._get(), i=id_, t=eventType, f=funcId: _unbindFunc(w, (w._w, "bind", i, t), f)
         event["handler"] = _EventHandler(event)
+        return event
@@ -1,17 +1,27 @@
-from threading import Thread
 from types import FunctionType, MethodType
-from time import time, sleep
+from time import time, monotonic
+from math import ceil
+from heapq import heappush, heappop, heapify
+from itertools import count as _count
 import tkinter as _tk
+import _tkinter
+from tkinter import _stringify
 import tkinter.font as _font
 import tkinter.ttk as _ttk
 from random import randint as _randint
 from typing import Union, Callable
+from collections import deque as _deque
+from concurrent.futures import Future
+import asyncio as _asyncio
+from asyncio import get_running_loop as _getRunningLoop
+from traceback import format_exc
+from threading import Lock as _Lock, get_ident as _getIdent
+from socket import socketpair as _socketpair
+import selectors as _selectors
 
 from .const import *
 
 
-_WATCHER = None
-
 class Font:
     def __init__(self, size:int=10, family:FontType=FontType.ARIAL, bold:bool=False, italic:bool=False, underline:bool=False, overstrike:bool=False):
         self._data = {
@@ -97,6 +107,31 @@ def _lockable(func):
             return retVal
         return func(*args, **kwargs)
     return _callable
+def _runCoroutine(coro):
+    """
+    Schedules the coroutine of an 'async def' handler on the running asyncio loop.
+    @param coro:
+    @return: asyncio.Task
+    """
+    try:
+        loop = _getRunningLoop()
+    except RuntimeError:
+        coro.close()
+        raise TKExceptions.InvalidUsageException("'async def' handlers need a running asyncio loop. Use 'Tk.runAsync' instead of 'Tk.mainloop'!")
+    return loop.create_task(coro)
+def _itemconfigureAll(widget, items, option:str="background"):
+    """
+    Configures one option of many Listbox items with a single 'tk.eval' script.
+
+    @param widget: tkinter Listbox
+    @param items: iterable of (index, value). Items with None as value are left unchanged.
+    @param option: item option
+    @return:
+    """
+    command = _stringify(widget._w)+" itemconfigure "
+    option = " -"+option+" "
+    script = "\n".join([command+str(i)+option+_stringify(remEnum(value)) for i, value in items if value is not None])
+    if script: widget.tk.eval(script)
 def _checkMethod(func, event=None, mustHaveArgs=0):
     if func is None: return
     if not hasattr(func, "__code__"): return
@@ -112,78 +147,640 @@ def _checkMethod(func, event=None, mustHaveArgs=0):
         return True
     return False
 def enableRelativePlaceOptimization(runEvySec=2, runSecAftr=.2):
-    global _WATCHER
-    assert _WATCHER is None, "Relative Place Optimization cannot enabled twice!"
-    _WATCHER = _RunWatcher()
+    """
+    Throttles all functions decorated with 'runWatcherDec'.
+    The leading call runs at most every 'runEvySec' seconds.
+    The trailing call runs 'runSecAftr' seconds after the last call.
+
+    Without this optimization the calls are coalesced to one call per idle cycle.
+
+    @param runEvySec: min seconds between two leading calls
+    @param runSecAftr: seconds to wait after the last call
+    @return:
+    """
+    assert _RunWatcher._runAfterSecond is None, "Relative Place Optimization cannot enabled twice!"
     _RunWatcher._runEverySecond = runEvySec
     _RunWatcher._runAfterSecond = runSecAftr
-    _WATCHER.start()
-class _RunWatcher(Thread):
+class _WatcherTimer:
+    """
+    Debounce/Throttle timer of one decorated function on one instance.
+    Runs completely on the Tk loop using 'after' and 'after_idle'.
+    """
+    __slots__ = "_obj", "_func", "_leading", "_trailing", "_id", "_args", "_lastRun", "_lastCall"
+    def __init__(self, obj, func, leading, trailing):
+        self._obj = obj
+        self._func = func
+        self._leading = leading
+        self._trailing = trailing
+        self._id = None
+        self._args = None
+        self._lastRun = None
+        self._lastCall = 0
+    def __call__(self, args):
+        self._args = args
+        if _RunWatcher._runAfterSecond is None:
+            # one call per idle cycle, always with the latest args.
+            if self._id is None:
+                self._id = self._obj._get().after_idle(self._fire)
+            return None
+        now = monotonic()
+        self._lastCall = now
+        # also while a trailing run is pending, so continuous calls still run every '_runEverySecond'
+        if self._leading and (self._lastRun is None or now - self._lastRun >= _RunWatcher._runEverySecond):
+            return self._run(now)
+        if self._trailing and self._id is None:
+            self._id = self._obj._get().after(int(_RunWatcher._runAfterSecond*1000), self._fire)
+        return None
+    def _fire(self):
+        self._id = None
+        if self._args is None: return
+        if _RunWatcher._runAfterSecond is not None:
+            remaining = _RunWatcher._runAfterSecond - (monotonic() - self._lastCall)
+            if remaining > 0: # called again in the meantime -> rearm for the remaining time
+                self._id = self._obj._get().after(ceil(remaining*1000), self._fire)
+                return
+        self._run(monotonic())
+    def _run(self, now):
+        args = self._args
+        self._args = None
+        self._lastRun = now
+        return self._func(self._obj, *args)
+    def cancel(self):
+        if self._id is not None:
+            self._obj._get().after_cancel(self._id)
+            self._id = None
+        self._args = None
+class _RunWatcher:
+    """
+    Decorator factory for debounced/throttled methods.
+    The first argument of the decorated function must be a widget or 'Tk'.
+    Every instance gets its own timer per decorated function (stored in '_runWatcherTimers').
+    """
     _runEverySecond=None
     _runAfterSecond=None
-    _queue = []
-    def __init__(self):
-        super().__init__(daemon=True)
     @staticmethod
-    def runFunc(func, args):
-        return func(*args)
-    def run(self):
-        while True:
-            sleep(.1)
-            if not _RunWatcher._queue: continue
-            for i, j in enumerate(_RunWatcher._queue):
-                if j is None: continue
-                if time() - j[0] >= _RunWatcher._runAfterSecond:
-                    _RunWatcher.runFunc(j[1], j[2])
-                    _RunWatcher._queue[i] = None
+    def runWatcher(func=None, leading=True, trailing=True):
+        """
+        Use as '@runWatcherDec' or '@runWatcherDec(leading=False)'.
 
-    @staticmethod
-    def register()->int:
-        _RunWatcher._queue.append(None)
-        return len(_RunWatcher._queue)-1
-    @staticmethod
-    def runWatcher(func):
-        _id = _RunWatcher.register()
-        _hook = None
-        _timer = None
+        @param func: decorated method
+        @param leading: run immediately if the last run is older than '_runEverySecond'
+        @param trailing: run after the last call
+        @return:
+        """
+        if func is None:
+            return lambda f: _RunWatcher.runWatcher(f, leading, trailing)
         def watcher(*args):
-            if _RunWatcher._runAfterSecond is None:
-                return func(*args)
-            nonlocal _timer
-            _RunWatcher._queue[_id] = (time(), func, args)
-            if _timer is None:
-                _timer = time()
-                _RunWatcher._queue[_id] = None
-                return _RunWatcher.runFunc(func, args)
-            elif time() - _timer >= _RunWatcher._runEverySecond:
-                _timer = time()
-                _RunWatcher._queue[_id] = None
-                return _RunWatcher.runFunc(func, args)
-            return None
-        _hook = func
+            obj = args[0]
+            timers = obj.__dict__.get("_runWatcherTimers")
+            if timers is None:
+                timers = obj._runWatcherTimers = {}
+            timer = timers.get(func)
+            if timer is None:
+                timer = timers[func] = _WatcherTimer(obj, func, leading, trailing)
+            return timer(args[1:])
         return watcher
 runWatcherDec = _RunWatcher.runWatcher
+class _TclBatch:
+    """
+    Buffers 'configure' and 'place' calls of widgets and sends them to Tcl in a few calls.
+    Later writes to the same widget option override earlier ones.
+    Use 'Tk.batch()' to create.
+    """
+    MAX_COMMANDS = 1000 # commands per Tcl call
+    UNBATCHED_OPTIONS = ("state",) # other calls (insert, delete...) depend on these options
+    # Runs every command of a chunk. A failing command does not stop the others, its index and message are returned.
+    _APPLY_LAMBDA = ("commands", "set errors {}\nset i 0\nforeach command $commands {\n    if {[catch $command msg]} {lappend errors $i $msg}\n    incr i\n}\nreturn $errors")
+    def __init__(self, _master):
+        self._master = _master
+        self._depth = 0
+        self._configure = {} # id(tkWidget) -> (tkWidget, {option:value})
+        self._place = {}     # id(tkWidget) -> (tkWidget, {option:value})
+    def __enter__(self):
+        self._depth += 1
+        if self._depth == 1: self._master._batch = self
+        return self
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._depth -= 1
+        if self._depth: return False
+        self._master._batch = None
+        self.flush()
+        return False
+    def configure(self, widget, name:str, value)->bool:
+        """
+        Buffers one option of a tkinter widget.
+        Returns False if the value has to be applied directly (callables, None, 'state').
+
+        @param widget: tkinter widget
+        @param name: option name
+        @param value: option value
+        @return:
+        """
+        if not hasattr(widget, "_w"): return False
+        entry = self._configure.get(id(widget))
+        if value is None or callable(value) or name in _TclBatch.UNBATCHED_OPTIONS:
+            # applied now -> an older buffered value must not override it on flush.
+            if entry is not None: entry[1].pop(name, None)
+            return False
+        if entry is None:
+            entry = self._configure[id(widget)] = (widget, {})
+        entry[1][name] = value
+        return True
+    def place(self, widget, **kwargs)->bool:
+        """
+        Buffers a 'place configure' call of a tkinter widget.
+
+        @param widget: tkinter widget
+        @param kwargs: place options
+        @return:
+        """
+        if not hasattr(widget, "_w"): return False
+        entry = self._place.get(id(widget))
+        if entry is None:
+            entry = self._place[id(widget)] = (widget, {})
+        for name, value in kwargs.items():
+            if value is not None: entry[1][name] = value
+        return True
+    def discard(self, widget):
+        """
+        Removes all buffered calls of given tkinter widget. Used on destroy.
+
+        @param widget: tkinter widget
+        @return:
+        """
+        self._configure.pop(id(widget), None)
+        self._place.pop(id(widget), None)
+    def forgetPlace(self, widget):
+        """
+        Removes the buffered 'place' call of given tkinter widget. Used on 'placeForget'.
+
+        @param widget: tkinter widget
+        @return:
+        """
+        self._place.pop(id(widget), None)
+    def flush(self):
+        """
+        Sends all buffered calls to Tcl.
+
+        @return:
+        """
+        commands = []
+        for widget, options in self._configure.values():
+            if options: commands.append((widget._w, "configure")+_TclBatch._formatOptions(options))
+        for widget, options in self._place.values():
+            if options: commands.append(("place", "configure", widget._w)+_TclBatch._formatOptions(options))
+        self._configure.clear()
+        self._place.clear()
+        if self._master._destroyed: return
+        tk = self._master._get().tk
+        errors = []
+        for i in range(0, len(commands), _TclBatch.MAX_COMMANDS):
+            chunk = commands[i:i+_TclBatch.MAX_COMMANDS]
+            failed = tk.splitlist(tk.call("apply", _TclBatch._APPLY_LAMBDA, tuple(chunk)))
+            for j in range(0, len(failed), 2):
+                errors.append("\t"+" ".join([str(arg) for arg in chunk[int(failed[j])]])+"\n\tTKError: "+str(failed[j+1]))
+        if errors:
+            raise AttributeError("Could not apply batched widget options!\n"+"\n".join(errors))
+    @staticmethod
+    def _formatOptions(options:dict)->tuple:
+        # tkinter strips a trailing '_' from option names. ('class_', 'in_')
+        args = []
+        for name, value in options.items():
+            args.append("-"+(name[:-1] if name.endswith("_") else name))
+            args.append(value)
+        return tuple(args)
+class _TimerHeap:
+    """
+    Timer queue of a window for all '_TaskScheduler' tasks.
+    The tasks are kept in a heap and only one Tcl 'after' is armed for the earliest deadline.
+    Cancelling only marks the heap entry as stale, it is skipped when due.
+    """
+    def __init__(self, _master):
+        self._master = _master
+        self._heap = []  # (deadline, sequence, task)
+        self._sequence = _count()
+        self._id = None
+        self._armed = None # deadline the Tcl 'after' is armed for
+        self._stale = 0    # cancelled entries still in the heap or in the running drain
+        self._draining = False
+    @staticmethod
+    def get(_master)->"_TimerHeap":
+        root = _master._getTkMaster() if hasattr(_master, "_getTkMaster") else _master
+        heap = getattr(root, "_timerHeap", None)
+        if heap is None:
+            heap = root._timerHeap = _TimerHeap(root)
+        return heap
+    def push(self, task, deadline:float):
+        sequence = next(self._sequence)
+        task._sequence = sequence
+        task._deadline = deadline
+        heappush(self._heap, (deadline, sequence, task))
+        if self._draining: return # '_run' arms once after the drain
+        if self._armed is None or deadline < self._armed: self._arm()
+    def discard(self):
+        self._stale += 1
+        if not self._draining: self._compact()
+    def _compact(self):
+        if self._stale > 1024 and self._stale*2 > len(self._heap):
+            # mostly stale -> rebuild, so the heap does not grow with cancelled tasks
+            self._heap = [entry for entry in self._heap if entry[2]._sequence == entry[1]]
+            heapify(self._heap)
+            self._stale = 0
+    def cancel(self):
+        if self._id is not None:
+            self._master._get().after_cancel(self._id)
+            self._id = None
+            self._armed = None
+    def dropOwner(self, owner):
+        """
+        Cancels all tasks of the window 'owner'.
+        @param owner: Tk/Toplevel
+        """
+        for deadline, sequence, task in self._heap:
+            if task._owner is owner and task._sequence == sequence: task.cancel()
+    def _arm(self):
+        heap = self._heap
+        while heap and heap[0][2]._sequence != heap[0][1]:
+            heappop(heap)
+            self._stale -= 1
+        self.cancel()
+        if not heap or getattr(self._master, "_destroyed", False): return
+        deadline = heap[0][0]
+        self._armed = deadline
+        self._id = self._master._get().after(max(0, ceil((deadline-monotonic())*1000)), self._run)
+    def _run(self):
+        self._id = None
+        self._armed = None
+        if getattr(self._master, "_destroyed", False): return
+        heap = self._heap
+        now = monotonic()
+        # take all due entries first: tasks re-scheduled while running run in the next call, even if already due
+        due = []
+        while heap and heap[0][0] <= now:
+            due.append(heappop(heap))
+        # no arming and no compaction while draining: '_stale' also counts the cancelled entries of 'due'
+        self._draining = True
+        try:
+            for deadline, sequence, task in due:
+                if task._sequence != sequence: # cancelled, also by an earlier task of this call
+                    self._stale -= 1
+                    continue
+                try:
+                    task()
+                except Exception as e:
+                    print(format_exc())
+        finally:
+            self._draining = False
+        self._compact()
+        self._arm()
 class _TaskScheduler:
+    """
+    Runs a function after a delay, optionally repeated.
+    All tasks of a window share one '_TimerHeap' and therefore one Tcl timer.
+    Tasks stop when the window (Tk/Toplevel) of '_master' is destroyed.
+
+    repete: next run 'delay' seconds after the last run has finished
+    dynamic: runs on a fixed 'delay' grid. If a run is late, missed runs are skipped.
+    """
     def __init__(self, _master, delay, func, repete=False, dynamic=False):
         if hasattr(_master, "_get"):
-            self._id = None
             self._master = _master
             self._delay = delay
             self._func = func
             self._repete = repete
             self._dynamic = dynamic
+            self._timers = _TimerHeap.get(_master)
+            self._owner = _master._getTkMaster() if hasattr(_master, "_getTkMaster") else _master
+            self._sequence = None # sequence of the active heap entry
+            self._deadline = None
+            self._active = False
         else:
             raise TKExceptions.InvalidWidgetTypeException("WidgetType must be any 'tkWidget' or 'Tk' not:"+str(type(_master)))
     def __call__(self):
-        f = time()
+        self._sequence = None
         self._func()
-        if self._repete:
-            self._id = self._master._get().after(self._delay*1000 if not self._dynamic else self._delay-(time()-f) if self._delay-(time()-f) > 0 else 0, self)
+        if not self._active or self._sequence is not None: return # cancelled or restarted in func
+        if not self._repete or getattr(self._owner, "_destroyed", False):
+            self._active = False
+            return
+        now = monotonic()
+        if self._dynamic:
+            deadline = self._deadline+self._delay
+            if deadline < now: deadline = now
+        else:
+            deadline = now+self._delay
+        self._timers.push(self, deadline)
     def start(self):
-        self._id = self._master._get().after(int(self._delay*1000), self)
+        if self._sequence is not None: self._timers.discard()
+        self._active = True
+        self._timers.push(self, monotonic()+self._delay)
         return self
     def cancel(self):
-        if self._id is not None: self._master._get().after_cancel(self._id)
+        self._active = False
+        if self._sequence is not None:
+            self._sequence = None
+            self._timers.discard()
+class _Dispatcher:
+    """
+    Queue for calls from other threads which are executed in the Tk mainloop.
+    Appending to the deque is thread safe, so producers never wait for the UI.
+    The drain is only scheduled while calls are queued: a put from the Tk thread arms it with 'after',
+    a put from another thread writes one byte to a socket watched by a Tcl file handler.
+    Each drain has a time budget, leftover calls run in the next tick.
+    Calls with the same key which did not run yet are merged, only the newest one runs.
+    Where Tcl has no file handlers (Windows) the drain polls every 'interval' instead.
+    """
+    def __init__(self, _master, interval=.016, budget=.008):
+        self._master = _master
+        self._queue = _deque()   # (func, args, future) or (None, key, None) for merged calls
+        self._latest = {}        # key -> (func, args) of merged calls
+        self._pending = set()    # keys with an entry in '_queue'
+        self._interval = int(interval*1000)
+        self._budget = budget
+        self._id = None
+        self._lock = _Lock()     # guards '_armed' and '_closed'
+        self._armed = False      # a drain is scheduled or a wakeup byte was sent
+        self._closed = False
+        self._polling = False
+        self._threadId = _getIdent()
+        self._wakeRead = None
+        self._wakeWrite = None
+    def put(self, func, args:tuple, key=None, future:Future=None):
+        if self._closed: raise TKExceptions.InvalidUsageException("The window was destroyed, calls can't be queued anymore!")
+        if key is None:
+            self._queue.append((func, args, future))
+        else:
+            # set the value before checking '_pending', see '_pump'
+            self._latest[key] = (func, args)
+            if key not in self._pending:
+                self._pending.add(key)
+                self._queue.append((None, key, None))
+        self._arm()
+    def start(self):
+        tk = self._master._get().tk
+        if hasattr(tk, "createfilehandler"):
+            self._wakeRead, self._wakeWrite = _socketpair()
+            self._wakeRead.setblocking(False)
+            self._wakeWrite.setblocking(False)
+            tk.createfilehandler(self._wakeRead, _tk.READABLE, self._onWakeup)
+        else:
+            self._polling = True
+            self._armed = True
+            self._id = self._master._get().after(self._interval, self._pump)
+        return self
+    def cancel(self):
+        """
+        Stops the dispatcher. Queued calls are dropped and their futures are cancelled.
+        Later calls of 'put' raise 'InvalidUsageException'.
+        """
+        with self._lock:
+            self._closed = True
+        if self._id is not None:
+            try:
+                self._master._get().after_cancel(self._id)
+            except Exception:
+                pass
+            self._id = None
+        if self._wakeRead is not None:
+            try:
+                self._master._get().tk.deletefilehandler(self._wakeRead)
+            except Exception:
+                pass
+            self._wakeRead.close()
+            self._wakeWrite.close()
+            self._wakeRead = self._wakeWrite = None
+        self._cancelQueued()
+    def _cancelQueued(self):
+        queue = self._queue
+        while queue:
+            try:
+                func, args, future = queue.popleft()
+            except IndexError: # emptied by another thread
+                break
+            if future is not None: future.cancel()
+        self._latest.clear()
+        self._pending.clear()
+    def _arm(self):
+        with self._lock:
+            closed = self._closed
+            if not closed:
+                if self._armed: return
+                self._armed = True
+        if closed:
+            # 'cancel' ran while this call was appended
+            self._cancelQueued()
+            raise TKExceptions.InvalidUsageException("The window was destroyed, calls can't be queued anymore!")
+        if _getIdent() == self._threadId:
+            self._id = self._master._get().after(self._interval, self._pump)
+            return
+        try:
+            self._wakeWrite.send(b"\0")
+        except BlockingIOError: # buffer full -> the Tk thread will wake up anyway
+            pass
+        except (AttributeError, OSError): # closed by 'cancel' meanwhile
+            pass
+    def _onWakeup(self, file, mask):
+        try:
+            while self._wakeRead.recv(4096): pass
+        except (BlockingIOError, OSError):
+            pass
+        # wait one tick so calls from a burst are drained together
+        if self._id is None and not self._closed: self._id = self._master._get().after(self._interval, self._pump)
+    def _pump(self):
+        self._id = None
+        if self._closed or self._master._destroyed: return
+        queue = self._queue
+        end = monotonic()+self._budget
+        while queue:
+            func, args, future = queue.popleft()
+            if func is None:
+                # discard before pop -> a newer value is either run now or queued again
+                self._pending.discard(args)
+                merged = self._latest.pop(args, None)
+                if merged is None: continue
+                func, args = merged
+            if future is not None:
+                if not future.set_running_or_notify_cancel(): continue
+                try:
+                    future.set_result(func(*args))
+                except BaseException as e:
+                    future.set_exception(e)
+            else:
+                try:
+                    func(*args)
+                except Exception as e:
+                    print(format_exc())
+            if monotonic() > end: break
+        if self._closed: return # destroyed by one of the calls
+        with self._lock:
+            if not queue and not self._polling:
+                # producers arm the next drain, see '_arm'
+                self._armed = False
+                return
+        # left over calls run after pending events were handled
+        self._id = self._master._get().after(1 if queue else self._interval, self._pump)
+class _TclSelector(_selectors.DefaultSelector):
+    """
+    Selector of the asyncio loop in 'Tk.runAsync'.
+    Waits in the Tcl notifier instead of the OS, so Tk events are handled while asyncio has nothing to do.
+    Every registered file gets a Tcl file handler and the asyncio timeout becomes a Tcl timer,
+    both wake the notifier. Nothing is polled.
+    Use 'createLoop' to create the asyncio loop.
+    """
+    BUDGET = .008 # seconds of pending Tk events handled per turn while asyncio has ready callbacks
+    def __init__(self, _master):
+        super().__init__()
+        self._master = _master
+        self._tk = _master._get().tk
+        self._woken = False
+        self._loop = None
+    @staticmethod
+    def createLoop(_master)->_asyncio.AbstractEventLoop:
+        selector = _TclSelector(_master)
+        loop = selector._loop = _asyncio.SelectorEventLoop(selector)
+        return loop
+    def register(self, fileobj, events, data=None):
+        key = super().register(fileobj, events, data)
+        self._tk.createfilehandler(key.fd, self._getTclMask(events), self._wake)
+        return key
+    def unregister(self, fileobj):
+        key = super().unregister(fileobj)
+        self._tk.deletefilehandler(key.fd)
+        return key
+    def modify(self, fileobj, events, data=None):
+        key = super().modify(fileobj, events, data)
+        self._tk.createfilehandler(key.fd, self._getTclMask(events), self._wake) # replaces the old handler
+        return key
+    def close(self):
+        map_ = self.get_map()
+        if map_ is not None:
+            for key in list(map_.values()):
+                self._tk.deletefilehandler(key.fd)
+        super().close()
+    def select(self, timeout=None):
+        if self._master._destroyed: return super().select(timeout)
+        tk = self._tk
+        self._woken = False
+        if timeout is not None and timeout <= 0:
+            # asyncio has ready callbacks -> only handle pending Tk events within the budget
+            end = monotonic()+self.BUDGET
+            while not self._woken and not self._master._destroyed and tk.dooneevent(_tkinter.DONT_WAIT):
+                if monotonic() >= end: break
+        else:
+            timer = None if timeout is None else tk.createtimerhandler(max(1, ceil(timeout*1000)), self._wake)
+            while not self._woken and not self._master._destroyed:
+                tk.dooneevent(_tkinter.ALL_EVENTS)
+                # callbacks a Tk handler scheduled on the loop (e.g. tasks of 'async def' handlers) do not wake the notifier
+                if self._loop is not None and self._loop._ready: break
+            if timer is not None: timer.deletetimerhandler()
+        return super().select(0)
+    def _wake(self, *args):
+        self._woken = True
+    @staticmethod
+    def _getTclMask(events:int)->int:
+        mask = 0
+        if events & _selectors.EVENT_READ: mask |= _tk.READABLE
+        if events & _selectors.EVENT_WRITE: mask |= _tk.WRITABLE
+        return mask
+class _AnimationSubscriber:
+    """
+    Function called by '_AnimationClock' every frame.
+    Keeps the time spent per frame.
+    """
+    def __init__(self, clock, func):
+        self._clock = clock
+        self._func = func
+        self._disableArgs = _checkMethod(func)
+        self._calls = 0
+        self._totalTime = 0.
+        self._lastTime = 0.
+    def cancel(self):
+        self._clock._unsubscribe(self)
+    def getStats(self)->dict:
+        """
+        Returns the time spent in this function.
+        @return: {"calls", "totalMillis", "avgMillis", "lastMillis"}
+        """
+        return {"calls":self._calls,
+                "totalMillis":self._totalTime*1000,
+                "avgMillis":self._totalTime*1000/self._calls if self._calls else 0.,
+                "lastMillis":self._lastTime*1000}
+class _AnimationClock:
+    """
+    Shared frame clock of a window.
+    One 'after' per frame calls all subscribers with the seconds since the last frame.
+    Frames which could not run in time are skipped instead of queued.
+    Pauses while the window is hidden or iconified.
+    """
+    PAUSE_CHECK_DELAY = 250 # ms between visibility checks while paused
+    def __init__(self, _master, fps=60):
+        self._master = _master
+        self._frameTime = 1/fps
+        self._subscribers = []
+        self._id = None
+        self._nextFrame = None
+        self._lastFrame = None
+        self._frames = 0
+        self._skipped = 0
+    def setFPS(self, fps:float):
+        assert fps > 0, "fps must be greater than 0!"
+        self._frameTime = 1/fps
+        return self
+    def subscribe(self, func)->_AnimationSubscriber:
+        subscriber = _AnimationSubscriber(self, func)
+        self._subscribers.append(subscriber)
+        if self._id is None:
+            self._nextFrame = self._lastFrame = None
+            self._id = self._master._get().after(1, self._tick)
+        return subscriber
+    def getStats(self)->dict:
+        return {"fps":1/self._frameTime,
+                "frames":self._frames,
+                "skipped":self._skipped,
+                "subscribers":[dict(name=getattr(s._func, "__qualname__", repr(s._func)), **s.getStats()) for s in self._subscribers]}
+    def cancel(self):
+        if self._id is not None:
+            self._master._get().after_cancel(self._id)
+            self._id = None
+    def _unsubscribe(self, subscriber:_AnimationSubscriber):
+        if subscriber in self._subscribers: self._subscribers.remove(subscriber)
+        if not self._subscribers: self.cancel()
+    def _tick(self):
+        self._id = None
+        master = self._master
+        if master._destroyed or not self._subscribers: return
+        if master._get().state() in ("withdrawn", "iconic"):
+            self._nextFrame = self._lastFrame = None # no time jump after showing again
+            self._id = master._get().after(_AnimationClock.PAUSE_CHECK_DELAY, self._tick)
+            return
+        now = monotonic()
+        frameTime = self._frameTime
+        delta = frameTime if self._lastFrame is None else now-self._lastFrame
+        self._lastFrame = now
+        self._frames += 1
+        for subscriber in tuple(self._subscribers):
+            start = monotonic()
+            try:
+                if subscriber._disableArgs:
+                    subscriber._func()
+                else:
+                    subscriber._func(delta)
+            except Exception as e:
+                print(format_exc())
+            subscriber._lastTime = monotonic()-start
+            subscriber._totalTime += subscriber._lastTime
+            subscriber._calls += 1
+        if master._destroyed or not self._subscribers: return
+        # fixed frame grid, frames which are already over are skipped
+        nextFrame = (now if self._nextFrame is None else self._nextFrame)+frameTime
+        now = monotonic()
+        if now > nextFrame:
+            skipped = int((now-nextFrame)/frameTime)+1
+            self._skipped += skipped
+            nextFrame += skipped*frameTime
+        self._nextFrame = nextFrame
+        # at least 1 ms, so pending input events are handled between frames
+        self._id = master._get().after(max(1, int((nextFrame-now)*1000)), self._tick)
 class _IntVar:
     def __init__(self, _master):
         self.index = -1
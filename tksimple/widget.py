@@ -1,12 +1,16 @@
-from random import randint as _randint, choice as _choice
-from typing import Union, Callable, Tuple, List
+from random import randint as _randint
+from bisect import bisect_left
+from typing import Union, Callable, Tuple, List, Sequence
 import tkinter as _tk
 import tkinter.ttk as _ttk
+from tkinter import _stringify
 from tkinter.font import Font as _tk_Font
-from string import ascii_lowercase
+from collections import deque as _deque
+import re as _re
+from datetime import datetime as _date
 from traceback import format_exc
 
-from .util import _lockable, Font, _isinstanceAny, WidgetGroup, _TaskScheduler, _IntVar, remEnum, ifIsNone
+from .util import _lockable, _itemconfigureAll, Font, _isinstanceAny, WidgetGroup, _TaskScheduler, _IntVar, remEnum, ifIsNone
 from .event import _EventHandler, _EventRegistry, Event
 from .const import *
 from .const import _ALLOWED_MENU_PROPERTIES
@@ -31,6 +35,7 @@ class _Widget:
         self._yScrollbar = None
         self._placed = False
         self._destroyed = False
+        self._layoutGeometry = None # last (x, y, width, height) placed by the relative layout
         self._relativePlaceData = {
             "handler":None
         }
@@ -307,9 +312,10 @@ class _Widget:
         self._tkMaster.updateDynamicWidgets(self)
         return self
     # Event Management Methods
-    def bind(self, func:Callable, event:Union[EventType, Key, Mouse, str], args:list=None, priority:int=0, defaultArgs=False, disableArgs=False):
+    def bind(self, func:Callable, event:Union[EventType, Key, Mouse, str], args:list=None, priority:int=0, defaultArgs=False, disableArgs=False, coalesce=False, maxRate:Union[int, float]=None):
         """
         Binds a specific event to the Widget. Runs given function on trigger.
+        Use 'bindEvent' to get the Event instance of the bound function.
 
         @param func: function get called on trigger
         @param event: Event type: EventType _Enum or default tkinter event as string.
@@ -317,24 +323,49 @@ class _Widget:
         @param priority: If several equal events are bound, it's possible to set priorities.
         @param defaultArgs: if True the default tkinter gets passed in bound function instead of Event-instance.
         @param disableArgs: if True no args gets passed.
+        @param coalesce: if True the function is called at most once per idle cycle with the latest event. Use it for high frequency events like MOUSE_MOTION or SIZE_CONFIUGURE.
+        @param maxRate: if set the function is called at most 'maxRate' times per second with the latest event.
         @return:
         """
+        self.bindEvent(func, event, args, priority, defaultArgs, disableArgs, coalesce, maxRate)
+        return self
+    def bindEvent(self, func:Callable, event:Union[EventType, Key, Mouse, str], args:list=None, priority:int=0, defaultArgs=False, disableArgs=False, coalesce=False, maxRate:Union[int, float]=None)->Event:
+        """
+        Same as 'bind' but returns the Event instance.
+        Use 'Event.unbind' or 'Widget.unbind' to remove only this bound function.
+
+        @param func: function get called on trigger
+        @param event: Event type: EventType _Enum or default tkinter event as string.
+        @param args: Additional arguments as List.
+        @param priority: If several equal events are bound, it's possible to set priorities.
+        @param defaultArgs: if True the default tkinter gets passed in bound function instead of Event-instance.
+        @param disableArgs: if True no args gets passed.
+        @param coalesce: if True the function is called at most once per idle cycle with the latest event. Use it for high frequency events like MOUSE_MOTION or SIZE_CONFIUGURE.
+        @param maxRate: if set the function is called at most 'maxRate' times per second with the latest event.
+        @return: Event instance
+        """
         if event == "CANCEL": return
         event = remEnum(event)
         if event.startswith("["):
-            _EventHandler._registerNewCustomEvent(self, func, event, args, priority, defaultArgs=defaultArgs, disableArgs=disableArgs)
-        else:
-            _EventHandler._registerNewEvent(self._child, func, event, args, priority, defaultArgs=defaultArgs, disableArgs=disableArgs)
-        return self
-    def unbind(self, event:Union[EventType, Key, Mouse]):
+            return _EventHandler._registerNewCustomEvent(self, func, event, args, priority, defaultArgs=defaultArgs, disableArgs=disableArgs, coalesce=coalesce, maxRate=maxRate)
+        return _EventHandler._registerNewEvent(self._child, func, event, args, priority, defaultArgs=defaultArgs, disableArgs=disableArgs, coalesce=coalesce, maxRate=maxRate)
+    def unbind(self, event:Union[Event, EventType, Key, Mouse, str]):
         """
-        Unbinds all Events from given EventType.
+        Pass the Event instance returned by 'bindEvent' to remove only this bound function.
+        Pass an EventType to unbind all Events from given EventType.
 
         @param event:
         @return:
         """
-        #self["registry"].unregisterType(event)
-        raise NotImplemented()
+        if isinstance(event, Event):
+            event.unbind()
+            return self
+        event = remEnum(event)
+        if event.startswith("["):
+            self._eventRegistry.unregisterType(event)
+        else:
+            self._child._eventRegistry.unregisterType(event)
+        return self
     def generateEvent(self, event:Union[EventType, Key, Mouse, str]):
         """
         Triggers given event on this widget.
@@ -417,6 +448,7 @@ class _Widget:
                                       "changeY": changeY,
                                       "changeWidth": changeWidth,
                                       "changeHeight": changeHeight}
+        self._layoutGeometry = None
         self._tkMaster._updateDynamicSize(self)
         return self
     def place(self, x=None, y=None, width=None, height=None, anchor:Anchor=Anchor.UP_LEFT):
@@ -445,8 +477,11 @@ class _Widget:
         x = int(round(x, 0))
         y = int(round(y, 0))
         #self._get().place_forget()
-        self._widget.place(x=x, y=y, width=width, height=height, anchor=remEnum(anchor))
+        batch = self._tkMaster._batch
+        if batch is None or not batch.place(self._widget, x=x, y=y, width=width, height=height, anchor=remEnum(anchor)):
+            self._widget.place(x=x, y=y, width=width, height=height, anchor=remEnum(anchor))
         self._placed = True
+        self._layoutGeometry = None
         return self
     def placeForget(self):
         """
@@ -456,6 +491,9 @@ class _Widget:
         @return:
         """
         self._placed = False
+        self._layoutGeometry = None
+        batch = self._tkMaster._batch
+        if batch is not None: batch.forgetPlace(self._widget) # would place it again on flush
         try:
             self._widget.place_forget()
         except Exception as e:
@@ -471,10 +509,12 @@ class _Widget:
         assert not self._destroyed, f"Widget {type(self)} id={self._getID()} is already destroyed!"
         self._eventRegistry.unregisterAll() #TODO need?
         WidgetGroup.removeFromAll(self)
-        if self._toolTip is not None:
+        if self._toolTip is not None and not self._toolTip._destroyed:
             self._toolTip.destroy()
         if hasattr(self._master, "_childWidgets"):
             self._master._childWidgets.remove(self)
+        if self._tkMaster._batch is not None:
+            self._tkMaster._batch.discard(self._widget)
         if self._get() is not None:
             self._get().destroy()
         self._destroyed = True
@@ -527,6 +567,8 @@ class _Widget:
         if self._destroyed: return
         self._widgetProperties[name] = value
         if self._widget is None: return # only capture _widgetProperties for menu
+        batch = self._tkMaster._batch
+        if batch is not None and batch.configure(self._widget, name, value): return
         try:
             self._widget[name] = value
         except Exception as e:
@@ -549,6 +591,8 @@ class _Widget:
 class _ContainerWidget(_Widget):
     def __init__(self, child, widget, master, group, init:dict=None, _instanceOfMenu=False):
         self._childWidgets = []
+        self._layoutChildSize = None # master size the children were laid out with
+        self._layoutDirty = True
         
         super().__init__(child=child,
                          widget=widget,
@@ -557,7 +601,7 @@ class _ContainerWidget(_Widget):
                          init=init,
                          _instanceOfMenu=_instanceOfMenu)
     def destroy(self):
-        for w in self._childWidgets:
+        for w in self._childWidgets.copy():
             w.destroy()
         super().destroy() # destroy self
     def place(self, x=None, y=None, width=None, height=None, anchor:Anchor=Anchor.UP_LEFT):
@@ -645,13 +689,20 @@ class _ToolTip(_Widget):
                          master=_master,
                          group=group)
         
-        self._master.bind(self._enter, "<Enter>")
-        self._master.bind(self._leave, "<Leave>")
-        self._master.bind(self._leave, "<ButtonPress>")
+        self._masterEvents = [
+            self._master.bindEvent(self._enter, "<Enter>"),
+            self._master.bindEvent(self._leave, "<Leave>"),
+            self._master.bindEvent(self._leave, "<ButtonPress>")
+        ]
         if pressShiftForMoreInfo: 
-            self._tkMaster.bind(self._more, "<KeyRelease-Shift_L>", args=["release"])
-            self._tkMaster.bind(self._more, "<KeyPress-Shift_L>", args=["press"])
+            self._masterEvents.append(self._tkMaster.bindEvent(self._more, "<KeyRelease-Shift_L>", args=["release"]))
+            self._masterEvents.append(self._tkMaster.bindEvent(self._more, "<KeyPress-Shift_L>", args=["press"]))
     def destroy(self):
+        self._unschedule()
+        self._hidetip()
+        for event in self._masterEvents:
+            event.unbind()
+        self._masterEvents.clear()
         super().destroy()
 
     def setDisabled(self):
@@ -1321,6 +1372,75 @@ class Entry(_LockableWidget):
             self._widget.xview_scroll(howMany, units)
         elif op == 'moveto':
             self._widget.xview_moveto(howMany)
+class _TextFilter:
+    """
+    Case insensitive substring filter over rows identified by keys.
+    The lowercase text of every row is built once.
+    If the query extends the previous one, only the currently visible rows are searched.
+    """
+    def __init__(self, order:list, texts:dict):
+        self.order = order     # all keys in display order
+        self.texts = texts     # key -> lowercase text
+        self.visible = order.copy()
+        self.query = ""
+    def setQuery(self, query:str)->Tuple[List[int], List[int]]:
+        """
+        Sets a new query.
+
+        @param query:
+        @return: (positions of the removed keys in the old visible list, positions of the added keys in the new visible list)
+        """
+        query = query.lower()
+        texts = self.texts
+        old = self.visible
+        if self.query in query: # narrow down -> only visible rows can match
+            removed = [i for i, key in enumerate(old) if query not in texts[key]]
+            if removed:
+                gone = set(removed)
+                self.visible = [key for i, key in enumerate(old) if i not in gone]
+            self.query = query
+            return removed, []
+        visible = [key for key in self.order if query in texts[key]]
+        shown = set(visible)
+        removed = [i for i, key in enumerate(old) if key not in shown]
+        shown = set(old)
+        added = [i for i, key in enumerate(visible) if key not in shown]
+        self.visible = visible
+        self.query = query
+        return removed, added
+    def append(self, keys:list, texts:list)->List[bool]:
+        """
+        Appends rows at the end.
+
+        @param keys:
+        @param texts: text per key
+        @return: True for every row matching the query
+        """
+        matches = []
+        for key, text in zip(keys, texts):
+            text = text.lower()
+            self.texts[key] = text
+            self.order.append(key)
+            match = self.query in text
+            if match: self.visible.append(key)
+            matches.append(match)
+        return matches
+    def remove(self, key):
+        self.order.remove(key)
+        self.texts.pop(key, None)
+        if key in self.visible: self.visible.remove(key)
+    @staticmethod
+    def getRanges(positions:List[int])->List[Tuple[int, int]]:
+        """
+        Groups ascending positions into (first, last) ranges.
+        """
+        ranges = []
+        for pos in positions:
+            if ranges and ranges[-1][1] == pos-1:
+                ranges[-1][1] = pos
+            else:
+                ranges.append([pos, pos])
+        return [tuple(r) for r in ranges]
 class Listbox(_Widget):
     """
     Widget:
@@ -1328,6 +1448,7 @@ class Listbox(_Widget):
     A Scrollbar can also be added.
 
     """
+    _FILTER_MAX_RANGES = 64 # more changed ranges per filter update -> rebuild all items
     def __init__(self, _master, group:WidgetGroup =None):
         if not _isinstanceAny(_master, Tk, NotebookTab, "Canvas", Frame, LabelFrame):
             raise TKExceptions.InvalidWidgetTypeException("_master must be "+str(self.__class__.__name__)+" or Tk instance not: "+str(_master.__class__.__name__))
@@ -1335,6 +1456,12 @@ class Listbox(_Widget):
         self._selectionMode = "single"
         self._defaultColor = Color.DEFAULT.value
         self._yScrollbar = None
+        self._slots = []       # python side mirror of all items
+        self._nameIndex = {}   # item -> list of indices, rebuilt lazily if None
+        self._filter = None       # _TextFilter over all items while a filter is set
+        self._filterRows = None   # filter key -> item
+        self._filterColors = None # filter key -> background color (only colored items)
+        self._filterKey = 0
 
         super().__init__(child=self,
                          widget=_tk.Listbox(_master._get()),
@@ -1449,53 +1576,70 @@ class Listbox(_Widget):
         @param color: Background color of this item.
         @return:
         """
+        if self._filter is not None: return self.addAll([entry], index, color)
         color = ifIsNone(remEnum(color), self._defaultColor)
-        self._widget.insert(index, str(entry))
-        index = (self.length()-1 if index=="end" else index)
-        if self.length() > 0:
-            self.setSlotBg(index, color)
+        entry = str(entry)
+        index = self._getSlotIndex(index, insert=True)
+        self._widget.insert(index, entry)
+        self._insertSlots(index, [entry])
+        self.setSlotBg(index, color)
         return self
-    def addAll(self, entry:List[str], index:str="end", color:Union[Color, str]=None):
+    def addAll(self, entry:List[str], index:str="end", color:Union[Color, str]=None, colors:Union[List[Union[Color, str]], Callable]=None):
         """
         Adds a list of entrys to the Listbox.
         When adding large amounts of items this is way faster than 'add' method and a for loop.
         @param entry: entry content as string
         @param index: where to insert. At the end by default.
-        @param color: Background color of this item.
+        @param color: Background color of these items.
+        @param colors: Background color per item. List of colors or function(entry) -> color. Overrides 'color'.
         @return:
         """
-        length = self.length()
         color = ifIsNone(remEnum(color), self._defaultColor)
+        entry = [e if isinstance(e, str) else str(e) for e in entry]
+        if self._filter is not None:
+            if index == "end": return self._addFiltered(entry, color, colors)
+            self.clearFilter()
+        index = self._getSlotIndex(index, insert=True)
         self._widget.insert(index, *entry)
-        if color != Color.DEFAULT and False:
-            for i in range(length-1, self.length()-1): # TODO TEST
-                self.setSlotBg(i, color)
-            self.updateIdleTasks()
+        self._insertSlots(index, entry)
+        if colors is not None:
+            self._applySlotColors(index, entry, colors)
+        elif color != Color.DEFAULT.value:
+            self._applySlotColors(index, entry, [color]*len(entry))
         return self
     def length(self)->int:
         """
         Returns the amount of items in Listbox.
         @return:
         """
-        return self._widget.size()
+        return len(self._slots)
     def clear(self):
         """
         Removes all items from Listbox.
         @return:
         """
         self._widget.delete(0, _tk.END)
+        self._slots = []
+        self._nameIndex = {}
+        self._filter = self._filterRows = self._filterColors = None
         return self
     def setSlotBgAll(self, color:Union[Color, str]=None):
         """
         Set the Backgroundcolor of all slots.
-        This can be slow.
-        Better is to set the color while adding.
         @param color:
         @return:
         """
         color = ifIsNone(remEnum(color), self._defaultColor)
-        for i in self.getAllSlotIndexes():
-            self.setSlotBg(i, color)
+        self._applySlotColors(0, self._slots, [color]*len(self._slots))
+        return self
+    def setSlotBgs(self, colors:Union[List[Union[Color, str]], Callable], start:int=0):
+        """
+        Set the Backgroundcolor of many slots in one Tcl call.
+        @param colors: List of colors beginning at 'start' or function(entry) -> color for all slots from 'start'.
+        @param start: index of the first slot
+        @return:
+        """
+        self._applySlotColors(start, self._slots[start:] if callable(colors) else self._slots[start:start+len(colors)], colors)
         return self
     def setSlotBg(self, index:int, color:Union[Color, str] = None):
         """
@@ -1505,7 +1649,9 @@ class Listbox(_Widget):
         @return:
         """
         color = ifIsNone(remEnum(color), self._defaultColor)
+        index = self._getSlotIndex(index)
         self._widget.itemconfig(index, bg=color)
+        if self._filter is not None: self._filterColors[self._filter.visible[index]] = color
         return self
     def setItemSelectedByIndex(self, index:int, clearFirst=True):
         """
@@ -1525,8 +1671,9 @@ class Listbox(_Widget):
         @return:
         """
         if clearFirst: self._widget.selection_clear(0, "end")
-        if name in self.getAllSlots():
-            self.setItemSelectedByIndex(self.getAllSlots().index(name))
+        indices = self._getNameIndex().get(name)
+        if indices:
+            self.setItemSelectedByIndex(indices[0], clearFirst=False)
         return self
     def deleteItemByIndex(self, index:int):
         """
@@ -1534,7 +1681,14 @@ class Listbox(_Widget):
         @param index:
         @return:
         """
+        index = self._getSlotIndex(index)
         self._widget.delete(index)
+        self._deleteSlot(index)
+        if self._filter is not None:
+            key = self._filter.visible[index]
+            self._filter.remove(key)
+            self._filterRows.pop(key)
+            self._filterColors.pop(key, None)
         return self
     def deleteItemByName(self, name):
         """
@@ -1542,21 +1696,23 @@ class Listbox(_Widget):
         @param name:
         @return:
         """
-        self.deleteItemByIndex(self.getAllSlots().index(name))
+        self.deleteItemByIndex(self.getIndexByName(name))
     def getIndexByName(self, name:str):
         """
         Returns the (first) index by given name.
         @param name:
         @return:
         """
-        return self.getAllSlots().index(name)
+        indices = self._getNameIndex().get(name)
+        if not indices: raise ValueError(f"{name!r} is not in {self.__class__.__name__}")
+        return indices[0]
     def getNameByIndex(self, index:int):
         """
         Returns the name by given index.
         @param index: 
         @return: 
         """
-        return self.getAllSlots()[index]
+        return self._slots[index]
     def getSelectedIndex(self)->Union[list, int, None]:
         """
         Returns selected index/indices.
@@ -1593,7 +1749,7 @@ class Listbox(_Widget):
         Returns a list containing all items.
         @return:
         """
-        return [self._widget.get(i) for i in range(self.length())]
+        return self._slots.copy()
     def onSelectEvent(self, func, args:list=None, priority:int=0, defaultArgs=False, disableArgs=False):
         """
         Binds on select event to the Widget. Runs given function on trigger.
@@ -1606,15 +1762,569 @@ class Listbox(_Widget):
         @return:
         """
         _EventHandler._registerNewEvent(self, func, EventType.LISTBOX_SELECT, args, priority, defaultArgs=defaultArgs, disableArgs=disableArgs, decryptValueFunc=self._decryptEvent)
+    def setFilter(self, query:str):
+        """
+        Shows only the items containing 'query' (case insensitive).
+        The lowercase text of all items is indexed once when the first filter is set.
+        If the query extends the last one only the shown items are searched.
+        Only the ranges of items which changed get deleted or inserted.
+        While a filter is set, all index based methods refer to the shown items.
+        An empty query shows everything again but keeps the index, 'clearFilter' removes it.
+
+        @param query:
+        @return:
+        """
+        query = str(query)
+        if self._filter is None:
+            if query == "": return self
+            keys = list(range(len(self._slots)))
+            self._filterRows = dict(zip(keys, self._slots))
+            self._filterColors = self._getSlotColors()
+            self._filterKey = len(keys)
+            self._filter = _TextFilter(keys, {key:entry.lower() for key, entry in zip(keys, self._slots)})
+        self._applyFilter(query)
+        return self
+    def clearFilter(self):
+        """
+        Removes the filter and its index and shows all items again.
+        @return:
+        """
+        if self._filter is None: return self
+        self._applyFilter("")
+        self._filter = self._filterRows = self._filterColors = None
+        return self
+    def getFilter(self)->str:
+        """
+        Returns the current filter query. Empty string if no filter is set.
+        @return:
+        """
+        return "" if self._filter is None else self._filter.query
+    def _applyFilter(self, query:str):
+        filter_ = self._filter
+        old = filter_.visible
+        removed, added = filter_.setQuery(query)
+        if not removed and not added: return
+        visible = filter_.visible
+        rows = self._filterRows
+        widget = self._widget
+        removedRanges = _TextFilter.getRanges(removed)
+        addedRanges = _TextFilter.getRanges(added)
+        if len(removedRanges)+len(addedRanges) > self._FILTER_MAX_RANGES:
+            # scattered changes -> rebuilding is cheaper than many deletes/inserts
+            widget.delete(0, "end")
+            if visible: widget.insert("end", *[rows[key] for key in visible])
+            recolor = range(len(visible))
+        else:
+            for first, last in reversed(removedRanges): widget.delete(first, last)
+            for first, last in addedRanges: widget.insert(first, *[rows[visible[i]] for i in range(first, last+1)])
+            recolor = added
+        colors = self._filterColors
+        if colors:
+            _itemconfigureAll(widget, [(i, colors[visible[i]]) for i in recolor if visible[i] in colors])
+        self._slots = [rows[key] for key in visible]
+        self._nameIndex = None
+    def _addFiltered(self, entries:List[str], color:str, colors):
+        filter_ = self._filter
+        if callable(colors):
+            colors = [colors(entry) for entry in entries]
+        elif colors is None:
+            colors = [None if color == Color.DEFAULT.value else color]*len(entries)
+        colors = [remEnum(c) for c in colors[:len(entries)]]+[None]*(len(entries)-len(colors))
+        keys = list(range(self._filterKey, self._filterKey+len(entries)))
+        self._filterKey += len(entries)
+        self._filterRows.update(zip(keys, entries))
+        self._filterColors.update([(key, c) for key, c in zip(keys, colors) if c is not None])
+        matches = filter_.append(keys, entries)
+        shown = [entry for entry, match in zip(entries, matches) if match]
+        if not shown: return self
+        index = len(self._slots)
+        self._widget.insert(index, *shown)
+        self._insertSlots(index, shown)
+        if self._filterColors:
+            self._applySlotColors(index, shown, [c for c, match in zip(colors, matches) if match])
+        return self
+    def _getSlotColors(self)->dict:
+        """
+        Reads the background colors of all items which have one with one Tcl call.
+        @return: index -> color
+        """
+        result = self._widget.tk.splitlist(self._widget.tk.eval(
+            "apply {{w} {set r {}; set n [$w size]; for {set i 0} {$i < $n} {incr i} {set c [$w itemcget $i -background]; if {$c ne {}} {lappend r $i $c}}; return $r}} "+_stringify(self._widget._w)))
+        return {int(result[i]):result[i+1] for i in range(0, len(result), 2)}
     def _decryptEvent(self, args, event):
         try:
             w = args.widget
             if self._selectionMode == "single":
-                return w.get(int(w.curselection()[0]))
+                return self._slots[int(w.curselection()[0])]
             else:
-                return [w.get(int(i)) for i in w.curselection()]
+                return [self._slots[int(i)] for i in w.curselection()]
         except Exception as e:
             return "CANCEL"
+    def _applySlotColors(self, start:int, entries:List[str], colors:Union[list, Callable]):
+        """
+        Configures the background of all given slots with one 'tk.eval' script.
+        None as color leaves the slot unchanged.
+
+        @param start: index of the first entry
+        @param entries: entries beginning at 'start'
+        @param colors: list of colors or function(entry) -> color
+        @return:
+        """
+        if callable(colors):
+            colors = [colors(entry) for entry in entries]
+        if self._filter is not None:
+            visible = self._filter.visible
+            for i, c in enumerate(colors[:len(entries)], start):
+                if c is not None: self._filterColors[visible[i]] = remEnum(c)
+        _itemconfigureAll(self._widget, enumerate(colors[:len(entries)], start))
+    def _getSlotIndex(self, index, insert=False)->int:
+        """
+        Converts a tkinter index into an int index of the python side mirror.
+
+        Negative ints count from the end. Raises IndexError if the item does not exist.
+
+        @param index: int or tkinter index ('end', 'active', 'anchor', '@x,y')
+        @param insert: 'end' means behind the last item. Out of range indices are clamped.
+        @return:
+        """
+        length = len(self._slots)
+        if index == "end":
+            index = length if insert else length-1
+        elif not isinstance(index, int):
+            index = int(self._widget.index(index))
+        elif index < 0:
+            index += length
+        if insert: # like 'list.insert'
+            return max(0, min(index, length))
+        if not 0 <= index < length:
+            raise IndexError(f"{self.__class__.__name__} index out of range")
+        return index
+    def _insertSlots(self, index:int, entries:List[str]):
+        """
+        Inserts entries into the python side mirror.
+        Appending keeps the name index, other inserts invalidate it.
+
+        @param index: index of the first inserted entry
+        @param entries:
+        @return:
+        """
+        length = len(self._slots)
+        if index == length:
+            self._slots.extend(entries)
+            if self._nameIndex is not None:
+                for i, entry in enumerate(entries, length):
+                    indices = self._nameIndex.get(entry)
+                    if indices is None:
+                        self._nameIndex[entry] = [i]
+                    else:
+                        indices.append(i)
+        else:
+            self._slots[index:index] = entries
+            self._nameIndex = None
+    def _deleteSlot(self, index:int):
+        """
+        Removes one entry from the python side mirror.
+        The name index is updated in place. Only the indices behind 'index' are shifted.
+
+        @param index:
+        @return:
+        """
+        entry = self._slots.pop(index)
+        nameIndex = self._nameIndex
+        if nameIndex is None: return
+        indices = nameIndex[entry]
+        indices.remove(index)
+        if not indices: del nameIndex[entry]
+        slots = self._slots
+        for i in range(index, len(slots)):
+            indices = nameIndex[slots[i]]
+            indices[bisect_left(indices, i+1)] = i
+    def _getNameIndex(self)->dict:
+        if self._nameIndex is None:
+            nameIndex = {}
+            for i, entry in enumerate(self._slots):
+                indices = nameIndex.get(entry)
+                if indices is None:
+                    nameIndex[entry] = [i]
+                else:
+                    indices.append(i)
+            self._nameIndex = nameIndex
+        return self._nameIndex
+class VirtualListbox(_Widget):
+    """
+    Widget:
+    Listbox backed by a Python sequence.
+    Only the visible rows are inserted into the tkinter Listbox.
+    Scrolling, selection and events use the indices of the data sequence.
+
+    Use 'refresh' after changing the sequence from outside.
+    """
+    _SCROLL_UNITS = 3 # rows per mouse wheel step
+    def __init__(self, _master, data:Sequence=None, group:WidgetGroup =None):
+        if not _isinstanceAny(_master, Tk, NotebookTab, "Canvas", Frame, LabelFrame):
+            raise TKExceptions.InvalidWidgetTypeException("_master must be "+str(self.__class__.__name__)+" or Tk instance not: "+str(_master.__class__.__name__))
+
+        self._data = [] if data is None else data
+        self._offset = 0         # data index of the first visible row
+        self._rows = 1           # amount of materialized rows
+        self._rowsPartial = False # last row is only partially visible
+        self._selected = set()   # selected data indices
+        self._anchor = None      # last selected data index (keyboard navigation)
+        self._rowColors = None   # list of colors per data index or function(item) -> color
+        self._selectionMode = "single"
+        self._yScrollbar = None
+
+        super().__init__(child=self,
+                         widget=_tk.Listbox(_master._get()),
+                         master=_master,
+                         group=group,
+                         init={"selectmode":"single", "exportselection":False, "activestyle":"none"})
+
+        # internal bindings on an own bindtag: placed behind the widget tag (user events first)
+        # and in front of the 'Listbox' class tag, which can be skipped by returning 'break'.
+        self._bindTag = "VirtualListbox"+str(id(self))
+        tags = self._widget.bindtags()
+        self._widget.bindtags(tags[:1] + (self._bindTag,) + tags[1:])
+        self._internalEvents = {
+            "<Configure>":self._onConfigure,
+            "<<ListboxSelect>>":lambda e: self._syncSelection(),
+            "<MouseWheel>":lambda e: self._scrollWheel(-1 if e.delta > 0 else 1),
+            "<Button-4>":lambda e: self._scrollWheel(-1),
+            "<Button-5>":lambda e: self._scrollWheel(1),
+            "<Up>":lambda e: self._moveSelection(-1),
+            "<Down>":lambda e: self._moveSelection(1),
+            "<Prior>":lambda e: self._moveSelection(-self._rows),
+            "<Next>":lambda e: self._moveSelection(self._rows),
+        }
+        for sequence, func in self._internalEvents.items():
+            self._widget.bind_class(self._bindTag, sequence, func)
+    def setData(self, data:Sequence):
+        """
+        Sets the sequence which is displayed.
+        The sequence is not copied. Call 'refresh' after changing it.
+        The selection is cleared.
+
+        @param data: list, tuple or any object supporting 'len' and index access.
+        @return:
+        """
+        self._data = data
+        self._offset = 0
+        self._selected.clear()
+        self._anchor = None
+        self._render()
+        return self
+    def setRowColors(self, colors:Union[Sequence, Callable, None]):
+        """
+        Sets the background color per row.
+        Only the visible rows are configured, on every scroll with one Tcl call.
+
+        @param colors: Sequence of colors parallel to the data, function(item) -> color or None to remove.
+        @return:
+        """
+        self._rowColors = colors
+        self._render()
+        return self
+    def getData(self)->Sequence:
+        """
+        Returns the backing sequence.
+        @return:
+        """
+        return self._data
+    def refresh(self):
+        """
+        Redraws the visible rows.
+        Call this after the backing sequence has changed.
+        Selected indices outside the data are removed.
+
+        @return:
+        """
+        length = len(self._data)
+        self._selected = {i for i in self._selected if i < length}
+        self._render()
+        return self
+    def add(self, entry):
+        """
+        Appends an entry to the backing sequence.
+        The sequence must be mutable.
+
+        @param entry:
+        @return:
+        """
+        self._getMutableData().append(entry)
+        self._render()
+        return self
+    def addAll(self, entries:Sequence):
+        """
+        Appends entries to the backing sequence.
+        The sequence must be mutable.
+
+        @param entries:
+        @return:
+        """
+        self._getMutableData().extend(entries)
+        self._render()
+        return self
+    def clear(self):
+        """
+        Removes all items. The backing sequence is replaced by a new list.
+        @return:
+        """
+        return self.setData([])
+    def length(self)->int:
+        """
+        Returns the amount of items in the backing sequence.
+        @return:
+        """
+        return len(self._data)
+    def see(self, index:Union[int, str]):
+        """
+        Scrolls the minimum amount so that the item at given data index is visible.
+        'end' for scroll to end.
+        @param index:
+        @return:
+        """
+        if index == "end": index = len(self._data)-1
+        if index < self._offset:
+            self.scrollTo(index)
+        elif index >= self._offset + self._getFullRows():
+            self.scrollTo(index - self._getFullRows() + 1)
+        return self
+    def scrollTo(self, index:int):
+        """
+        Scrolls the item at given data index to the top.
+        @param index:
+        @return:
+        """
+        offset = max(0, min(int(index), len(self._data) - self._getFullRows()))
+        if offset != self._offset:
+            self._offset = offset
+            self._render()
+        return self
+    def getFirstVisibleIndex(self)->int:
+        """
+        Returns the data index of the first visible row.
+        @return:
+        """
+        return self._offset
+    def setSelectForeGroundColor(self, c:Union[Color, str]):
+        """
+        Foregroundcolor applied if item is selected.
+        @param c:
+        @return:
+        """
+        self._setAttribute("selectforeground", remEnum(c))
+        return self
+    def setSelectBackGroundColor(self, c:Union[Color, str]):
+        """
+        Backgroundcolor applied if item is selected.
+        @param c:
+        @return:
+        """
+        self._setAttribute("selectbackground", remEnum(c))
+        return self
+    def attachVerticalScrollBar(self, sc:ScrollBar):
+        """
+        Used to attach a vertical scrollbar.
+        The scrollbar is mapped onto the whole data sequence.
+        @param sc:
+        @return:
+        """
+        self._yScrollbar = sc
+        sc._setAttribute("orient", _tk.VERTICAL)
+        sc._setAttribute("command", self._yview)
+        self._updateScrollbar()
+        return self
+    def setMultipleSelect(self):
+        """
+        Set the Listbox in 'multiselectmode'.
+        The User can select more than one item.
+        @return:
+        """
+        self._setAttribute("selectmode", "multiple")
+        self._selectionMode = "multiple"
+        return self
+    def setSingleSelect(self):
+        """
+        Set the Listbox in 'singleselectmode'.
+        The User can select only one item.
+        This is the DEFAULT mode.
+        @return:
+        """
+        self._setAttribute("selectmode", "single")
+        self._selectionMode = "single"
+        if len(self._selected) > 1:
+            self._selected = {self._anchor} if self._anchor in self._selected else set()
+            self._renderSelection()
+        return self
+    def clearSelection(self):
+        """
+        Clears the selection.
+        @return:
+        """
+        self._selected.clear()
+        self._widget.selection_clear(0, "end")
+        return self
+    def setItemSelectedByIndex(self, index:int, clearFirst=True):
+        """
+        Set an item selected by given data index.
+        @param index:
+        @param clearFirst: clears the old selection before setting the new.
+        @return:
+        """
+        if clearFirst or self._selectionMode == "single": self._selected.clear()
+        self._selected.add(index)
+        self._anchor = index
+        self._renderSelection()
+        return self
+    def getNameByIndex(self, index:int):
+        """
+        Returns the item by given data index.
+        @param index:
+        @return:
+        """
+        return self._data[index]
+    def getIndexByName(self, name):
+        """
+        Returns the (first) data index by given name.
+        @param name:
+        @return:
+        """
+        return self._data.index(name)
+    def getAllSlots(self)->list:
+        """
+        Returns a list containing all items.
+        @return:
+        """
+        return list(self._data)
+    def getSelectedIndex(self)->Union[list, int, None]:
+        """
+        Returns selected data index/indices.
+        If selectionmode is 'single' -> returns int / None
+        If selectionmode is 'multiple' -> returns list / None
+        @return:
+        """
+        if not self._selected: return None
+        if self._selectionMode == "single":
+            return next(iter(self._selected))
+        return sorted(self._selected)
+    def getSelectedItem(self):
+        """
+        Returns selected item/items.
+        If selectionmode is 'single' -> returns item / None
+        If selectionmode is 'multiple' -> returns list / None
+        @return:
+        """
+        index = self.getSelectedIndex()
+        if index is None: return None
+        if type(index) == int:
+            return self._data[index]
+        return [self._data[i] for i in index]
+    def onSelectEvent(self, func, args:list=None, priority:int=0, defaultArgs=False, disableArgs=False):
+        """
+        Binds on select event to the Widget. Runs given function on trigger.
+        The event value is the selected item (single) or a list of items (multiple).
+
+        @param func: function get called on trigger
+        @param args: Additional arguments as List.
+        @param priority: If several equal events are bound, it's possible to set priorities.
+        @param defaultArgs: if True the default tkinter gets passed in bound function instead of Event-instance.
+        @param disableArgs: if True no args gets passed.
+        @return:
+        """
+        _EventHandler._registerNewEvent(self, func, EventType.LISTBOX_SELECT, args, priority, defaultArgs=defaultArgs, disableArgs=disableArgs, decryptValueFunc=self._decryptEvent)
+    def destroy(self):
+        for sequence in self._internalEvents.keys():
+            self._widget.unbind_class(self._bindTag, sequence)
+        return super().destroy()
+    def _decryptEvent(self, args, event):
+        # widget bindings run before the internal bindtag -> sync here.
+        self._syncSelection()
+        item = self.getSelectedItem()
+        return "CANCEL" if item is None else item
+    def _getMutableData(self):
+        if not hasattr(self._data, "append"):
+            raise TKExceptions.InvalidUsageException("The data of "+str(self.__class__.__name__)+" is not mutable: "+str(type(self._data)))
+        return self._data
+    def _getFullRows(self)->int:
+        return max(1, self._rows - 1) if self._rows > 1 and self._rowsPartial else self._rows
+    def _onConfigure(self, e):
+        height = e.height - 2*(int(self._widget.cget("borderwidth")) + int(self._widget.cget("highlightthickness")))
+        lineHeight = int(self._widget.tk.call("font", "metrics", self._widget.cget("font"), "-linespace")) + 1 + 2*int(self._widget.cget("selectborderwidth"))
+        rows, rest = divmod(max(height, lineHeight), lineHeight)
+        self._rowsPartial = rest > 0
+        rows += 1 if rest else 0
+        if rows != self._rows:
+            self._rows = rows
+            self._render()
+    def _render(self):
+        """
+        Inserts the visible rows of the data into the tkinter Listbox. O(visible rows)
+        """
+        length = len(self._data)
+        self._offset = max(0, min(self._offset, length - self._getFullRows()))
+        end = min(self._offset + self._rows, length)
+        self._widget.delete(0, "end")
+        if end > self._offset:
+            self._widget.insert(0, *[str(self._data[i]) for i in range(self._offset, end)])
+            if self._rowColors is not None: self._renderColors(end)
+        self._renderSelection()
+        self._updateScrollbar()
+    def _renderColors(self, end:int):
+        colors = self._rowColors
+        if callable(colors):
+            colors = [colors(self._data[i]) for i in range(self._offset, end)]
+        else:
+            colors = [colors[i] if i < len(colors) else None for i in range(self._offset, end)]
+        _itemconfigureAll(self._widget, enumerate(colors))
+    def _renderSelection(self):
+        self._widget.selection_clear(0, "end")
+        if not self._selected: return
+        data = self._data
+        for i in range(self._offset, min(self._offset + self._rows, len(data))):
+            if i in self._selected:
+                self._widget.selection_set(i - self._offset)
+    def _syncSelection(self):
+        """
+        Takes the tkinter selection of the visible rows into the data selection.
+        """
+        current = {self._offset + int(i) for i in self._widget.curselection()}
+        if self._selectionMode == "single":
+            if current:
+                self._selected = current
+                self._anchor = next(iter(current))
+            return
+        visible = range(self._offset, self._offset + self._rows)
+        self._selected = {i for i in self._selected if i not in visible} | current
+    def _updateScrollbar(self):
+        if self._yScrollbar is None: return
+        length = len(self._data)
+        if length == 0:
+            self._yScrollbar.set(0, 1)
+        else:
+            self._yScrollbar.set(self._offset / length, min(1, (self._offset + self._getFullRows()) / length))
+    def _yview(self, *args):
+        # scrollbar command: ('moveto', fraction) or ('scroll', number, 'units'|'pages')
+        if args[0] == "moveto":
+            self.scrollTo(int(float(args[1]) * len(self._data)))
+        elif args[0] == "scroll":
+            step = self._getFullRows() if args[2] == "pages" else 1
+            self.scrollTo(self._offset + int(args[1]) * step)
+    def _scrollWheel(self, direction:int):
+        self.scrollTo(self._offset + direction * VirtualListbox._SCROLL_UNITS)
+        return "break"
+    def _moveSelection(self, step:int):
+        if not len(self._data): return "break"
+        index = self._anchor
+        index = 0 if index is None else max(0, min(index + step, len(self._data)-1))
+        if self._selectionMode == "single":
+            self.setItemSelectedByIndex(index)
+            self.see(index)
+            self._widget.event_generate("<<ListboxSelect>>")
+        else: # multiple: only move the active row, space selects
+            self._anchor = index
+            self.see(index)
+            self._widget.activate(index - self._offset)
+        return "break"
 class Scale(_Widget):
     """
     Widget:
@@ -1863,12 +2573,32 @@ class Text(_LockableWidget):
     Text widget can be made read only.
     Colors and font can be changed individually.
     """
+    _STRF_COLORS = {'D':Color.DEFAULT,
+                    'W':Color.WHITE,
+                    'B':Color.BLACK,
+                    'r':Color.RED,
+                    'g':Color.GREEN,
+                    'b':Color.BLUE,
+                    'c':Color.CYAN,
+                    'y':Color.YELLOW,
+                    'm':Color.MAGENTA,
+                    'o':Color.ORANGE}
     def __init__(self, _master, group:WidgetGroup =None, readOnly=False):
         if not _isinstanceAny(_master, Tk, NotebookTab, "Canvas", Frame, LabelFrame):
             raise TKExceptions.InvalidWidgetTypeException("_master must be "+str(self.__class__.__name__)+" or Tk instance not: "+str(_master.__class__.__name__))
         
         self._autoScroll = False
         self._tagCounter = 0
+        self._strfTags = set()   # color codes with a configured 'strf_<code>' tag
+        self._logQueue = None    # deque of (text, tags) while log mode is enabled
+        self._logMaxLines = None
+        self._logFlushDelay = 16 # ms
+        self._logFlushId = None
+        self._highlightRules = []    # (compiled regex | function(line) -> spans, tag)
+        self._highlightTags = set()  # tags created by 'addHighlightRule', deleted on clear
+        self._highlightBound = False
+        self._highlightLookahead = 1 # lines re-tagged around the cursor
+        self._highlightLineCount = 1
         
         self._setReadOnly(readOnly)
         
@@ -1886,6 +2616,146 @@ class Text(_LockableWidget):
         if not text.endswith("\n"): text = text+"\n"
         self.addText(text, tags)
         return self
+    def setLogMode(self, maxLines:int=10000, flushDelay:float=.016):
+        """
+        Streaming mode for live logs.
+        Lines added with 'log' are queued and inserted once per 'flushDelay' with one Tcl call.
+        Only the newest 'maxLines' lines are kept, older lines are deleted in one step per flush.
+        If auto scroll is enabled, the Text scrolls once per flush.
+        @param maxLines: maximum amount of lines. None for unlimited.
+        @param flushDelay: seconds between two flushes. Default is about one frame.
+        @return:
+        """
+        self._logMaxLines = maxLines
+        self._logFlushDelay = max(1, int(flushDelay*1000))
+        if self._logQueue is None:
+            self._logQueue = _deque()
+            self._logFlushId = self._widget.after(self._logFlushDelay, self._flushLog)
+        return self
+    def setNormalMode(self):
+        """
+        Disables the log mode.
+        Queued lines are inserted immediately.
+        @return:
+        """
+        if self._logQueue is None: return self
+        if self._logFlushId is not None:
+            self._widget.after_cancel(self._logFlushId)
+            self._logFlushId = None
+        self._flushLog(reschedule=False)
+        self._logQueue = None
+        self._logMaxLines = None
+        return self
+    def log(self, text:str, tags:str | tuple=None):
+        """
+        Adds a line in log mode.
+        Can be called from any thread, the line is inserted on the next flush.
+        If the log mode is disabled, the line is added immediately (like 'addLine').
+        @param text:
+        @param tags:
+        @return:
+        """
+        text = str(text)
+        if not text.endswith("\n"): text = text+"\n"
+        queue = self._logQueue
+        if queue is None:
+            return self.addText(text, tags)
+        queue.append((text, tags))
+        return self
+    def destroy(self):
+        """
+        Destroys this widget.
+        A pending log flush is cancelled.
+        @return:
+        """
+        if self._logFlushId is not None:
+            self._widget.after_cancel(self._logFlushId)
+            self._logFlushId = None
+        self._logQueue = None
+        return super().destroy()
+    def addHighlightRule(self, rule:Union[str, _re.Pattern, Callable], fg:Union[Color, str]=None, bg:Union[Color, str]=None, tag:str=None):
+        """
+        Adds a syntax highlighting rule.
+        Rules are applied line by line:
+            regex (str or compiled) -> every match gets tagged
+            function(line) -> iterable of (start, end) columns to tag
+        Typed text only re-tags the lines around the cursor (see 'setHighlightLookahead'),
+        added text only re-tags the new lines.
+        Rules added later have a higher priority.
+
+        @param rule:
+        @param fg: foreground color of the matches
+        @param bg: background color of the matches
+        @param tag: tag name. Default: one new tag per rule. Can be styled with 'setFgColorByTag'/'setBgColorByTag'.
+        @return:
+        """
+        if isinstance(rule, str): rule = _re.compile(rule)
+        if tag is None:
+            tag = "hl_"+str(len(self._highlightRules))
+            self._highlightTags.add(tag)
+        if fg is not None: self.setFgColorByTag(tag, fg)
+        if bg is not None: self.setBgColorByTag(tag, bg)
+        if not self._highlightBound:
+            self._highlightBound = True
+            _EventHandler._registerNewEvent(self, self._onHighlightEdit, EventType.KEY_UP, [], 0, coalesce=True)
+        self._highlightRules.append((rule, tag))
+        self.highlight()
+        return self
+    def clearHighlightRules(self):
+        """
+        Removes all highlighting rules and their tags from the text.
+        Tags created by 'addHighlightRule' are deleted with their colors, given tags are kept.
+        @return:
+        """
+        for rule, tag in self._highlightRules:
+            if tag in self._highlightTags:
+                self._widget.tag_delete(tag)
+            else:
+                self._widget.tag_remove(tag, "1.0", "end")
+        self._highlightRules = []
+        self._highlightTags = set()
+        return self
+    def setHighlightLookahead(self, lines:int):
+        """
+        Amount of lines before and after the cursor which get re-tagged while typing.
+        Default: 1
+        @param lines:
+        @return:
+        """
+        self._highlightLookahead = max(0, int(lines))
+        return self
+    def highlight(self, first:int=1, last:int=None):
+        """
+        Re-tags the lines 'first' to 'last' (1-based, inclusive) with all highlighting rules.
+        The tags are applied with one Tcl call.
+        Is called automatically, only needed after changing the text from outside.
+
+        @param first: first line
+        @param last: last line. Default: last line of the text
+        @return:
+        """
+        if not self._highlightRules: return self
+        widget = self._widget
+        lineCount = self._getLineCount()
+        self._highlightLineCount = lineCount
+        first = max(1, first)
+        last = lineCount if last is None else min(last, lineCount)
+        if first > last: return self
+        lines = widget.get(str(first)+".0", str(last)+".end").split("\n")
+        path = _stringify(widget._w)
+        script = []
+        for rule, tag in self._highlightRules:
+            tag = _stringify(tag)
+            ranges = []
+            for lineNo, line in enumerate(lines, first):
+                lineNo = str(lineNo)+"."
+                spans = [m.span() for m in rule.finditer(line)] if isinstance(rule, _re.Pattern) else rule(line)
+                for start, end in spans:
+                    if end > start: ranges.append(lineNo+str(start)+" "+lineNo+str(end))
+            script.append(path+" tag remove "+tag+" "+str(first)+".0 "+str(last)+".end")
+            if ranges: script.append(path+" tag add "+tag+" "+" ".join(ranges))
+        widget.tk.eval("\n".join(script))
+        return self
     def setStrf(self, text:str):
         """
         Clears the Text.
@@ -1896,6 +2766,7 @@ class Text(_LockableWidget):
         self.clear()
         self.addStrf(text)
         return self
+    @_lockable
     def addStrf(self, text:str):
         """
         Adds text to the Textbox.
@@ -1913,47 +2784,33 @@ class Text(_LockableWidget):
         §y: YELLOW
         §m: MAGENTA
 
+        Every color uses one shared tag and all sections are inserted with one Tcl call,
+        so the cost does not depend on the existing text.
+
         @param text:
         @return:
         """
         #TODO add font
         #TODO add §rgb(r, g, b)
-        colors = {'D':Color.DEFAULT,
-                  'W':Color.WHITE,
-                  'B':Color.BLACK,
-                  'r':Color.RED,
-                  'g':Color.GREEN,
-                  'b':Color.BLUE,
-                  'c':Color.CYAN,
-                  'y':Color.YELLOW,
-                  'm':Color.MAGENTA,
-                  'o':Color.ORANGE}
-
-        _text = text
-        for i in ['§D', '§W', '§B', '§r', '§g', '§b', '§c', '§y', '§m', '§o']:
-            _text = _text.replace(i, "")
-        content = self.getText()
-        self.addText(_text)  # text without colorsmarkers
-        line = _line = content.count("\n")  # 1
-        firstMarkerChar = len(content.split("\n")[-1]) + len(text.split("§")[0])  # TODO prüfen wenn text nicht mit tag beginnt
-        for i, textSection in enumerate(text.split("§")[1:]):
-            firstMarker = str(line) + "." + str(firstMarkerChar)
-            line += textSection.count("\n")
-            if _line != line:  # clear fist marker at line change
-                firstMarkerChar = 0
-                _line = line
-            if textSection.count("\n") > 0:  # section -> mehrere zeilen
-                _textSectionLastLength = len(textSection.split("\n")[-1])  # section enthält keine Farbe
-            else:
-                _textSectionLastLength = len(textSection.split("\n")[-1]) - 1  # section nur 1 zeile (dann farbe entfernen)
-            secondMarker = str(line) + "." + str(firstMarkerChar + _textSectionLastLength)
-            if textSection[0] in colors.keys():  # check if tag is a valid color
-                _id = "".join([_choice(ascii_lowercase) for _ in range(30)])
-                self._widget.tag_add(_id, firstMarker, secondMarker)
-                self._widget.tag_config(_id, foreground=colors[textSection[0]].value)
+        sections = str(text).split("§")
+        args = [sections[0], ()] if sections[0] else []
+        for section in sections[1:]:
+            code = section[:1]
+            if code in Text._STRF_COLORS:
+                if code not in self._strfTags:
+                    self._widget.tag_config("strf_"+code, foreground=Text._STRF_COLORS[code].value)
+                    self._strfTags.add(code)
+                if len(section) > 1: args.extend((section[1:], ("strf_"+code,)))
             else:
-                print(f"'{textSection}' has no valid color tag.")
-            firstMarkerChar = int(secondMarker.split(".")[1])
+                print(f"'{section}' has no valid color tag.")
+                args.extend(("§"+section, ()))
+        if args:
+            first = self._getLineCount() if self._highlightRules else None
+            self._widget.tk.call(self._widget._w, "insert", "end", *args)
+            if first is not None: self.highlight(first)
+            if self._autoScroll:
+                self._widget.see("end")
+        return self
     def setText(self, text:str, tags:str | tuple=None):
         """
         Overwrites the text with 'text'.
@@ -1980,7 +2837,9 @@ class Text(_LockableWidget):
         """
         self._tagCounter += 1
         tags = tags if type(tags) is tuple else (tags,)
+        first = self._getLineCount() if self._highlightRules else None
         self._widget.insert("end", str(text), tags)
+        if first is not None: self.highlight(first)
         if self._autoScroll:
             self._widget.see("end")
         self._tagCounter += text.count("\n")
@@ -2015,8 +2874,11 @@ class Text(_LockableWidget):
         @return:
         """
         self._widget.delete(0.0, _tk.END)
+        keep = {tag for rule, tag in self._highlightRules}
         for i in self._widget.tag_names():
-            self._widget.tag_delete(i)
+            if i not in keep: self._widget.tag_delete(i)
+        self._strfTags = set()
+        self._highlightLineCount = 1
         return self
     def getSelectedText(self)->Union[str, None]:
         """
@@ -2101,36 +2963,91 @@ class Text(_LockableWidget):
         """
         self._setAttribute("wrap", remEnum(w))
         return self
+    def _getLineCount(self)->int:
+        return int(self._widget.index("end-1c").split(".")[0])
+    def _onHighlightEdit(self):
+        if not self._highlightRules: return
+        line = int(self._widget.index("insert").split(".")[0])
+        added = self._getLineCount()-self._highlightLineCount # lines pasted/typed since the last pass end above the cursor
+        self.highlight(line-max(0, added)-self._highlightLookahead, line+self._highlightLookahead)
+    def _flushLog(self, reschedule=True):
+        if self._destroyed or self._logQueue is None: return
+        if reschedule: self._logFlushId = self._widget.after(self._logFlushDelay, self._flushLog)
+        queue = self._logQueue
+        count = len(queue) # lines queued by other threads while flushing wait for the next flush
+        if not count: return
+        items = [queue.popleft() for _ in range(count)]
+        if self._logMaxLines is not None:
+            # skip lines which would be trimmed right away
+            lines = 0
+            for start in range(len(items)-1, -1, -1):
+                lines += items[start][0].count("\n")
+                if lines >= self._logMaxLines: break
+            if start: items = items[start:]
+        args = []
+        for text, tags in items:
+            args.append(text)
+            args.append(tags if type(tags) is tuple else (() if tags is None else (tags,)))
+        self._insertLog(args)
+    @_lockable
+    def _insertLog(self, args:list):
+        """
+        Inserts (text, tags) pairs with one Tcl call, trims the oldest lines and scrolls once.
+        @param args: text, tags, text, tags, ...
+        @return:
+        """
+        widget = self._widget
+        first = self._getLineCount() if self._highlightRules else None
+        widget.tk.call(widget._w, "insert", "end", *args)
+        if self._logMaxLines is not None:
+            lines = int(widget.index("end-1c").split(".")[0])-1
+            if lines > self._logMaxLines:
+                widget.delete("1.0", str(lines-self._logMaxLines+1)+".0")
+                if first is not None: first = max(1, first-(lines-self._logMaxLines))
+        if first is not None: self.highlight(first)
+        if self._autoScroll:
+            widget.see("end")
     def _decryptEvent(self, args, event):
         return self.getText()
 #continue!
 
 class _SubFolder:
-    #TODO finish
-    def __init__(self, parent, _data):
+    """
+    Folder item of a TreeView.
+    Entries and folders can be added like on the TreeView itself.
+    """
+    def __init__(self, tree, parent):
+        self._tree = tree
         self._parent = parent
-        self._data = _data
-    def __getitem__(self, item):
-        return self._data[item]
-    def __setitem__(self, key, value):
-        self._data[key] = value
+    def getId(self)->str:
+        return self._parent
     def addEntry(self, *args, index="end"):
         if isinstance(args[0], tuple) or isinstance(args[0], list):
             args = args[0]
-        if len(self._headers) == 0:
-            raise TKExceptions.InvalidHeaderException("Set Tree Headers first!")
-        if len(self._headers) != len(list(args)):
-            raise TKExceptions.InvalidHeaderException("Length of headers must be the same as args of addEntry!")
-        self._widget.insert(parent=self._parent, index=index, text=args[0], values=args[1:])
-    def createFolder(self, *args, index="end"):
+        self._tree._checkRow(args)
+        self._tree._get().insert(parent=self._parent, index=index, text=args[0], values=args[1:])
+        return self
+    def addEntries(self, rows, index="end", tags=None):
+        """
+        Adds many entries with one Tcl call. See 'TreeView.addEntries'.
+        """
+        self._tree._insertRows(self._parent, index, rows, tags)
+        return self
+    def createFolder(self, *args, index="end", loader=None):
         if isinstance(args[0], tuple) or isinstance(args[0], list):
             args = args[0]
-        if len(self._headers) == 0:
-            raise TKExceptions.InvalidHeaderException("Set Tree Headers first!")
-        if len(self._headers) != len(list(args)):
-            raise TKExceptions.InvalidHeaderException("Length of headers must be the same as args of addEntry!")
-        parent = self._widget.insert(parent=self._parent, index=index, text=args[0], values=args[1:])
-        return _SubFolder(parent, self._data)
+        self._tree._checkRow(args)
+        parent = self._tree._get().insert(parent=self._parent, index=index, text=args[0], values=args[1:])
+        folder = _SubFolder(self._tree, parent)
+        if loader is not None: self._tree._setLazyFolder(folder, loader)
+        return folder
+    def load(self):
+        """
+        Populates a lazy folder now instead of on first open.
+        @return:
+        """
+        self._tree._loadLazyFolder(self._parent)
+        return self
 class TreeView(_Widget):
     """TODO
     tag_configure:
@@ -2138,6 +3055,9 @@ class TreeView(_Widget):
 
 
     """
+    _DATE_FORMATS = ("%d.%m.%Y", "%d.%m.%Y %H:%M", "%d.%m.%Y %H:%M:%S", "%d/%m/%Y")
+    _THOUSANDS = _re.compile(r"[+-]?\d{1,3}(?:(?:,\d{3})+|(?:\.\d{3}){2,})") # '1,000' '1,000,000' '1.000.000'
+    _FILTER_MAX_MOVES = 64 # more reattached rows per filter update -> reorder all with 'set_children'
     def __init__(self, _master, group:WidgetGroup =None):
         # TODO check / add sorting (headers)
         if not _isinstanceAny(_master, Tk, NotebookTab, "Canvas", Frame, LabelFrame):
@@ -2148,6 +3068,18 @@ class TreeView(_Widget):
         self._onHeaderClick = None
         self._useIndex = None
         self._selectMode = "single"
+        self._ids = []        # top level item ids in display order
+        self._idIndex = {}    # item id -> index in '_ids', rebuilt lazily if None
+        self._rowCounter = 0  # for item ids of bulk inserts
+        self._lazyFolders = None # folder id -> (loader, placeholder id, _SubFolder)
+        self._rowValues = {}  # top level item id -> row tuple (column store for sorting)
+        self._dataVersion = 0 # incremented on every change of the top level rows
+        self._sortKeys = {}   # column index -> [parser, {item id:key}]
+        self._sortOrder = None  # (column index, ascending id order, data version)
+        self._sortColumn = None # (column index, descending)
+        self._columnSortTypes = {} # column index -> 'str' | 'number' | 'date' | function(value) -> key
+        self._headerSorting = False
+        self._filter = None   # _TextFilter over all top level item ids while a filter is set
 
         super().__init__(child=self,
                          widget=_ttk.Treeview(_master._get()),
@@ -2180,8 +3112,17 @@ class TreeView(_Widget):
     def getSelectedItem(self)->list | dict | None:
         return self._decryptEvent(None, None)
     def clear(self):
-        if self.length() == 0: return self
-        self._widget.delete(*self._widget.get_children())
+        if self._filter is not None:
+            if self._filter.order: self._widget.delete(*self._filter.order)
+            self._filter = None
+        elif self.length() == 0: return self
+        else: self._widget.delete(*self._ids)
+        self._ids = []
+        self._idIndex = {}
+        self._rowValues = {}
+        self._sortKeys = {}
+        if self._lazyFolders is not None: self._lazyFolders.clear() # keeps the '<<TreeviewOpen>>' binding
+        self._dataVersion += 1
         return self
     def setTableHeaders(self, *args):
         if isinstance(args[0], tuple) or isinstance(args[0], list):
@@ -2198,10 +3139,7 @@ class TreeView(_Widget):
             image = image._get()
         if isinstance(args[0], tuple) or isinstance(args[0], list):
             args = args[0]
-        if len(self._headers) == 0:
-            raise TKExceptions.InvalidHeaderException("Set Tree Headers first!")
-        if len(self._headers) != len(list(args)):
-            raise TKExceptions.InvalidHeaderException("Length of headers must be the same as args of addEntry!")
+        self._checkRow(args)
 
         data = {
             "text":args[0],
@@ -2213,7 +3151,19 @@ class TreeView(_Widget):
                 data["tag"] = tag
             else:
                 data["tag"] = (tag,)
-        _id = self._widget.insert(parent="", index=index, **data)
+        _id = self._insertTopLevel(index, data)
+        return self
+    def addEntries(self, rows, index="end", tags=None):
+        """
+        Adds many entries with one Tcl call.
+        Way faster than calling 'addEntry' in a for loop.
+
+        @param rows: iterable of rows. Each row has one value per header.
+        @param index: where to insert. At the end by default.
+        @param tags: one tag (str/tuple) for all rows, a list with one tag per row or function(row) -> tag.
+        @return:
+        """
+        self._insertRows("", index, rows, tags)
         return self
     def setBgColorByTag(self, tag:str, color:Color | str):
         self._widget.tag_configure(tag, background=remEnum(color))
@@ -2222,7 +3172,7 @@ class TreeView(_Widget):
         self._widget.tag_configure(tag, foreground=remEnum(color))
         return self
     def setEntry(self, *args, index=0):
-        index = self._getIds()[index]
+        index = self._ids[index]
         #if isinstance(image, TkImage) or isinstance(image, PILImage):
         #    image = image._get()
         if isinstance(args[0], tuple) or isinstance(args[0], list):
@@ -2233,16 +3183,113 @@ class TreeView(_Widget):
             raise TKExceptions.InvalidHeaderException("Length of headers must be the same as args of addEntry!")
         #if image is not None: _id = self._widget.item(index, parent="", text=args[0], values=args[1:], image=image)
         else: _id = self._widget.item(index, text=args[0], values=args[1:])
+        self._rowValues[index] = tuple(args)
+        if self._filter is not None: self._filter.texts[index] = self._getRowText(index)
+        for parser, keys in self._sortKeys.values(): keys.pop(index, None)
+        self._dataVersion += 1
         return self
-    def createFolder(self, *args, index="end"):
+    def createFolder(self, *args, index="end", loader=None):
+        """
+        Creates a folder item.
+        If 'loader' is given, the children are created when the folder is opened the first time.
+
+        @param args: one value per header
+        @param index: where to insert. At the end by default.
+        @param loader: function(_SubFolder) -> rows | None, or an iterable of rows.
+        @return: _SubFolder
+        """
         if isinstance(args[0], tuple) or isinstance(args[0], list):
             args = args[0]
-        if len(self._headers) == 0:
-            raise TKExceptions.InvalidHeaderException("Set Tree Headers first!")
-        if len(self._headers) != len(list(args)):
-            raise TKExceptions.InvalidHeaderException("Length of headers must be the same as args of addEntry!")
-        parent = self._widget.insert(parent="", index=index, text=args[0], values=args[1:])
-        return _SubFolder(parent, self._data)
+        self._checkRow(args)
+        parent = self._insertTopLevel(index, {"text":args[0], "values":args[1:]})
+        folder = _SubFolder(self, parent)
+        if loader is not None: self._setLazyFolder(folder, loader)
+        return folder
+    def setHeaderSortEnabled(self, b:bool=True):
+        """
+        Clicking a header sorts the top level rows by this column.
+        Clicking the same header again toggles ascending/descending.
+
+        @param b:
+        @return:
+        """
+        self._headerSorting = bool(b)
+        return self
+    def setColumnSortType(self, column:Union[str, int], type_:Union[str, Callable]):
+        """
+        Sets how the values of a column are compared.
+        Default: 'number' if all values are numbers, 'date' if all values are dates, else 'str' (case insensitive).
+
+        @param column: header name or index
+        @param type_: 'str', 'number', 'date' or function(value) -> key
+        @return:
+        """
+        column = self._getColumnIndex(column)
+        self._columnSortTypes[column] = type_
+        self._sortKeys.pop(column, None)
+        if self._sortOrder is not None and self._sortOrder[0] == column: self._sortOrder = None
+        return self
+    def sortByColumn(self, column:Union[str, int], descending=False):
+        """
+        Sorts the top level rows by given column.
+        The keys are parsed once per column and cached, the rows are reordered with one Tcl call.
+        Toggling the direction of the same column reuses the cached order.
+
+        @param column: header name or index
+        @param descending:
+        @return:
+        """
+        column = self._getColumnIndex(column)
+        if self._sortOrder is not None and self._sortOrder[0] == column and self._sortOrder[2] == self._dataVersion:
+            order = self._sortOrder[1]
+        else:
+            keys = self._getSortKeys(column)
+            order = sorted(self._getAllIds(), key=keys.__getitem__)
+            self._sortOrder = (column, order, self._dataVersion)
+        ids = order[::-1] if descending else order.copy()
+        if self._filter is not None: # hidden rows are sorted too but stay detached
+            shown = set(self._filter.visible)
+            self._filter.order = ids
+            self._filter.visible = [_id for _id in ids if _id in shown]
+            ids = self._filter.visible.copy()
+        self._widget.set_children("", *ids)
+        self._ids = ids
+        self._idIndex = None
+        self._setSortIndicator(column, descending)
+        return self
+    def setFilter(self, query:str):
+        """
+        Shows only the top level rows containing 'query' in any column (case insensitive).
+        The lowercase text of all rows is indexed once when the first filter is set.
+        If the query extends the last one only the shown rows are searched.
+        Only the rows which changed get detached or reattached.
+        While a filter is set, all index based methods refer to the shown rows.
+        An empty query shows everything again but keeps the index, 'clearFilter' removes it.
+
+        @param query:
+        @return:
+        """
+        query = str(query)
+        if self._filter is None:
+            if query == "": return self
+            self._filter = _TextFilter(self._ids.copy(), {_id:self._getRowText(_id) for _id in self._ids})
+        self._applyFilter(query)
+        return self
+    def clearFilter(self):
+        """
+        Removes the filter and its index and reattaches all rows.
+        @return:
+        """
+        if self._filter is None: return self
+        self._applyFilter("")
+        self._filter = None
+        return self
+    def getFilter(self)->str:
+        """
+        Returns the current filter query. Empty string if no filter is set.
+        @return:
+        """
+        return "" if self._filter is None else self._filter.query
     def setNoSelectMode(self):
         self._setAttribute("selectmode", "none")
         return self
@@ -2259,8 +3306,8 @@ class TreeView(_Widget):
             self._widget.selection_remove(item)
         return self
     def see(self, index):
-        if len(self._getIds()) > index and len(self._getIds()):
-            self._widget.see(self._getIds()[index])
+        if len(self._ids) > index:
+            self._widget.see(self._ids[index])
         return self
     def onSelectHeader(self, func, args:list=None, priority:int=0, defaultArgs=False, disableArgs=False, useIndex=False):
         self._onHeaderClick = _EventHandler._getNewEventRunnable(self, func, args, priority, defaultArgs=defaultArgs, disableArgs=disableArgs)
@@ -2268,12 +3315,12 @@ class TreeView(_Widget):
         return self
     #TODO add length from subFolders!
     def length(self):
-        return len(self._getIds())
-    #TODO test after resorting items -> _getIds correct?
+        return len(self._ids)
+    #TODO test after resorting items -> _ids correct?
     def setItemSelectedByIndex(self, index:int, clearFirst=True):
-        assert index < len(self._getIds()), "index is too large: \n\tListbox_length: "+str(len(self._getIds()))+"\n\tIndex: "+str(index)
-        if clearFirst: self._widget.selection_set(self._getIds()[index])
-        else: self._widget.selection_add(self._getIds()[index])
+        assert index < len(self._ids), "index is too large: \n\tListbox_length: "+str(len(self._ids))+"\n\tIndex: "+str(index)
+        if clearFirst: self._widget.selection_set(self._ids[index])
+        else: self._widget.selection_add(self._ids[index])
         return self
     """
     def setItemSelectedByName(self, name, clearFirst=True):
@@ -2283,27 +3330,169 @@ class TreeView(_Widget):
         return self
     """
     def getSize(self):
-        return len(self._getIds())
+        return len(self._ids)
     def deleteItemByIndex(self, index):
-        self._widget.delete(self._getIds()[index])
+        _id = self._ids[index]
+        self._widget.delete(_id)
+        self._rowValues.pop(_id, None)
+        for parser, keys in self._sortKeys.values(): keys.pop(_id, None)
+        if self._filter is not None: self._filter.remove(_id)
+        self._dataVersion += 1
+        if index == -1 or index == len(self._ids)-1:
+            _id = self._ids.pop()
+            if self._idIndex is not None: self._idIndex.pop(_id, None)
+        else:
+            del self._ids[index]
+            self._idIndex = None
         return self
     def getIndexByName(self, item):
         return self.getAllSlots().index(item)
     def getDataByIndex(self, index)->dict:
-        return self._getDataFromId(self._getIds()[index])
+        return self._getDataFromId(self._ids[index])
     def getSelectedIndex(self)->int | None | list:
         if len(self._widget.selection()) == 0: return None
         if self._selectMode == "single":
-            return self._getIds().index(self._widget.selection()[0])
+            return self._getIndexById(self._widget.selection()[0])
         else:
-            ids = self._getIds()
-            return [ids.index(i) for i in self._widget.selection()]
+            return [self._getIndexById(i) for i in self._widget.selection()]
     def getAllSlotIndexes(self):
         return [i for i in range(self.length())]
     def getAllSlots(self):
-        return [self._widget.item(i) for i in self._getIds()]
-    def _getIds(self):
-        return self._widget.get_children()
+        return [self._widget.item(i) for i in self._ids]
+    def _checkRow(self, row):
+        if len(self._headers) == 0:
+            raise TKExceptions.InvalidHeaderException("Set Tree Headers first!")
+        if len(self._headers) != len(row):
+            raise TKExceptions.InvalidHeaderException("Length of headers must be the same as args of addEntry!")
+    def _insertRows(self, parent:str, index, rows, tags=None):
+        """
+        Inserts rows below parent with one 'tk.eval' script.
+        Item ids are created here, so the script does not need to return anything.
+
+        @param parent: parent item id ("" for top level)
+        @param index: int or 'end'
+        @param rows: iterable of rows
+        @param tags: str/tuple for all rows, list per row or function(row) -> tag
+        @return: list of the new item ids
+        """
+        if len(self._headers) == 0:
+            raise TKExceptions.InvalidHeaderException("Set Tree Headers first!")
+        if parent == "" and index != "end" and self._filter is not None: self.clearFilter()
+        headerCount = len(self._headers)
+        path = _stringify(self._widget._w)
+        parentStr = _stringify(parent)
+        allTags = None
+        if isinstance(tags, str): allTags = " -tags "+_stringify((tags,))
+        elif isinstance(tags, tuple): allTags = " -tags "+_stringify(tags)
+        ids = []
+        lines = []
+        rowValues = []
+        counter = self._rowCounter
+        pos = index
+        for i, row in enumerate(rows):
+            if len(row) != headerCount:
+                raise TKExceptions.InvalidHeaderException("Length of headers must be the same as args of addEntry! (row "+str(i)+")")
+            counter += 1
+            _id = "R"+str(counter)
+            ids.append(_id)
+            line = path+" insert "+parentStr+" "+str(pos)+" -id "+_id+" -text "+_stringify(str(row[0]))+" -values "+_stringify(tuple(row[1:]))
+            if allTags is not None:
+                line += allTags
+            elif tags is not None:
+                tag = tags(row) if callable(tags) else tags[i]
+                if tag is not None: line += " -tags "+_stringify(tag if isinstance(tag, tuple) else (tag,))
+            lines.append(line)
+            if pos != "end": pos += 1
+            if parent == "": rowValues.append(tuple(row))
+        self._rowCounter = counter
+        if not lines: return ids
+        self._widget.tk.eval("\n".join(lines))
+        if parent == "":
+            self._rowValues.update(zip(ids, rowValues))
+            self._dataVersion += 1
+            shown = ids if self._filter is None else self._filterInserted(ids)
+            if index == "end" or index >= len(self._ids):
+                if self._idIndex is not None:
+                    for i, _id in enumerate(shown, len(self._ids)): self._idIndex[_id] = i
+                self._ids.extend(shown)
+            else:
+                index = max(0, index)
+                self._ids[index:index] = ids
+                self._idIndex = None
+        return ids
+    def _setLazyFolder(self, folder:_SubFolder, loader):
+        if self._lazyFolders is None:
+            self._lazyFolders = {}
+            _EventHandler._registerNewEvent(self, self._onFolderOpen, EventType.customEvent("<<TreeviewOpen>>"), [], 0)
+        placeholder = self._widget.insert(parent=folder._parent, index="end", text="") # shows the open indicator
+        self._lazyFolders[folder._parent] = (loader, placeholder, folder)
+    def _onFolderOpen(self):
+        self._loadLazyFolder(self._widget.focus())
+    def _loadLazyFolder(self, id_):
+        if not self._lazyFolders or id_ not in self._lazyFolders: return
+        loader, placeholder, folder = self._lazyFolders.pop(id_)
+        self._widget.delete(placeholder)
+        rows = loader(folder) if callable(loader) else loader
+        if rows is not None:
+            self._insertRows(id_, "end", rows)
+    def _applyFilter(self, query:str):
+        filter_ = self._filter
+        old = filter_.visible
+        removed, added = filter_.setQuery(query)
+        if not removed and not added: return
+        visible = filter_.visible
+        if removed: self._widget.detach(*[old[i] for i in removed])
+        if len(added) > self._FILTER_MAX_MOVES:
+            self._widget.set_children("", *visible)
+        elif added:
+            path = _stringify(self._widget._w)
+            self._widget.tk.eval("\n".join([path+" move "+_stringify(visible[i])+" {} "+str(i) for i in added]))
+        self._ids = visible.copy()
+        self._idIndex = None
+    def _filterInserted(self, ids:list)->list:
+        """
+        Adds new top level rows (appended at the end) to the filter and detaches the rows not matching.
+        @param ids:
+        @return: ids of the shown rows
+        """
+        matches = self._filter.append(ids, [self._getRowText(_id) for _id in ids])
+        hidden = [_id for _id, match in zip(ids, matches) if not match]
+        if hidden: self._widget.detach(*hidden)
+        return [_id for _id, match in zip(ids, matches) if match]
+    def _getRowText(self, id_)->str:
+        return " ".join([str(v) for v in self._rowValues[id_]]).lower()
+    def _getAllIds(self)->list:
+        """
+        Returns all top level item ids including the rows hidden by a filter.
+        """
+        return self._ids if self._filter is None else self._filter.order
+    def _getIndexById(self, id_)->int:
+        if self._idIndex is None:
+            self._idIndex = {_id:i for i, _id in enumerate(self._ids)}
+        index = self._idIndex.get(id_)
+        if index is None: raise ValueError(f"{id_!r} is not a top level item of {self.__class__.__name__}")
+        return index
+    def _insertTopLevel(self, index, data:dict)->str:
+        """
+        Inserts a top level item and keeps the id <-> index mapping up to date.
+        Appending keeps the index mapping, other inserts invalidate it.
+
+        @param index: int or 'end'
+        @param data: item options
+        @return: item id
+        """
+        if index != "end" and self._filter is not None: self.clearFilter()
+        _id = self._widget.insert(parent="", index=index, **data)
+        self._rowValues[_id] = (data["text"], *data["values"])
+        self._dataVersion += 1
+        if self._filter is not None and not self._filterInserted([_id]): return _id
+        if index == "end" or index >= len(self._ids):
+            self._ids.append(_id)
+            if self._idIndex is not None: self._idIndex[_id] = len(self._ids)-1
+        else:
+            self._ids.insert(max(0, index), _id)
+            self._idIndex = None
+        return _id
     def _decryptEvent(self, args, event):
         self.getParentWindow().updateIdleTasks()
         ids = self._widget.selection()
@@ -2313,7 +3502,7 @@ class TreeView(_Widget):
             item = self._widget.item(id_)
             if event is not None and event["use_index"]:
                 items.append(
-                    self._getIds().index(id_)
+                    self._getIndexById(id_)
                 )
                 continue
             a = {self._headers[0]:item["text"]}
@@ -2322,15 +3511,393 @@ class TreeView(_Widget):
         if self._selectMode == "single": return items[0]
         return items
     def _clickHeader(self, hName):
+        if self._headerSorting:
+            descending = self._sortColumn is not None and self._sortColumn[0] == hName[1] and not self._sortColumn[1]
+            self.sortByColumn(hName[1], descending)
         if self._onHeaderClick is not None:
             handler = self._onHeaderClick
             handler.event["value"] = hName[0] if not self._useIndex else hName[1]
             handler()
+    def _getColumnIndex(self, column:Union[str, int])->int:
+        if isinstance(column, int): return column
+        if column not in self._headers:
+            raise TKExceptions.InvalidHeaderException("Header '"+str(column)+"' does not exist!")
+        return self._headers.index(column)
+    def _setSortIndicator(self, column:int, descending:bool):
+        if self._sortColumn is not None:
+            old = self._sortColumn[0]
+            self._widget.heading("#0" if old == 0 else self._headers[old], text=self._headers[old])
+        self._widget.heading("#0" if column == 0 else self._headers[column], text=self._headers[column]+(" \u25BC" if descending else " \u25B2"))
+        self._sortColumn = (column, descending)
+    def _getSortKeys(self, column:int)->dict:
+        """
+        Returns {item id:key} of given column. Keys are only parsed for new/changed rows.
+        @param column:
+        @return:
+        """
+        ids = self._getAllIds()
+        cache = self._sortKeys.get(column)
+        if cache is not None:
+            parser, keys = cache
+            try:
+                for _id in ids:
+                    if _id not in keys: keys[_id] = parser(self._rowValues[_id][column])
+                return keys
+            except (ValueError, TypeError):
+                pass # new value does not fit the detected type -> detect again
+        values = [self._rowValues[_id][column] for _id in ids]
+        type_ = self._columnSortTypes.get(column)
+        if type_ is None:
+            parsers = [TreeView._parseNumber, TreeView._parseDate, TreeView._parseStr]
+        elif callable(type_):
+            parsers = [type_]
+        else:
+            parsers = [{"number":TreeView._parseNumber, "date":TreeView._parseDate, "str":TreeView._parseStr}[type_]]
+        for parser in parsers:
+            try:
+                parsed = [parser(v) for v in values]
+            except (ValueError, TypeError):
+                continue
+            keys = dict(zip(ids, parsed))
+            self._sortKeys[column] = [parser, keys]
+            return keys
+        raise TKExceptions.InvalidUsageException("Could not parse column '"+self._headers[column]+"' for sorting!")
+    @staticmethod
+    def _parseNumber(value)->float:
+        """
+        Parses ',' and '.' as decimal or thousands separator. ('3,5', '1,000', '1,000.5', '1.000,5', '1.000.000')
+        The last separator is the decimal separator if both are used.
+        """
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        value = value.strip()
+        if TreeView._THOUSANDS.fullmatch(value):
+            return float(value.replace(",", "").replace(".", ""))
+        comma, dot = value.rfind(","), value.rfind(".")
+        if comma > dot:
+            value = value.replace(".", "").replace(",", ".")
+        elif comma != -1:
+            value = value.replace(",", "")
+        return float(value)
+    @staticmethod
+    def _parseDate(value)->_date:
+        if isinstance(value, _date): return value
+        value = str(value)
+        for format_ in TreeView._DATE_FORMATS:
+            try:
+                return _date.strptime(value, format_)
+            except ValueError:
+                pass
+        return _date.fromisoformat(value)
+    @staticmethod
+    def _parseStr(value)->str:
+        return str(value).lower()
     def _getDataFromId(self, id_):
         item = self._widget.item(id_)
         a = {self._headers[0]:item["text"]}
         for i, h in enumerate(self._headers[1:]): a[h] = item["values"][i]
         return a
+class VirtualTreeView(_Widget):
+    """
+    Widget:
+    Table with the API of 'TreeView' which only renders the visible rows.
+    The rows come from a row source: a sequence (list, NumPy structured array...) or function(index) -> row.
+    A fixed set of tkinter items is reused on scroll, so memory and scroll cost depend on the viewport only.
+    Selection and events use the indices of the row source.
+    """
+    _SCROLL_UNITS = 3 # rows per mouse wheel step
+    def __init__(self, _master, group:WidgetGroup =None):
+        if not _isinstanceAny(_master, Tk, NotebookTab, "Canvas", Frame, LabelFrame):
+            raise TKExceptions.InvalidWidgetTypeException("_master must be "+str(self.__class__.__name__)+" or Tk instance not: "+str(_master.__class__.__name__))
+
+        self._headers = []
+        self._source = ()
+        self._length = 0
+        self._rowTags = None    # sequence parallel to the source or function(row) -> tag
+        self._offset = 0        # source index of the first visible row
+        self._slots = []        # reused tkinter item ids
+        self._detached = set()  # slots without row (end of the source reached)
+        self._rowHeight = 20
+        self._rowsPartial = False
+        self._selected = set()  # selected source indices
+        self._anchor = None
+        self._selectMode = "single"
+        self._onHeaderClick = None
+        self._useIndex = None
+        self._yScrollbar = None
+
+        super().__init__(child=self,
+                         widget=_ttk.Treeview(_master._get()),
+                         master=_master,
+                         group=group,
+                         init={"selectmode":"browse"})
+
+        # internal bindings between widget tag and 'Treeview' class tag. (see VirtualListbox)
+        self._bindTag = "VirtualTreeView"+str(id(self))
+        tags = self._widget.bindtags()
+        self._widget.bindtags(tags[:1] + (self._bindTag,) + tags[1:])
+        self._internalEvents = {
+            "<Configure>":self._onConfigure,
+            "<<TreeviewSelect>>":lambda e: self._syncSelection(),
+            "<MouseWheel>":lambda e: self._scrollWheel(-1 if e.delta > 0 else 1),
+            "<Button-4>":lambda e: self._scrollWheel(-1),
+            "<Button-5>":lambda e: self._scrollWheel(1),
+            "<Up>":lambda e: self._moveSelection(-1),
+            "<Down>":lambda e: self._moveSelection(1),
+            "<Prior>":lambda e: self._moveSelection(-self._getFullRows()),
+            "<Next>":lambda e: self._moveSelection(self._getFullRows()),
+        }
+        for sequence, func in self._internalEvents.items():
+            self._widget.bind_class(self._bindTag, sequence, func)
+        self._createSlots(1)
+    def onDoubleSelectEvent(self, func, args:list=None, priority:int=0, defaultArgs=False, disableArgs=False, useIndex=False):
+        event = _EventHandler._registerNewEvent(self, func, Mouse.DOUBBLE_LEFT, args, priority, defaultArgs=defaultArgs, disableArgs=disableArgs, decryptValueFunc=self._decryptEvent)
+        event["use_index"] = useIndex
+        return self
+    def onSingleSelectEvent(self, func, args:list=None, priority:int=0, defaultArgs=False, disableArgs=False, useIndex=False):
+        event = _EventHandler._registerNewEvent(self, func, Mouse.LEFT_CLICK_RELEASE, args, priority, defaultArgs=defaultArgs, disableArgs=disableArgs, decryptValueFunc=self._decryptEvent)
+        event["use_index"] = useIndex
+        return self
+    def onSelectHeader(self, func, args:list=None, priority:int=0, defaultArgs=False, disableArgs=False, useIndex=False):
+        self._onHeaderClick = _EventHandler._getNewEventRunnable(self, func, args, priority, defaultArgs=defaultArgs, disableArgs=disableArgs)
+        self._useIndex = useIndex
+        return self
+    def attachVerticalScrollBar(self, sc: ScrollBar):
+        """
+        Used to attach a vertical scrollbar.
+        The scrollbar is mapped onto the whole row source.
+        @param sc:
+        @return:
+        """
+        self._yScrollbar = sc
+        sc._setAttribute("orient", _tk.VERTICAL)
+        sc._setAttribute("command", self._yview)
+        self._updateScrollbar()
+        return self
+    def setTableHeaders(self, *args):
+        if isinstance(args[0], tuple) or isinstance(args[0], list):
+            args = args[0]
+        self._headers = [str(i) for i in args]
+        self._setAttribute("columns", self._headers[1:])
+        self._widget.column("#0", stretch=False)
+        self._widget.heading("#0", text=self._headers[0], anchor="w", command=lambda a=self._headers[0], b=0:self._clickHeader((a, b)))
+        for i, header in enumerate(self._headers[1:]):
+            self._widget.column(header, stretch=False)
+            self._widget.heading(header, text=header, anchor="w", command=lambda a=header, b=1+i:self._clickHeader((a, b)))
+        return self
+    def setRowSource(self, source:Union[Sequence, Callable], length:int=None, tags:Union[str, Sequence, Callable]=None):
+        """
+        Sets the rows of this table.
+        A row has one value per header.
+
+        @param source: sequence of rows (list, NumPy structured array...) or function(index) -> row.
+        @param length: amount of rows. Required if source is a function.
+        @param tags: one tag for all rows, sequence of tags parallel to the source or function(row) -> tag.
+        @return:
+        """
+        if callable(source) and length is None:
+            raise TKExceptions.InvalidUsageException("'length' must be given if the row source is a function!")
+        self._source = source
+        self._length = len(source) if length is None else int(length)
+        self._rowTags = tags
+        self._offset = 0
+        self._selected.clear()
+        self._anchor = None
+        self._render()
+        return self
+    def refresh(self, length:int=None):
+        """
+        Redraws the visible rows.
+        Call this after the row source has changed.
+
+        @param length: new amount of rows if the source is a function.
+        @return:
+        """
+        if length is not None:
+            self._length = int(length)
+        elif not callable(self._source):
+            self._length = len(self._source)
+        self._selected = {i for i in self._selected if i < self._length}
+        self._render()
+        return self
+    def setBgColorByTag(self, tag:str, color:Color | str):
+        self._widget.tag_configure(tag, background=remEnum(color))
+        return self
+    def setFgColorByTag(self, tag:str, color:Color | str):
+        self._widget.tag_configure(tag, foreground=remEnum(color))
+        return self
+    def setNoSelectMode(self):
+        self._setAttribute("selectmode", "none")
+        return self
+    def setMultipleSelect(self):
+        self._setAttribute("selectmode", "extended")
+        self._selectMode = "multiple"
+        return self
+    def setSingleSelect(self):
+        self._setAttribute("selectmode", "browse")
+        self._selectMode = "single"
+        return self
+    def clearSelection(self):
+        self._selected.clear()
+        self._widget.selection_set(())
+        return self
+    def see(self, index:int):
+        """
+        Scrolls the minimum amount so that the row at given index is visible. O(visible rows)
+        @param index:
+        @return:
+        """
+        if index < self._offset:
+            self.scrollTo(index)
+        elif index >= self._offset + self._getFullRows():
+            self.scrollTo(index - self._getFullRows() + 1)
+        return self
+    def scrollTo(self, index:int):
+        """
+        Scrolls the row at given index to the top.
+        @param index:
+        @return:
+        """
+        offset = max(0, min(int(index), self._length - self._getFullRows()))
+        if offset != self._offset:
+            self._offset = offset
+            self._render()
+        return self
+    def length(self)->int:
+        return self._length
+    def setItemSelectedByIndex(self, index:int, clearFirst=True):
+        assert index < self._length, "index is too large: \n\tlength: "+str(self._length)+"\n\tIndex: "+str(index)
+        if clearFirst or self._selectMode == "single": self._selected.clear()
+        self._selected.add(index)
+        self._anchor = index
+        self._render()
+        return self
+    def getDataByIndex(self, index:int)->dict:
+        row = tuple(self._getRow(index))
+        return {h:row[i] for i, h in enumerate(self._headers)}
+    def getSelectedIndex(self)->int | None | list:
+        if not self._selected: return None
+        if self._selectMode == "single":
+            return next(iter(self._selected))
+        return sorted(self._selected)
+    def getSelectedItem(self)->list | dict | None:
+        index = self.getSelectedIndex()
+        if index is None: return None
+        if type(index) == int:
+            return self.getDataByIndex(index)
+        return [self.getDataByIndex(i) for i in index]
+    def destroy(self):
+        for sequence in self._internalEvents.keys():
+            self._widget.unbind_class(self._bindTag, sequence)
+        return super().destroy()
+    def _getRow(self, index:int):
+        return self._source(index) if callable(self._source) else self._source[index]
+    def _getFullRows(self)->int:
+        rows = len(self._slots)
+        return rows - 1 if rows > 1 and self._rowsPartial else rows
+    def _createSlots(self, count:int):
+        path = _stringify(self._widget._w)
+        script = []
+        if self._slots: script.append(path+" delete "+_stringify(tuple(self._slots)))
+        self._slots = ["V"+str(i) for i in range(count)]
+        self._detached = set()
+        script.extend([path+" insert {} end -id "+_id for _id in self._slots])
+        self._widget.tk.eval("\n".join(script))
+    def _onConfigure(self, e):
+        bbox = self._widget.bbox(self._slots[0]) if self._length else ""
+        if bbox:
+            top, self._rowHeight = bbox[1], bbox[3]
+        else:
+            top = self._rowHeight # approximated heading height
+        rows, rest = divmod(max(e.height - top, self._rowHeight), self._rowHeight)
+        self._rowsPartial = rest > 0
+        rows += 1 if rest else 0
+        if rows != len(self._slots):
+            self._createSlots(rows)
+            self._render()
+    def _render(self):
+        """
+        Writes the visible rows into the reused items with one Tcl call. O(visible rows)
+        """
+        self._offset = max(0, min(self._offset, self._length - self._getFullRows()))
+        path = _stringify(self._widget._w)
+        tags = self._rowTags
+        script = []
+        selected = []
+        detached = []
+        for slot, _id in enumerate(self._slots):
+            index = self._offset + slot
+            if index >= self._length:
+                if _id not in self._detached: detached.append(_id)
+                continue
+            row = tuple(self._getRow(index))
+            line = path+" item "+_id+" -text "+_stringify(str(row[0]))+" -values "+_stringify(row[1:])
+            tag = tags if tags is None or isinstance(tags, str) else tags(row) if callable(tags) else tags[index]
+            line += " -tags "+(_stringify(tag if isinstance(tag, tuple) else (tag,)) if tag is not None else "{}")
+            script.append(line)
+            if _id in self._detached:
+                script.append(path+" move "+_id+" {} "+str(slot))
+                self._detached.discard(_id)
+            if index in self._selected: selected.append(_id)
+        if detached:
+            script.append(path+" detach "+_stringify(tuple(detached)))
+            self._detached.update(detached)
+        script.append(path+" selection set "+_stringify(tuple(selected)))
+        self._widget.tk.eval("\n".join(script))
+        self._updateScrollbar()
+    def _syncSelection(self):
+        """
+        Takes the tkinter selection of the visible rows into the source selection.
+        """
+        slotIndex = {_id:i for i, _id in enumerate(self._slots)}
+        current = {self._offset + slotIndex[_id] for _id in self._widget.selection() if _id in slotIndex}
+        if self._selectMode == "single":
+            if current:
+                self._selected = current
+                self._anchor = next(iter(current))
+            return
+        visible = range(self._offset, self._offset + len(self._slots))
+        self._selected = {i for i in self._selected if i not in visible} | current
+    def _updateScrollbar(self):
+        if self._yScrollbar is None: return
+        if self._length == 0:
+            self._yScrollbar.set(0, 1)
+        else:
+            self._yScrollbar.set(self._offset / self._length, min(1, (self._offset + self._getFullRows()) / self._length))
+    def _yview(self, *args):
+        # scrollbar command: ('moveto', fraction) or ('scroll', number, 'units'|'pages')
+        if args[0] == "moveto":
+            self.scrollTo(int(float(args[1]) * self._length))
+        elif args[0] == "scroll":
+            step = self._getFullRows() if args[2] == "pages" else 1
+            self.scrollTo(self._offset + int(args[1]) * step)
+    def _scrollWheel(self, direction:int):
+        self.scrollTo(self._offset + direction * VirtualTreeView._SCROLL_UNITS)
+        return "break"
+    def _moveSelection(self, step:int):
+        if not self._length: return "break"
+        index = self._anchor
+        index = 0 if index is None else max(0, min(index + step, self._length-1))
+        self._selected = {index} if self._selectMode == "single" else self._selected | {index}
+        self._anchor = index
+        self.see(index)
+        self._render()
+        self._widget.focus(self._slots[index - self._offset])
+        return "break"
+    def _decryptEvent(self, args, event):
+        # widget bindings run before the internal bindtag -> sync here.
+        self._syncSelection()
+        index = self.getSelectedIndex()
+        if index is None: return None
+        if event is not None and event["use_index"]: return index
+        return self.getSelectedItem()
+    def _clickHeader(self, hName):
+        if self._onHeaderClick is not None:
+            handler = self._onHeaderClick
+            handler.event["value"] = hName[0] if not self._useIndex else hName[1]
+            handler()
 class SpinBox(_LockableWidget):
     def __init__(self, _master, group:WidgetGroup =None, optionList:list=None, readOnly=True):
         if not _isinstanceAny(_master, Tk, NotebookTab, "Canvas", Frame, LabelFrame):
@@ -1,11 +1,14 @@
 import tkinter as _tk
+import _tkinter
+import asyncio as _asyncio
 from typing import Callable, Union
+from concurrent.futures import Future
 from random import randint as _randint
-from time import time
+from time import monotonic, sleep as _sleep
 from traceback import format_exc
 
-from .event import _EventRegistry, _EventHandler
-from .util import _TaskScheduler, runWatcherDec, WidgetGroup, remEnum, ifIsNone
+from .event import _EventRegistry, _EventHandler, Event
+from .util import _TaskScheduler, _TimerHeap, _TclBatch, _Dispatcher, _TclSelector, _AnimationClock, _AnimationSubscriber, runWatcherDec, WidgetGroup, remEnum, ifIsNone
 from .const import *
 from .tkmath import Location2D, _map
 from .image import TkImage, PILImage
@@ -15,6 +18,7 @@ class Tk:
     The toplevel window class
 
     """
+    _ASYNC_IDLE_DELAY = .005 # seconds 'runAsync' sleeps if no Tk event is pending, only without Tcl file handlers (Windows)
     def __init__(self, _master=None, group=None):
         self._hasTaskBar = False
         self._instanceOfMenu = False
@@ -28,8 +32,18 @@ class Tk:
         
         self._eventRegistry = _EventRegistry(self)
         self._childWidgets = []
+        self._layoutChildSize = None   # window size the children were laid out with
+        self._layoutDirty = True
+        self._layoutSizeCache = None   # master sizes during a layout pass
+        self._layoutWindowSize = None  # window size of the '<Configure>' event of the running layout pass
+        self._layoutStats = {"visited":0, "placed":0, "sizeQueries":0}
+        self._batch = None             # active '_TclBatch'
+        self._animationClock = None    # '_AnimationClock', created on first use
+        self._timerHeap = None         # '_TimerHeap' of all '_TaskScheduler' tasks, created on first use
 
         self._master = _tk.Tk() if _master is None else _master
+        self._dispatcher = _Dispatcher(self).start() if _master is None else None # Toplevel uses the one of its master
+        self._asyncStopped = None      # asyncio Future resolved by 'destroy' while 'runAsync' runs
 
         self._relativePlaceData = {
             "handler": None
@@ -57,6 +71,90 @@ class Tk:
     def runDynamicDelayLoop(self, delay, func)->_TaskScheduler:
         task = _TaskScheduler(self, delay, func, repete=True, dynamic=True)
         return task
+    def runAnimationLoop(self, func:Callable)->_AnimationSubscriber:
+        """
+        Calls 'func(delta)' every frame with the seconds since the last frame.
+        All animation loops of this window share one timer, see 'setAnimationFPS'.
+        Frames are skipped under load and the loop pauses while the window is hidden.
+        Use '.cancel()' on the returned object to stop.
+
+        @param func: function(delta) or function()
+        @return:
+        """
+        return self._getAnimationClock().subscribe(func)
+    def setAnimationFPS(self, fps:float=60):
+        """
+        Sets the target frame rate of 'runAnimationLoop'.
+        @param fps:
+        @return:
+        """
+        self._getAnimationClock().setFPS(fps)
+        return self
+    def getAnimationStats(self)->dict:
+        """
+        Returns frame statistics of the animation loops.
+        @return: {"fps", "frames", "skipped", "subscribers":[{"name", "calls", "totalMillis", "avgMillis", "lastMillis"}]}
+        """
+        return self._getAnimationClock().getStats()
+    def invokeLater(self, func:Callable, *args, coalesce=False, key=None):
+        """
+        Runs 'func(*args)' in the mainloop.
+        Can be called from any thread without blocking. Widgets must only be changed in the mainloop,
+        so use this to update the UI from worker threads.
+        The queue is drained once per frame with a time budget, leftover calls run in the next tick.
+
+        Example:
+            tk.invokeLater(label.setText, "42%", coalesce=True)
+
+        @param func:
+        @param args:
+        @param coalesce: if True, calls of the same bound method (same widget and method) which did not run yet are merged. Only the newest one runs.
+        @param key: custom merge key (any hashable) instead of 'coalesce'
+        @return:
+        """
+        if coalesce and key is None:
+            key = (id(getattr(func, "__self__", None)), getattr(func, "__func__", func))
+        self._getDispatcher().put(func, args, key)
+        return self
+    def callFromThread(self, func:Callable, *args)->Future:
+        """
+        Runs 'func(*args)' in the mainloop and returns a 'concurrent.futures.Future' with its result.
+        Can be called from any thread. Do not wait for the result in the mainloop itself, it would block forever.
+
+        @param func:
+        @param args:
+        @return:
+        """
+        future = Future()
+        self._getDispatcher().put(func, args, future=future)
+        return future
+    def setDispatchRate(self, interval:float=.016, budget:float=.008):
+        """
+        Sets how often calls from 'invokeLater'/'callFromThread' are executed.
+        @param interval: seconds from the first queued call until the queue is drained
+        @param budget: maximum seconds per tick. Leftover calls run in the next tick.
+        @return:
+        """
+        dispatcher = self._getDispatcher()
+        dispatcher._interval = max(1, int(interval*1000))
+        dispatcher._budget = budget
+        return self
+    def batch(self)->_TclBatch:
+        """
+        Returns a context manager which buffers all 'place' and attribute calls
+        of the widgets in this window and sends them as few Tcl scripts on exit.
+        Later writes to the same option override earlier ones.
+        Reading widget attributes inside the block returns the old values.
+
+        Example:
+            with tk.batch():
+                for i in range(1000):
+                    Button(tk).setText(i).place(0, i*25, 100, 25)
+                group.setBg(Color.BLACK)
+
+        @return:
+        """
+        return self._batch if self._batch is not None else _TclBatch(self)
     # Custom Events
     def onWindowResize(self, func, args:list=None, priority:int=0, defaultArgs=False, disableArgs=False, filterEvent=True):
         _EventHandler._registerNewEvent(self, func, EventType.key("<Configure>"), args, priority, decryptValueFunc=(self._decryptWindowResize if filterEvent else self._decryptNonFilteredWindowResize), defaultArgs=defaultArgs, disableArgs=disableArgs)
@@ -74,9 +172,10 @@ class Tk:
         """
         self._closeRunnable = _EventHandler._getNewEventRunnable(self, func, args, priority, defaultArgs=defaultArgs, disableArgs=disableArgs)
         return self._closeRunnable
-    def bind(self, func:Callable, event:Union[EventType, Key, Mouse, str], args:list=None, priority:int=0, defaultArgs=False, disableArgs=False):
+    def bind(self, func:Callable, event:Union[EventType, Key, Mouse, str], args:list=None, priority:int=0, defaultArgs=False, disableArgs=False, coalesce=False, maxRate:Union[int, float]=None):
         """
         Binds a specific event to the Window. Runs given function on trigger.
+        Use 'bindEvent' to get the Event instance of the bound function.
 
         @param func: function get called on trigger
         @param event: Event type: EventType _Enum or default tkinter event as string.
@@ -84,14 +183,44 @@ class Tk:
         @param priority: If several equal events are bound, it's possible to set priorities.
         @param defaultArgs: if True the default tkinter gets passed in bound function instead of Event-instance.
         @param disableArgs: if True no args gets passed.
+        @param coalesce: if True the function is called at most once per idle cycle with the latest event. Use it for high frequency events like MOUSE_MOTION or SIZE_CONFIUGURE.
+        @param maxRate: if set the function is called at most 'maxRate' times per second with the latest event.
         @return:
         """
+        self.bindEvent(func, event, args, priority, defaultArgs, disableArgs, coalesce, maxRate)
+        return self
+    def bindEvent(self, func:Callable, event:Union[EventType, Key, Mouse, str], args:list=None, priority:int=0, defaultArgs=False, disableArgs=False, coalesce=False, maxRate:Union[int, float]=None)->Event:
+        """
+        Same as 'bind' but returns the Event instance.
+        Use 'Event.unbind' or 'Tk.unbind' to remove only this bound function.
+
+        @param func: function get called on trigger
+        @param event: Event type: EventType _Enum or default tkinter event as string.
+        @param args: Additional arguments as List.
+        @param priority: If several equal events are bound, it's possible to set priorities.
+        @param defaultArgs: if True the default tkinter gets passed in bound function instead of Event-instance.
+        @param disableArgs: if True no args gets passed.
+        @param coalesce: if True the function is called at most once per idle cycle with the latest event. Use it for high frequency events like MOUSE_MOTION or SIZE_CONFIUGURE.
+        @param maxRate: if set the function is called at most 'maxRate' times per second with the latest event.
+        @return: Event instance
+        """
         if event == "CANCEL": return
         event = remEnum(event)
         if event.startswith("["):
-            _EventHandler._registerNewCustomEvent(self, func, event, args, priority, defaultArgs=defaultArgs, disableArgs=disableArgs)
-        else:
-            _EventHandler._registerNewEvent(self, func, event, args, priority, defaultArgs=defaultArgs, disableArgs=disableArgs)
+            return _EventHandler._registerNewCustomEvent(self, func, event, args, priority, defaultArgs=defaultArgs, disableArgs=disableArgs, coalesce=coalesce, maxRate=maxRate)
+        return _EventHandler._registerNewEvent(self, func, event, args, priority, defaultArgs=defaultArgs, disableArgs=disableArgs, coalesce=coalesce, maxRate=maxRate)
+    def unbind(self, event:Union[Event, EventType, Key, Mouse, str]):
+        """
+        Pass the Event instance returned by 'bindEvent' to remove only this bound function.
+        Pass an EventType to unbind all Events from given EventType.
+
+        @param event:
+        @return:
+        """
+        if isinstance(event, Event):
+            event.unbind()
+            return self
+        return self.unbindEvent(event)
     # Event Tweaks
     def unbindEvent(self, event: Union[EventType, Key, Mouse]):
         """
@@ -100,16 +229,28 @@ class Tk:
         @param event:
         @return:
         """
-        # self._eventRegistry.unregisterType(event)
-        raise NotImplemented()
+        self._eventRegistry.unregisterType(remEnum(event))
+        return self
     def unbindAllEvents(self):
         """
         Unbind all Events.
 
         @return:
         """
-        # self._eventRegistry.unregisterAll()
-        raise NotImplemented()
+        self._eventRegistry.unregisterAll()
+        return self
+    def getBoundEventCount(self, event:Union[EventType, Key, Mouse, str]=None)->int:
+        """
+        Returns the amount of functions bound to given EventType.
+        If no EventType is given all bound functions are counted.
+
+        @param event:
+        @return:
+        """
+        if event is not None:
+            chain = self._eventRegistry.getChain(remEnum(event))
+            return 0 if chain is None else len(chain)
+        return sum(len(chain) for chain in self._eventRegistry["event"].values())
     # Cursor
     def setCursor(self, c:Union[Cursor, str]):
         """
@@ -199,6 +340,12 @@ class Tk:
         """
         try:
             self._destroyed = True
+            if self._dispatcher is not None and self._dispatcher._master is self: self._dispatcher.cancel()
+            if self._asyncStopped is not None and not self._asyncStopped.done(): self._asyncStopped.set_result(None)
+            if self._animationClock is not None: self._animationClock.cancel()
+            if self._timerHeap is not None:
+                if self._timerHeap._master is self: self._timerHeap.cancel()
+                else: self._timerHeap.dropOwner(self) # Toplevel shares the heap of its master
             WidgetGroup.removeFromAll(self)
             for w in self._childWidgets.copy(): # TODO remove copy
                 w.destroy()
@@ -304,6 +451,7 @@ class Tk:
         @param b:
         @return:
         """
+        self._invalidateLayoutSize()
         self._master.wm_attributes("-fullscreen", b)
     def setPositionOnScreen(self, x:Union[int, Location2D], y:Union[None, int]=None):
         """
@@ -320,6 +468,7 @@ class Tk:
             raise TypeError("y cannot be None!")
         if str(x).find("-") == -1: x = "+" + str(x)
         if str(y).find("-") == -1: y = "+" + str(y)
+        self._invalidateLayoutSize()
         self._master.geometry(str(x) + str(y))
     def setCloseable(self, b:bool):
         """
@@ -359,6 +508,7 @@ class Tk:
         @return:
         """
         self._internWindowSize = (x, y)
+        self._invalidateLayoutSize()
         if minsize: self.setMinSize(x, y)
         self._master.geometry(str(x) + "x" + str(y))
     def setMaxSize(self, x, y):
@@ -369,6 +519,7 @@ class Tk:
         @param y:
         @return:
         """
+        self._invalidateLayoutSize()
         self._master.maxsize(x, y)
     def setMinSize(self, x, y):
         """
@@ -378,6 +529,7 @@ class Tk:
         @param y:
         @return:
         """
+        self._invalidateLayoutSize()
         self._master.minsize(x, y)
     # Getter
     def getPositionOnScreen(self)->Location2D:
@@ -464,6 +616,48 @@ class Tk:
         @return:
         """
         self._mainloop()
+    def runAsync(self, coro=None):
+        """
+        Alternative to 'mainloop' which runs an asyncio event loop together with the Window.
+        The asyncio loop waits in the Tcl notifier, so Tk events, asyncio IO and timers wake it without polling.
+        Bound functions and commands can be 'async def' functions. They run as asyncio tasks.
+        Returns if the Window is destroyed, unfinished tasks get cancelled.
+
+        Example:
+            async def main():
+                data = await client.fetch()
+                label.setText(data)
+            tk.runAsync(main())
+
+        @param coro: coroutine which runs alongside the Window (optional)
+        @return: result of 'coro' if it finished
+        """
+        if self._destroyed: return None
+        if not hasattr(self._master.tk, "createfilehandler"): # Windows
+            return _asyncio.run(self._runAsync(coro, polling=True))
+        loop = _TclSelector.createLoop(self)
+        try:
+            _asyncio.set_event_loop(loop)
+            return loop.run_until_complete(self._runAsync(coro))
+        finally:
+            # same cleanup as 'asyncio.run'
+            try:
+                tasks = _asyncio.all_tasks(loop)
+                for task in tasks: task.cancel()
+                loop.run_until_complete(_asyncio.gather(*tasks, return_exceptions=True))
+                loop.run_until_complete(loop.shutdown_asyncgens())
+            finally:
+                _asyncio.set_event_loop(None)
+                loop.close()
+    async def asyncSleep(self, s:float):
+        """
+        Sleeps s seconds without blocking the Window.
+        Use 'await tk.asyncSleep(s)' inside 'runAsync' or 'async def' handlers.
+        @param s:
+        @return:
+        """
+        await _asyncio.sleep(s)
+        return self
     # Misc
     def throwErrorSound(self):
         self._master.bell()
@@ -479,15 +673,37 @@ class Tk:
     def sleep(self, s):
         """
         Sleeps s seconds and updates the window in Background.
+        Waits in the Tk event loop (like 'wait_variable'), so no CPU time is used while no event occurs.
         @param s:
         @return:
         """
-        temp = time()
-        while True:
-            if not self._destroyed: self.update()
-            if time()-temp >= s:
-                break
+        if self._destroyed:
+            _sleep(s)
+            return self
+        end = monotonic()+s
+        done = _tk.BooleanVar(self._master, False)
+        self._master.after(max(0, int(s*1000)), done.set, True)
+        try:
+            self._master.wait_variable(done)
+        except _tk.TclError: # application destroyed while waiting
+            _sleep(max(0, end-monotonic()))
         return self
+    def pump(self, maxMillis:float=8)->int:
+        """
+        Handles pending Tk events for at most 'maxMillis' milliseconds.
+        Does not wait for new events.
+        Can be called in long running loops to keep the Window responsive without the cost of 'update'.
+        @param maxMillis: time budget
+        @return: amount of handled events
+        """
+        if self._destroyed: return 0
+        tk = self._master.tk
+        end = monotonic()+maxMillis/1000
+        count = 0
+        while tk.dooneevent(_tkinter.DONT_WAIT):
+            count += 1
+            if monotonic() >= end: break
+        return count
     # Private Implementations
     def _mainloop(self):
         """
@@ -498,6 +714,27 @@ class Tk:
         self._finishLastTasks()
         self._master.mainloop()
         self._destroyed = True
+    async def _runAsync(self, coro, polling=False):
+        """
+        Waits until the Window is destroyed. Tk events are handled by '_TclSelector' meanwhile.
+        With 'polling' (no Tcl file handlers) Tk events are pumped with a budget instead
+        and the loop sleeps '_ASYNC_IDLE_DELAY' if nothing was pending.
+        """
+        self._finishLastTasks()
+        task = None if coro is None else _asyncio.ensure_future(coro)
+        if polling:
+            while not self._destroyed:
+                await _asyncio.sleep(0 if self.pump() else Tk._ASYNC_IDLE_DELAY)
+        else:
+            self._asyncStopped = _asyncio.get_running_loop().create_future()
+            try:
+                if not self._destroyed: await self._asyncStopped
+            finally:
+                self._asyncStopped = None
+        if task is None: return None
+        if task.done(): return task.result()
+        task.cancel()
+        return None
     def _updateDynamicSize(self, widget):
         """
         Private implementation of the 'updateDynamicWidgets'.
@@ -506,8 +743,7 @@ class Tk:
         """
         if not widget._destroyed and len(widget._relativePlaceData) > 1:
             _data = widget._relativePlaceData
-            masterWidth = widget._master.getWidth()
-            masterHeight = widget._master.getHeight()
+            masterWidth, masterHeight = self._getLayoutMasterSize(widget._master)
 
 
             x = ifIsNone(_data["fixX"], _map(_data["xOffset"] + _data["xOffsetLeft"], 0, 100, 0, masterWidth))
@@ -545,11 +781,23 @@ class Tk:
             x += _data["changeX"]
             y += _data["changeY"]
 
-            widget._get().place(x=x,
-                                y=y,
-                                width=width,
-                                height=height,
-                                anchor=Anchor.UP_LEFT.value)
+            inPass = self._layoutSizeCache is not None # stats only count 'updateDynamicWidgets' passes
+            if inPass:
+                self._layoutStats["visited"] += 1
+                if hasattr(widget, "_childWidgets"):
+                    # children are laid out with the computed size. 'winfo' is not updated until Tk recomputes the geometry.
+                    self._layoutSizeCache[id(widget)] = (width, height)
+            geometry = (x, y, width, height)
+            changed = widget._layoutGeometry != geometry # unchanged -> skip the Tcl calls, but still run the handlers
+            if changed:
+                widget._layoutGeometry = geometry
+                if inPass: self._layoutStats["placed"] += 1
+                if self._batch is None or not self._batch.place(widget._get(), x=x, y=y, width=width, height=height, anchor=Anchor.UP_LEFT.value):
+                    widget._get().place(x=x,
+                                        y=y,
+                                        width=width,
+                                        height=height,
+                                        anchor=Anchor.UP_LEFT.value)
 
             handler = _data["handler"]
             if handler is not None:
@@ -557,10 +805,10 @@ class Tk:
                     event["value"] = [x, y, width, height]
                 handler()
 
-            if widget._xScrollbar is not None and widget._xScrollbar._autoPlace:
+            if changed and widget._xScrollbar is not None and widget._xScrollbar._autoPlace:
                 widget._xScrollbar.place(x, y + height, width=width)
 
-            if widget._yScrollbar is not None and widget._yScrollbar._autoPlace:
+            if changed and widget._yScrollbar is not None and widget._yScrollbar._autoPlace:
                 widget._yScrollbar.place(x + width, y, height=height)
 
             if handler is not None:
@@ -579,15 +827,58 @@ class Tk:
                 self._updateDynamicSize(widget)
                 return
 
+            size = self._getLayoutMasterSize(widget)
+            if not widget._layoutDirty and widget._layoutChildSize == size:
+                return # children were already laid out with this size
+            widget._layoutChildSize = size
+            widget._layoutDirty = False
+
             for w in widget._childWidgets:
                 if w._destroyed: continue
                 if not w._placed:
+                    # hidden widgets are not laid out -> visit this container again next pass
+                    widget._layoutDirty = True
                     continue
                 self._updateDynamicSize(w)
                 if hasattr(w, "_childWidgets"):  # is container?
                     updateRecursive(w)
-        updateRecursive(self if start is None else start)
+        if self._layoutSizeCache is not None: # nested call during a running pass
+            updateRecursive(self if start is None else start)
+            return self
+        self._layoutSizeCache = {} if self._layoutWindowSize is None else {id(self):self._layoutWindowSize}
+        self._layoutStats = {"visited":0, "placed":0, "sizeQueries":0}
+        try:
+            updateRecursive(self if start is None else start)
+        finally:
+            self._layoutSizeCache = None
         return self
+    def getLayoutStats(self)->dict:
+        """
+        Returns the counters of the last 'updateDynamicWidgets' pass.
+        'visited': relative placed widgets which geometry was calculated.
+        'placed': widgets which geometry changed and were placed again.
+        'sizeQueries': master sizes queried from Tcl (winfo_width + winfo_height).
+
+        @return: dict
+        """
+        return self._layoutStats.copy()
+    def _getLayoutMasterSize(self, master)->tuple:
+        """
+        Returns (width, height) of given master.
+        During a layout pass every master is only queried once.
+        The window size is taken from the '<Configure>' event which started the pass if available.
+
+        @param master:
+        @return:
+        """
+        cache = self._layoutSizeCache
+        if cache is None:
+            return master.getWidth(), master.getHeight()
+        size = cache.get(id(master))
+        if size is None:
+            self._layoutStats["sizeQueries"] += 1
+            size = cache[id(master)] = (master.getWidth(), master.getHeight())
+        return size
     def _internalOnClose(self):
         """
         internal onClose Event.
@@ -601,9 +892,33 @@ class Tk:
             runnable()
             if not runnable.event["setCanceled"]:
                 self.destroy()
+    def _invalidateLayoutSize(self):
+        """
+        Drops the window size known to the layout pass after the window geometry was changed.
+        @return:
+        """
+        self._layoutWindowSize = None
+        if self._layoutSizeCache is not None:
+            self._layoutSizeCache.pop(id(self), None)
+    def _getConfigureSize(self, args):
+        """
+        Returns the window size carried by a '<Configure>' event without querying Tcl.
+        Returns None if the event belongs to a child widget (window size unchanged).
+
+        @param args: tkinter event
+        @return:
+        """
+        widget = getattr(args, "widget", None)
+        if widget is self._master:
+            width, height = args.width, args.height
+            if type(width) is int and type(height) is int:
+                return width, height
+        elif isinstance(widget, _tk.Misc):
+            return None
+        return self.getWindowSize()
     def _decryptWindowResize(self, args, event):
-        _size = self.getWindowSize()
-        if self._oldWindowSize == _size:
+        _size = self._getConfigureSize(args)
+        if _size is None or self._oldWindowSize == _size:
             return "CANCEL"
         else:
             self._oldWindowSize = _size
@@ -611,17 +926,23 @@ class Tk:
     def _decryptNonFilteredWindowResize(self, args, event):
         return self.getWindowSize()
     def _privateDecryptWindowResize(self, args, event):
-        _size = self.getWindowSize()
-        if self._privOldWindowSize == _size:
+        _size = self._getConfigureSize(args)
+        if _size is None or self._privOldWindowSize == _size:
             return "CANCEL"
         else:
             self._privOldWindowSize = _size
             return _size
+    def _getAnimationClock(self)->_AnimationClock:
+        if self._animationClock is None: self._animationClock = _AnimationClock(self)
+        return self._animationClock
+    def _getDispatcher(self)->_Dispatcher:
+        return self._dispatcher
     def _finishLastTasks(self):
         _EventHandler._registerNewEvent(self, self._customUpdateDynamicWidgetsHandler, EventType.SIZE_CONFIUGURE, args=[], priority=1, decryptValueFunc=self._privateDecryptWindowResize)
         self.updateDynamicWidgets()
     def _setAttribute(self, name, value):
         if self._destroyed: return
+        if self._batch is not None and self._batch.configure(self._master, name, value): return
         try:
             self._master[name] = value
         except Exception as e:
@@ -632,7 +953,11 @@ class Tk:
     @runWatcherDec
     def _customUpdateDynamicWidgetsHandler(self, e):
         if self._destroyed: return
-        self.updateDynamicWidgets()
+        self._layoutWindowSize = e.getValue() # only valid during this pass
+        try:
+            self.updateDynamicWidgets()
+        finally:
+            self._layoutWindowSize = None
     def _getTkMaster(self):
         """
         Returns the highest master (Tk/Toplevel) of this widget.
@@ -656,6 +981,8 @@ class Toplevel(Tk):
             _master=_tk.Toplevel(_master._get()),
             group=group
         )
+        self._dispatcher = _master._getTkMaster()._getDispatcher()
+        self._timerHeap = _TimerHeap.get(_master) # tasks of this window are dropped in 'destroy'
         self._finishLastTasks()
         if topMost: self.setTopmost()
     def mainloop(self):